@@ -0,0 +1,144 @@
+/**
+ * Compile Daemon Pool - persistent `cli.py --daemon` processes
+ * Mỗi daemon chạy BatchCompiler của Python: time budget cho từng view (ONEJS_COMPILE_TIMEOUT)
+ * và recycle worker (ONEJS_WORKER_MAX_COMPILES / ONEJS_WORKER_MAX_RSS_MB), thay vì spawn
+ * một process Python cho mỗi view.
+ */
+
+const os = require('os');
+const path = require('path');
+const readline = require('readline');
+const { spawn } = require('child_process');
+
+const DEFAULT_MAX_DAEMONS = 4;
+
+class CompileDaemon {
+    /**
+     * @param {string} cliPath - Path to compiler/python/cli.py
+     * @param {Object} env - Environment of the daemon process
+     */
+    constructor(cliPath, env) {
+        this.pending = [];
+        this.stderr = '';
+        this.closed = false;
+
+        this.process = spawn('python3', [cliPath, '--daemon'], {
+            stdio: ['pipe', 'pipe', 'pipe'],
+            cwd: path.dirname(cliPath),
+            env
+        });
+
+        // Results come back one JSON line per job, in job order
+        readline.createInterface({ input: this.process.stdout }).on('line', (line) => {
+            let result;
+            try {
+                result = JSON.parse(line);
+            } catch (e) {
+                return; // not a protocol line
+            }
+            const job = this.pending.shift();
+            if (job) {
+                job.resolve(result);
+            }
+            this.updateRef();
+        });
+
+        this.process.stderr.on('data', (data) => {
+            // Keep only the tail: warnings of every compiled view go here
+            this.stderr = (this.stderr + data.toString()).slice(-8192);
+        });
+
+        const fail = (error) => {
+            this.closed = true;
+            const pending = this.pending;
+            this.pending = [];
+            for (const job of pending) {
+                job.reject(error);
+            }
+        };
+        this.process.on('error', (error) => fail(new Error(`Failed to spawn Python: ${error.message}`)));
+        this.process.on('close', (code) => fail(new Error(`Python compile daemon exited with code ${code}. stderr: ${this.stderr}`)));
+
+        this.updateRef();
+    }
+
+    /**
+     * Send one job ({code, view, function, factory}); resolves with the daemon result
+     */
+    compile(job) {
+        return new Promise((resolve, reject) => {
+            if (this.closed) {
+                reject(new Error('Python compile daemon is not running'));
+                return;
+            }
+            this.pending.push({ resolve, reject });
+            this.updateRef();
+            this.process.stdin.write(JSON.stringify(job) + '\n');
+        });
+    }
+
+    /**
+     * An idle daemon must not keep Node alive; it exits on stdin EOF when Node does
+     */
+    updateRef() {
+        const method = this.pending.length > 0 ? 'ref' : 'unref';
+        this.process[method]();
+        for (const stream of [this.process.stdin, this.process.stdout, this.process.stderr]) {
+            if (stream && typeof stream[method] === 'function') {
+                stream[method]();
+            }
+        }
+    }
+
+    close() {
+        if (!this.closed) {
+            this.closed = true;
+            this.process.stdin.end();
+        }
+    }
+}
+
+class CompileDaemonPool {
+    /**
+     * @param {string} cliPath - Path to compiler/python/cli.py
+     * @param {Object} env - Environment of every daemon in the pool
+     * @param {number} size - Number of daemons (ONEJS_COMPILE_WORKERS, default min(CPUs, 4))
+     */
+    constructor(cliPath, env, size = null) {
+        this.cliPath = cliPath;
+        this.env = env;
+        this.size = size || parseInt(process.env.ONEJS_COMPILE_WORKERS, 10)
+            || Math.max(1, Math.min(os.cpus().length, DEFAULT_MAX_DAEMONS));
+        this.daemons = [];
+    }
+
+    /**
+     * An idle daemon, a new one while the pool is not full, else the least loaded one
+     */
+    acquire() {
+        this.daemons = this.daemons.filter(daemon => !daemon.closed);
+        const idle = this.daemons.find(daemon => daemon.pending.length === 0);
+        if (idle) {
+            return idle;
+        }
+        if (this.daemons.length < this.size) {
+            const daemon = new CompileDaemon(this.cliPath, this.env);
+            this.daemons.push(daemon);
+            return daemon;
+        }
+        return this.daemons.reduce((best, daemon) => daemon.pending.length < best.pending.length ? daemon : best);
+    }
+
+    compile(job) {
+        return this.acquire().compile(job);
+    }
+
+    close() {
+        for (const daemon of this.daemons) {
+            daemon.close();
+        }
+        this.daemons = [];
+    }
+}
+
+module.exports = { CompileDaemon, CompileDaemonPool };
@@ -3,6 +3,9 @@
  * Safely removes unnecessary whitespace while preserving HTML structure
  */
 
+// Views compiled with ONEJS_MINIFY_HTML=1 are already minified by the Python compiler
+const HTML_MINIFIED_MARKER = '// @onejs:html-minified';
+
 /**
  * Minify HTML string while preserving important whitespace
  * @param {string} html - HTML string to minify
@@ -76,6 +79,10 @@ function minifyHtmlTemplate(html) {
  * @returns {string} Processed source code
  */
 function processTemplateStrings(source) {
+    if (source.startsWith(HTML_MINIFIED_MARKER)) {
+        return source;
+    }
+
     // Match template literals (backtick strings)
     // We need to be careful with nested template expressions ${...}
     const result = [];
@@ -164,7 +171,7 @@ function htmlTemplateMinifyPlugin() {
                 
                 // Only process files that likely contain HTML templates
                 // (render methods with template literals containing HTML tags)
-                if (!source.includes('`') || !/<[a-z]/i.test(source)) {
+                if (!source.includes('`') || !/<[a-z]/i.test(source) || source.startsWith(HTML_MINIFIED_MARKER)) {
                     return null; // Let esbuild handle normally
                 }
                 
@@ -186,6 +193,7 @@ function htmlTemplateMinifyPlugin() {
 }
 
 module.exports = {
+    HTML_MINIFIED_MARKER,
     htmlTemplateMinifyPlugin,
     minifyHtmlTemplate,
     processTemplateStrings
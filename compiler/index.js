@@ -16,9 +16,11 @@
 
 const fs = require('fs');
 const path = require('path');
+const crypto = require('crypto');
 const { spawn } = require('child_process');
 const ConfigManager = require('./config-manager');
 const { RegistryGenerator } = require('./registry-generator');
+const { CompileDaemonPool } = require('./compile-daemon');
 
 class Compiler {
     constructor() {
@@ -26,6 +28,8 @@ class Compiler {
         this.pythonPath = path.resolve(__dirname, 'python/main_compiler.py');
         this.compiledViews = {}; // Track compiled views per context
         this.compiledContexts = []; // Track which contexts were compiled in this run
+        this.extractedStyles = {}; // <style> CSS extracted per context (extractStyles mode)
+        this.compilePools = {}; // cli.py --daemon pools, see getCompilePool()
     }
 
     /**
@@ -47,6 +51,8 @@ class Compiler {
 
             if (watchMode) {
                 await this.setupWatcher(config, projectRoot, context === 'all' ? null : context);
+            } else {
+                this.closeCompilePools();
             }
 
         } catch (error) {
@@ -92,6 +98,7 @@ class Compiler {
         
         // Initialize compiled views tracking for this context
         this.compiledViews[contextName] = [];
+        this.extractedStyles[contextName] = [];
         
         // Process all namespace views
         const namespaces = Object.keys(contextConfig.views || {});
@@ -160,6 +167,9 @@ class Compiler {
 
         console.log(`\n✅ Successfully compiled ${totalFiles} files for context: ${contextName}`);
         
+        // Write the context stylesheet + manifest (extractStyles mode)
+        await this.writeContextStylesheet(contextConfig, projectRoot, paths, contextName);
+        
         // Copy app files to compiled.app
         await this.copyAppFiles(contextConfig, projectRoot, paths, contextName);
         
@@ -316,10 +326,18 @@ class Compiler {
         // Compile JS song song (không block Blade)
         // Python compiler xử lý Blade (có declarations) → JavaScript
         try {
-            const jsCode = await this.compileBladeToJs(jsBladeContent, viewPath);
+            const styles = [];
+            const jsCode = await this.compileBladeToJs(jsBladeContent, viewPath, {
+                extractStyles: this.isStyleExtractionEnabled(contextConfig),
+                styles
+            });
             fs.writeFileSync(jsPath, jsCode, 'utf-8');
             console.log(`  ✓ ${viewPath}`);
             
+            if (styles.length > 0 && this.extractedStyles[contextName]) {
+                this.extractedStyles[contextName].push(...styles);
+            }
+            
             // Track compiled view for registry generation
             // actualPath: real file path relative to viewsDir (for import calculation)
             // namingPath: path with namespace (for factory name generation)
@@ -662,112 +680,116 @@ class Compiler {
      * Cần điều chỉnh theo yêu cầu kiến trúc OneView V2
      * Hiện tại đang dùng Python compiler từ onejs (format cũ)
      */
-    compileBladeToJs(bladeCode, viewName) {
-        return new Promise((resolve, reject) => {
-            if (!fs.existsSync(this.pythonPath)) {
-                reject(new Error(`Python compiler not found at ${this.pythonPath}`));
-                return;
-            }
+    compileBladeToJs(bladeCode, viewName, options = {}) {
+        if (!fs.existsSync(this.pythonPath)) {
+            return Promise.reject(new Error(`Python compiler not found at ${this.pythonPath}`));
+        }
 
-            const os = require('os');
-            const tempDir = path.join(os.tmpdir(), 'oneview-compiler');
-            if (!fs.existsSync(tempDir)) {
-                fs.mkdirSync(tempDir, { recursive: true });
+        // functionName: HeroSection (chỉ tên file, cho export function và class name)
+        // viewPath: web.pages.home.hero-section (cho __VIEW_PATH__)
+        const functionName = this.generateComponentName(viewName);
+        const factoryFunctionName = this.generateFactoryFunctionName(viewName);
+        const job = { code: bladeCode, view: viewName, function: functionName, factory: factoryFunctionName };
+
+        return this.getCompilePool(options.extractStyles).compile(job).then((result) => {
+            if (!result.ok) {
+                const stage = result.stage ? ` [stage: ${result.stage}]` : '';
+                throw new Error(`Python compiler failed for ${viewName}${stage}: ${result.error}`);
+            }
+            // Extracted <style> CSS (ONEJS_EXTRACT_STYLES)
+            if (Array.isArray(options.styles) && Array.isArray(result.styles)) {
+                options.styles.push(...result.styles);
             }
+            return result.code;
+        });
+    }
 
-            const timestamp = Date.now() + Math.random().toString(36).substr(2, 9);
-            const inputFile = path.join(tempDir, `${timestamp}_input.blade`);
-            const outputFile = path.join(tempDir, `${timestamp}_output.js`);
+    /**
+     * Pool of `cli.py --daemon` processes (per-view time budget + worker recycling)
+     * One pool per environment: ONEJS_EXTRACT_STYLES is read by the Python worker at compile time
+     */
+    getCompilePool(extractStyles = false) {
+        const key = extractStyles ? 'extractStyles' : 'default';
+        if (!this.compilePools[key]) {
+            const cliPath = path.join(path.dirname(this.pythonPath), 'cli.py');
+            const env = extractStyles ? { ...process.env, ONEJS_EXTRACT_STYLES: '1' } : process.env;
+            this.compilePools[key] = new CompileDaemonPool(cliPath, env);
+        }
+        return this.compilePools[key];
+    }
 
-            try {
-                // Ghi Blade code vào file tạm
-                fs.writeFileSync(inputFile, bladeCode, 'utf-8');
-
-                // Gọi Python cli.py với functionName và viewPath riêng biệt
-                // functionName: HeroSection (chỉ tên file, cho export function và class name)
-                // viewPath: web.pages.home.hero-section (cho __VIEW_PATH__)
-                const cliPath = path.join(path.dirname(this.pythonPath), 'cli.py');
-                const functionName = this.generateComponentName(viewName);
-                const factoryFunctionName = this.generateFactoryFunctionName(viewName);
-                const python = spawn('python3', [cliPath, inputFile, outputFile, functionName, viewName, factoryFunctionName], {
-                    stdio: ['pipe', 'pipe', 'pipe'],
-                    cwd: path.dirname(this.pythonPath)
-                });
+    /**
+     * Stop all compile daemons
+     */
+    closeCompilePools() {
+        for (const pool of Object.values(this.compilePools)) {
+            pool.close();
+        }
+        this.compilePools = {};
+    }
 
-                let stdoutData = '';
-                let stderrData = '';
+    /**
+     * Styles extraction: contexts.<name>.extractStyles hoặc ONEJS_EXTRACT_STYLES=1
+     */
+    isStyleExtractionEnabled(contextConfig) {
+        return contextConfig.extractStyles === true || process.env.ONEJS_EXTRACT_STYLES === '1';
+    }
 
-                python.stdout.on('data', (data) => {
-                    stdoutData += data.toString();
-                });
+    /**
+     * Gộp CSS đã extract của mọi view trong context thành một stylesheet có hash
+     * Output (compiled.styles, mặc định cạnh compiled.registry):
+     * - <context>.<hash>.css: mỗi style ID một block, CSS trùng nhau chỉ ghi một lần
+     * - <context>.styles.json: manifest { file, hash, styles: {id: [views]}, views: {view: [ids]} }
+     * View chỉ giữ styles: [{type: 'ref', id}] nên CSS load song song với JS và cache riêng
+     */
+    async writeContextStylesheet(contextConfig, projectRoot, paths, contextName) {
+        if (!this.isStyleExtractionEnabled(contextConfig)) {
+            return;
+        }
 
-                python.stderr.on('data', (data) => {
-                    stderrData += data.toString();
-                });
+        const stylesDest = contextConfig.compiled?.styles
+            || (contextConfig.compiled?.registry ? path.dirname(contextConfig.compiled.registry) : null);
+        if (!stylesDest) {
+            console.log('   ⚠️  No compiled.styles / compiled.registry configured, skipping stylesheet');
+            return;
+        }
 
-                python.on('close', (code) => {
-                    try {
-                        // Cleanup input file
-                        if (fs.existsSync(inputFile)) {
-                            try {
-                                fs.unlinkSync(inputFile);
-                            } catch (e) {
-                                // ignore
-                            }
-                        }
-                        
-                        if (code === 0) {
-                            // Python compiler đã thành công, đọc output file
-                            if (fs.existsSync(outputFile)) {
-                                const jsCode = fs.readFileSync(outputFile, 'utf-8');
-                                // Cleanup output file
-                                try {
-                                    fs.unlinkSync(outputFile);
-                                } catch (e) {
-                                    // ignore
-                                }
-                                resolve(jsCode);
-                            } else {
-                                reject(new Error('Python compiler did not create output file'));
-                            }
-                        } else {
-                            // Cleanup output file if exists
-                            if (fs.existsSync(outputFile)) {
-                                try {
-                                    fs.unlinkSync(outputFile);
-                                } catch (e) {
-                                    // ignore
-                                }
-                            }
-                            reject(new Error(`Python compiler exited with code ${code}. stderr: ${stderrData}`));
-                        }
-                    } catch (error) {
-                        reject(error);
-                    }
-                });
+        // Stable order regardless of compile completion order
+        const entries = (this.extractedStyles[contextName] || [])
+            .slice()
+            .sort((a, b) => a.view.localeCompare(b.view) || a.id.localeCompare(b.id));
 
-                python.on('error', (error) => {
-                    if (fs.existsSync(inputFile)) {
-                        try {
-                            fs.unlinkSync(inputFile);
-                        } catch (e) {
-                            // ignore
-                        }
-                    }
-                    reject(new Error(`Failed to spawn Python: ${error.message}`));
-                });
+        const blocks = new Map(); // id -> content
+        const styles = {};
+        const views = {};
+        for (const entry of entries) {
+            if (!blocks.has(entry.id)) {
+                blocks.set(entry.id, entry.content);
+            }
+            (styles[entry.id] = styles[entry.id] || []).push(entry.view);
+            (views[entry.view] = views[entry.view] || []).push(entry.id);
+        }
 
-            } catch (error) {
-                if (fs.existsSync(inputFile)) {
-                    try {
-                        fs.unlinkSync(inputFile);
-                    } catch (e) {
-                        // ignore
-                    }
-                }
-                reject(error);
+        const css = Array.from(blocks, ([id, content]) => `/* ${id} */\n${content}\n`).join('\n');
+        const hash = crypto.createHash('sha256').update(css).digest('hex').slice(0, 10);
+        const fileName = `${contextName}.${hash}.css`;
+
+        const destDir = ConfigManager.resolveCompiledPath(projectRoot, paths, stylesDest);
+        this.ensureDir(destDir);
+
+        // Remove stylesheets of previous builds of this context
+        const stalePattern = new RegExp(`^${contextName.replace(/[.*+?^${}()|[\]\\]/g, '\\$&')}\\.[0-9a-f]{10}\\.css$`);
+        for (const name of fs.readdirSync(destDir)) {
+            if (stalePattern.test(name) && name !== fileName) {
+                fs.unlinkSync(path.join(destDir, name));
             }
-        });
+        }
+
+        fs.writeFileSync(path.join(destDir, fileName), css, 'utf-8');
+        const manifest = { context: contextName, file: fileName, hash, styles, views };
+        fs.writeFileSync(path.join(destDir, `${contextName}.styles.json`), JSON.stringify(manifest, null, 2), 'utf-8');
+
+        console.log(`   🎨 Styles: ${blocks.size} block(s) from ${Object.keys(views).length} view(s) → ${fileName}`);
     }
 
     /**
@@ -1225,6 +1247,7 @@ if (require.main === module) {
     process.on('SIGINT', () => {
         console.log('\n\n👋 Shutting down...');
         compiler.closeWatchers();
+        compiler.closeCompilePools();
         process.exit(0);
     });
 
@@ -0,0 +1,225 @@
+"""
+Batch/daemon compile với time budget cho từng file và recycle worker
+
+Mỗi view được compile trong một worker process riêng:
+- Quá thời gian (ONEJS_COMPILE_TIMEOUT giây) -> kill worker, báo file + stage đang chạy
+- Worker được thay mới sau ONEJS_WORKER_MAX_COMPILES lần compile hoặc khi RSS
+  vượt ONEJS_WORKER_MAX_RSS_MB, để state rò rỉ trên BladeCompiler không tích tụ
+"""
+
+import os
+import sys
+import time
+import multiprocessing
+
+from style_extractor import write_style_sidecar
+
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_STARTUP_TIMEOUT = 60.0
+DEFAULT_MAX_COMPILES = 200
+DEFAULT_MAX_RSS_MB = 512
+STAGE_BUFFER_SIZE = 64
+# First message a worker sends, once BladeCompiler is imported and built
+READY = 'ready'
+
+
+class CompileTimeoutError(Exception):
+    """Raised when a single view exceeds the per-compile wall-clock budget"""
+
+    def __init__(self, view_name, stage, timeout):
+        self.view_name = view_name
+        self.stage = stage
+        self.timeout = timeout
+        super().__init__(f"Compile of '{view_name}' exceeded {timeout:g}s budget (stage: {stage or 'unknown'})")
+
+
+def _current_rss_bytes():
+    """Current resident set size of this process (0 when unavailable)"""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is bytes on macOS, kilobytes on Linux
+        return peak if sys.platform == 'darwin' else peak * 1024
+    except (ImportError, ValueError):
+        return 0
+
+
+def _worker_main(conn, stage_buffer):
+    """Worker loop: compile jobs received on conn until None is sent"""
+    # stdout belongs to the daemon protocol - send compiler warnings to stderr
+    sys.stdout = sys.stderr
+
+    from main_compiler import BladeCompiler
+
+    compiler = BladeCompiler()
+
+    def report_stage(stage):
+        stage_buffer.value = stage.encode('utf-8')[:STAGE_BUFFER_SIZE - 1]
+
+    compiler.stage_hook = report_stage
+    conn.send(READY)
+
+    while True:
+        job = conn.recv()
+        if job is None:
+            break
+        report_stage('start')
+        try:
+            js_code = compiler.compile_blade_to_js(
+                job['code'], job['view'], job.get('function'), job.get('factory')
+            )
+            conn.send({'ok': True, 'code': js_code, 'styles': compiler.extracted_styles, 'rss': _current_rss_bytes()})
+        except Exception as e:
+            conn.send({'ok': False, 'error': str(e), 'stage': compiler.current_stage, 'rss': _current_rss_bytes()})
+        # Report per job (stderr) so the warm compiler does not accumulate records
+        compiler.memory_reporter.print_report()
+
+
+class CompileWorker:
+    """A recyclable worker process owning one warm BladeCompiler"""
+
+    def __init__(self):
+        self.stage_buffer = multiprocessing.Array('c', STAGE_BUFFER_SIZE)
+        self.conn, child_conn = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=_worker_main, args=(child_conn, self.stage_buffer), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.compiles = 0
+        self.rss = 0
+        self.ready = False
+
+    @property
+    def stage(self):
+        return self.stage_buffer.value.decode('utf-8', 'replace') or None
+
+    def wait_ready(self, timeout):
+        """Wait up to `timeout` seconds for the worker to finish starting; False when it did not"""
+        if not self.ready and self.conn.poll(timeout):
+            self.ready = self.conn.recv() == READY
+        return self.ready
+
+    def compile(self, job, timeout):
+        """Send one job and wait up to `timeout` seconds; raise CompileTimeoutError on overrun"""
+        self.conn.send(job)
+        if not self.conn.poll(timeout):
+            stage = self.stage
+            self.kill()
+            raise CompileTimeoutError(job['view'], stage, timeout)
+        result = self.conn.recv()
+        self.compiles += 1
+        self.rss = result.get('rss', 0)
+        return result
+
+    def stop(self):
+        """Ask the worker to exit, killing it if it does not"""
+        if self.process.is_alive():
+            try:
+                self.conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            self.process.join(timeout=1)
+        self.kill()
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class BatchCompiler:
+    """Compile many views with a per-file time budget and bounded worker lifetime"""
+
+    def __init__(self, timeout=None, max_compiles=None, max_rss_mb=None, startup_timeout=None):
+        self.timeout = float(timeout or os.environ.get('ONEJS_COMPILE_TIMEOUT') or DEFAULT_TIMEOUT)
+        self.startup_timeout = float(startup_timeout or os.environ.get('ONEJS_WORKER_STARTUP_TIMEOUT') or DEFAULT_STARTUP_TIMEOUT)
+        self.max_compiles = int(max_compiles or os.environ.get('ONEJS_WORKER_MAX_COMPILES') or DEFAULT_MAX_COMPILES)
+        self.max_rss_bytes = int(max_rss_mb or os.environ.get('ONEJS_WORKER_MAX_RSS_MB') or DEFAULT_MAX_RSS_MB) * 1024 * 1024
+        self.worker = None
+        self.recycled = 0
+
+    def _get_worker(self):
+        if self.worker is None:
+            self.worker = CompileWorker()
+        return self.worker
+
+    def _recycle(self):
+        if self.worker is not None:
+            self.worker.stop()
+            self.worker = None
+            self.recycled += 1
+
+    def _discard(self, worker):
+        """Drop a dead or killed worker, closing its pipe; the next job gets a fresh one"""
+        worker.kill()
+        self.worker = None
+        self.recycled += 1
+
+    def compile(self, blade_code, view_name, function_name=None, factory_function_name=None):
+        """
+        Compile one view. Returns a result dict:
+        {'ok': True, 'code': ...} or {'ok': False, 'error': ..., 'stage': ..., 'timeout': bool}
+        """
+        job = {'code': blade_code, 'view': view_name, 'function': function_name, 'factory': factory_function_name}
+        worker = self._get_worker()
+        # Worker startup (imports, template loading) is not charged to the job's budget
+        try:
+            ready = worker.wait_ready(self.startup_timeout)
+        except (EOFError, OSError) as e:
+            self._discard(worker)
+            return {'ok': False, 'error': f"Worker died while starting for '{view_name}': {e}", 'stage': None,
+                    'timeout': False, 'elapsed': 0.0}
+        if not ready:
+            self._discard(worker)
+            return {'ok': False, 'error': f"Worker did not start within {self.startup_timeout:g}s for '{view_name}'",
+                    'stage': None, 'timeout': True, 'elapsed': 0.0}
+
+        started = time.perf_counter()
+        try:
+            result = worker.compile(job, self.timeout)
+        except CompileTimeoutError as e:
+            # Worker was killed mid-compile - next job gets a fresh one
+            self._discard(worker)
+            return {'ok': False, 'error': str(e), 'stage': e.stage, 'timeout': True,
+                    'elapsed': time.perf_counter() - started}
+        except (EOFError, BrokenPipeError, OSError) as e:
+            stage = worker.stage
+            self._discard(worker)
+            return {'ok': False, 'error': f"Worker died while compiling '{view_name}': {e}", 'stage': stage,
+                    'timeout': False, 'elapsed': time.perf_counter() - started}
+
+        result['timeout'] = False
+        result['elapsed'] = time.perf_counter() - started
+        if worker.compiles >= self.max_compiles or worker.rss >= self.max_rss_bytes:
+            self._recycle()
+        return result
+
+    def compile_file(self, input_file, output_file, view_name, function_name=None, factory_function_name=None):
+        """Compile input_file into output_file; returns the result dict (without the code)"""
+        with open(input_file, 'r', encoding='utf-8') as f:
+            blade_code = f.read()
+        result = self.compile(blade_code, view_name, function_name, factory_function_name)
+        if result['ok']:
+            code = result.pop('code')
+            with open(output_file, 'w', encoding='utf-8') as f:
+                f.write(code)
+            result['size'] = len(code.encode('utf-8'))
+            write_style_sidecar(output_file, result.pop('styles', []))
+        result['file'] = input_file
+        return result
+
+    def close(self):
+        if self.worker is not None:
+            self.worker.stop()
+            self.worker = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -5,6 +5,12 @@ Binding Directive Service - Xử lý @val và @bind directives
 
 import re
 
+# @bind.lazy / @bind.number / @bind.debounce(200) (chainable: @bind.lazy.number($age))
+# Any .name(...) chain is captured so unknown modifiers fail loudly instead of leaking into HTML
+BINDING_MODIFIER_PATTERN = re.compile(r'\.(\w+)(?:\(([^()]*)\))?')
+BINDING_MODIFIERS = ('lazy', 'number', 'debounce')
+DEFAULT_DEBOUNCE_MS = 300
+
 class BindingDirectiveService:
     def __init__(self):
         pass
@@ -14,13 +20,14 @@ class BindingDirectiveService:
         Process binding directives (@val and @bind are aliases)
         @val($userState->name) -> data-binding="userState.name"
         @bind($username) -> data-binding="username"
+        @bind.lazy.number($age) -> data-binding="age" data-binding-event="change" data-binding-cast="number"
         Both directives produce the same output
         """
         def replace_binding_with_nested_parens(content):
             result = content
             while True:
-                # Find @val or @bind directive
-                match = re.search(rf'@({directive_pattern})\s*\(', result)
+                # Find @val or @bind directive (with optional modifiers)
+                match = re.search(rf'@({directive_pattern})((?:\.\w+(?:\([^()]*\))?)*)\s*\(', result)
                 if not match:
                     break
                 
@@ -38,7 +45,8 @@ class BindingDirectiveService:
                             # Found matching closing parenthesis
                             expression = result[start_pos + 1:i].strip()
                             binding_value = self._convert_php_to_binding(expression)
-                            replacement = f'data-binding="{binding_value}" data-view-id="${{__VIEW_ID__}}"'
+                            modifiers = self._binding_modifier_attributes(match.group(2), match.group(1))
+                            replacement = f'data-binding="{binding_value}"{modifiers} data-view-id="${{__VIEW_ID__}}"'
                             result = result[:match.start()] + replacement + result[i + 1:]
                             break
                     i += 1
@@ -50,6 +58,33 @@ class BindingDirectiveService:
         
         return replace_binding_with_nested_parens(content)
     
+    def _binding_modifier_attributes(self, modifiers, directive='bind'):
+        """
+        Compile-time binding modifiers → data attributes read by the runtime (TwoWayBinding.ts)
+        .lazy            -> data-binding-event="change" (update state on change, not every keystroke)
+        .debounce(200)   -> data-binding-debounce="200" (.debounce / .debounce() = 300ms)
+        .number          -> data-binding-cast="number"
+        Unknown modifier / non-numeric debounce → ValueError (compile error)
+        """
+        attributes = ''
+        for name, argument in BINDING_MODIFIER_PATTERN.findall(modifiers or ''):
+            argument = argument.strip()
+            if name not in BINDING_MODIFIERS:
+                raise ValueError(f"Modifier '.{name}' không hợp lệ trong @{directive}{modifiers} "
+                                 f"(hỗ trợ: {', '.join('.' + m for m in BINDING_MODIFIERS)})")
+            if argument and name != 'debounce':
+                raise ValueError(f"@{directive}.{name} không nhận tham số ('{argument}')")
+            if argument and not argument.isdigit():
+                raise ValueError(f"Tham số '{argument}' không hợp lệ cho @{directive}.debounce "
+                                 f"(cần số mili giây, vd. .debounce(200))")
+            if name == 'lazy':
+                attributes += ' data-binding-event="change"'
+            elif name == 'number':
+                attributes += ' data-binding-cast="number"'
+            elif name == 'debounce':
+                attributes += f' data-binding-debounce="{int(argument) if argument else DEFAULT_DEBOUNCE_MS}"'
+        return attributes
+    
     def process_val_directive(self, content):
         """
         Process @val directive (alias of process_binding_directive)
@@ -4,12 +4,17 @@ Supports: static classes, conditional classes, và mixed binding
 Uses separate __classBinding() method for reactive class management
 """
 
+import json
 import re
 from php_js_converter import php_to_js_advanced
+from constant_folder import fold_php_condition, NOT_CONSTANT
+from expression_tokenizer import split_top_level
 
 class ClassBindingHandler:
     def __init__(self, state_variables=None):
         self.state_variables = state_variables or set()
+        # Compile-time slot of each dynamic @class site: the runtime keys its binding by slot + render scope
+        self.slot_counter = 0
     
     def process_class_directive(self, content):
         """
@@ -23,7 +28,7 @@ class ClassBindingHandler:
         
         Output format:
         - Static only: class="static-class"
-        - With dynamic: ${this.__classBinding([...])}
+        - With dynamic: ${this.__classBinding(slot, "static", [[class, checker, states], ...])}
         
         Note: Supports multi-line directives within HTML tag attributes
         """
@@ -141,7 +146,7 @@ class ClassBindingHandler:
     def _generate_output_from_bindings(self, bindings):
         """
         Generate output from a list of bindings
-        Returns either static class="..." or ${this.__classBinding([...])}
+        Returns either static class="..." or ${this.__classBinding(slot, "static", [...])}
         """
         # Check if all bindings are static
         has_dynamic = any(b['type'] == 'binding' for b in bindings)
@@ -149,6 +154,9 @@ class ClassBindingHandler:
         if not has_dynamic:
             # All static - output direct class attribute
             static_classes = [b['value'] for b in bindings]
+            if not static_classes:
+                # Every conditional class folded to false
+                return ''
             return f'class="{" ".join(static_classes)}"'
         else:
             # Has dynamic - use __classBinding
@@ -156,23 +164,20 @@ class ClassBindingHandler:
     
     def _generate_class_binding_config(self, bindings):
         """
-        Generate __classBinding() config
-        Format: ${this.__classBinding([{type: "static", value: "...", states: [...], checker: () => ...}])}
+        Generate __classBinding() call: constant classes once, conditional ones as toggles
+        Format: ${this.__classBinding(slot, "static classes", [["class", () => checker, ["state"]], ...])}
+        Runtime flips single classes with classList.toggle when their states change
         """
-        binding_configs = []
-        
+        static_classes = ' '.join(b['value'] for b in bindings if b['type'] == 'static' and b['value'])
+        toggles = []
         for binding in bindings:
-            if binding['type'] == 'static':
-                binding_configs.append(f'{{type: "static", value: "{binding["value"]}"}}')
-            elif binding['type'] == 'binding':
-                states = binding.get('states', [])
-                states_str = ', '.join([f'"{s}"' for s in states])
-                checker = binding['checker']
-                class_name = binding['value']
-                binding_configs.append(f'{{type: "binding", value: "{class_name}", states: [{states_str}], checker: () => {checker}}}')
+            if binding['type'] == 'binding':
+                states_str = ', '.join(json.dumps(s) for s in binding.get('states', []))
+                toggles.append(f'[{json.dumps(binding["value"])}, () => {binding["checker"]}, [{states_str}]]')
         
-        configs_joined = ', '.join(binding_configs)
-        return f'${{this.__classBinding([{configs_joined}])}}'
+        slot = self.slot_counter
+        self.slot_counter += 1
+        return f'${{this.__classBinding({slot}, {json.dumps(static_classes)}, [{", ".join(toggles)}])}}'
     
     def _parse_class_expression(self, expression):
         """
@@ -192,6 +197,10 @@ class ClassBindingHandler:
             if len(parts) == 2:
                 class_name = self._extract_string_value(parts[0].strip())
                 condition = parts[1].strip()
+                constant = fold_php_condition(condition)
+                if constant is not NOT_CONSTANT:
+                    # @class('a', true) / @class('a', false): decided at compile time
+                    return [{"type": "static", "value": class_name}] if constant else []
                 states = self._extract_state_variables(condition)
                 js_condition = self._convert_php_to_js(condition)
                 return [{
@@ -231,11 +240,17 @@ class ClassBindingHandler:
                 class_name = self._extract_string_value(parts[0].strip())
                 condition = parts[1].strip()
                 
+                constant = fold_php_condition(condition)
+                
                 # Check if condition is a static string
                 if self._is_simple_string(condition):
                     # Static value like 'demo' => 'dump'
                     static_value = self._extract_string_value(condition)
                     bindings.append({"type": "static", "value": static_value})
+                elif constant is not NOT_CONSTANT:
+                    # Literal condition ('a' => true, 'b' => 1 > 2): static class or dropped
+                    if constant:
+                        bindings.append({"type": "static", "value": class_name})
                 else:
                     # Dynamic condition
                     states = self._extract_state_variables(condition)
@@ -257,44 +272,7 @@ class ClassBindingHandler:
         """
         Split array items by comma, respecting nested structures
         """
-        items = []
-        current = []
-        depth = 0
-        in_string = False
-        string_char = None
-        i = 0
-        
-        while i < len(content):
-            char = content[i]
-            
-            # Handle string boundaries
-            if char in ('"', "'") and (i == 0 or content[i-1] != '\\'):
-                if not in_string:
-                    in_string = True
-                    string_char = char
-                elif char == string_char:
-                    in_string = False
-                    string_char = None
-            
-            # Handle nested structures
-            if not in_string:
-                if char in '([{':
-                    depth += 1
-                elif char in ')]}':
-                    depth -= 1
-                elif char == ',' and depth == 0:
-                    items.append(''.join(current))
-                    current = []
-                    i += 1
-                    continue
-            
-            current.append(char)
-            i += 1
-        
-        if current:
-            items.append(''.join(current))
-        
-        return items
+        return split_top_level(content, ',', strip=False)
     
     def _split_arguments(self, expression):
         """
@@ -4,12 +4,75 @@ Command line interface cho Blade Compiler
 
 import sys
 import os
+import json
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from main_compiler import BladeCompiler
+from style_extractor import write_style_sidecar
+
+def _job_args(job):
+    """Normalize a batch/daemon job: input/output/view/function/factory"""
+    view_path = job.get('view', 'test')
+    function_name = job.get('function') or 'Test'
+    factory_function_name = job.get('factory') or function_name
+    return view_path, function_name, factory_function_name
+
+def run_batch(jobs_file):
+    """Compile every job in a JSON list file with time budget and worker recycling"""
+    from batch_compiler import BatchCompiler
+
+    with open(jobs_file, 'r', encoding='utf-8') as f:
+        jobs = json.load(f)
+
+    failures = 0
+    with BatchCompiler() as batch:
+        for job in jobs:
+            view_path, function_name, factory_function_name = _job_args(job)
+            result = batch.compile_file(job['input'], job['output'], view_path, function_name, factory_function_name)
+            if result['ok']:
+                print(f"Đã compile thành công từ {job['input']} sang {job['output']} ({result['elapsed']:.2f}s, {result['size']} bytes)")
+            else:
+                failures += 1
+                print(f"Lỗi: {job['input']} [stage: {result.get('stage') or 'unknown'}] {result['error']}", file=sys.stderr)
+        print(f"{len(jobs) - failures}/{len(jobs)} view(s) compiled, {batch.recycled} worker recycle(s)")
+    return 1 if failures else 0
+
+def run_daemon():
+    """
+    JSON-lines daemon: one job per stdin line, one result per stdout line.
+    Job: {"input": path, "output": path, "view": ..., "function": ..., "factory": ...}
+    or {"code": blade_code, "view": ...} to get the compiled code back inline.
+    """
+    from batch_compiler import BatchCompiler
+
+    with BatchCompiler() as batch:
+        for line in sys.stdin:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                job = json.loads(line)
+                view_path, function_name, factory_function_name = _job_args(job)
+                if 'code' in job:
+                    result = batch.compile(job['code'], view_path, function_name, factory_function_name)
+                else:
+                    result = batch.compile_file(job['input'], job['output'], view_path, function_name, factory_function_name)
+            except Exception as e:
+                result = {'ok': False, 'error': str(e), 'stage': None, 'timeout': False}
+            result.pop('rss', None)
+            sys.stdout.write(json.dumps(result, ensure_ascii=False) + "\n")
+            sys.stdout.flush()
+    return 0
 
 def main():
+    if len(sys.argv) >= 3 and sys.argv[1] == '--batch':
+        sys.exit(run_batch(sys.argv[2]))
+    if len(sys.argv) >= 2 and sys.argv[1] == '--daemon':
+        sys.exit(run_daemon())
+
     if len(sys.argv) < 3:
         print("Sử dụng: python cli.py <input.blade> <output.js> [function_name] [view_path] [factory_function_name]")
+        print("         python cli.py --batch <jobs.json>")
+        print("         python cli.py --daemon")
         sys.exit(1)
     
     input_file = sys.argv[1]
@@ -27,8 +90,11 @@ def main():
         
         with open(output_file, 'w', encoding='utf-8') as f:
             f.write(js_code)
+        write_style_sidecar(output_file, compiler.extracted_styles)
+        
+        compiler.memory_reporter.print_report()
         
-        print(f"Đã compile thành công từ {input_file} sang {output_file}")
+        print(f"Đã compile thành công từ {input_file} sang {output_file} ({len(js_code.encode('utf-8'))} bytes)")
     except Exception as e:
         print(f"Lỗi: {e}")
         sys.exit(1)
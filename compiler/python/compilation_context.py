@@ -0,0 +1,62 @@
+"""
+Compilation context - state riêng cho một lần compile view
+
+BladeCompiler chỉ giữ các thành phần read-only dùng chung (view.js template,
+DirectiveParsers, TemplateAnalyzer, CompilerUtils, BindingDirectiveService).
+Mọi state thay đổi trong lúc compile (TypeScript flag, state variables,
+watch counter, update functions, các parser/processor có state) nằm trên
+CompilationContext, nên một BladeCompiler có thể phục vụ nhiều compile đồng
+thời (thread pool / asyncio compile server).
+"""
+
+from template_processor import TemplateProcessor
+from function_generators import FunctionGenerators
+from wrapper_parser import WrapperParser
+from register_parser import RegisterParser
+from declaration_tracker import DeclarationTracker
+from style_directive_handler import StyleDirectiveHandler
+from show_directive_handler import ShowDirectiveHandler
+
+
+class CompilationContext:
+    """Per-view compile state, created by BladeCompiler for each compile_blade_to_js call"""
+
+    def __init__(self, view_name, function_name, factory_function_name):
+        self.view_name = view_name
+        self.function_name = function_name
+        self.factory_function_name = factory_function_name
+        self.is_typescript = False
+        self.state_variables = set()
+        self.update_functions = []  # update$stateKey functions
+        self.stage = None  # Current pipeline stage
+        self.extracted_styles = []  # <style> CSS moved out of the view (ONEJS_EXTRACT_STYLES)
+
+        # Stateful pipeline components - one set per compile
+        self.template_processor = TemplateProcessor(is_typescript=False)
+        self.function_generators = FunctionGenerators(is_typescript=False)
+        self.wrapper_parser = WrapperParser()
+        self.register_parser = RegisterParser()
+        self.declaration_tracker = DeclarationTracker()
+        self.style_directive_handler = StyleDirectiveHandler()
+        self.show_directive_handler = ShowDirectiveHandler()
+
+    def set_typescript(self, is_typescript):
+        """Propagate the TypeScript flag once <script setup lang="ts"> has been detected"""
+        self.is_typescript = is_typescript
+        self.template_processor._is_typescript = is_typescript
+        self.template_processor.echo_processor._is_typescript = is_typescript
+        self.template_processor.loop_handlers._is_typescript = is_typescript
+        self.function_generators._is_typescript = is_typescript
+
+    def set_state_variables(self, state_variables):
+        """Share the useState variable set with every processor that needs it"""
+        self.state_variables = state_variables
+        # Don't reinitialize template_processor to preserve its reactive ID counters
+        self.template_processor.state_variables = state_variables
+        self.template_processor.conditional_handlers.state_variables = state_variables
+        self.template_processor.loop_handlers.state_variables = state_variables
+        self.template_processor.event_processor.state_variables = state_variables
+        self.template_processor.echo_processor.state_variables = state_variables
+        self.template_processor.class_binding_handler.state_variables = state_variables
+        self.style_directive_handler.state_variables = state_variables
+        self.show_directive_handler.state_variables = state_variables
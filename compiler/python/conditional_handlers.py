@@ -5,6 +5,7 @@ Handlers cho các conditional directives (@if, @switch, etc.)
 from config import JS_FUNCTION_PREFIX
 from php_converter import php_to_js
 from utils import extract_balanced_parentheses
+from constant_folder import fold_php_condition, NOT_CONSTANT
 import re
 
 class ConditionalHandlers:
@@ -40,6 +41,17 @@ class ConditionalHandlers:
             condition_text, end_pos = extract_balanced_parentheses(line, if_pos)
             if condition_text is not None:
                 condition_php = condition_text.strip()
+                
+                # @if(true) / @if(false): prune at compile time (not inside @for/@while,
+                # whose bodies are emitted as __forOutputContent__ += ... statements)
+                constant = fold_php_condition(condition_php)
+                in_loop = bool(stack) and stack[-1][0] in ['for', 'while']
+                if constant is not NOT_CONSTANT and not in_loop:
+                    fold = {'active': constant, 'taken': constant}
+                    self._open_folded_branch(fold, output)
+                    stack.append(('if', len(output), [], is_attribute_context, False, fold))
+                    return True
+                
                 condition = php_to_js(condition_php)
                 
                 # Extract variables from condition
@@ -63,14 +75,18 @@ class ConditionalHandlers:
                 # If inside a loop and has state vars, use concat += with __watch
                 if parent_is_loop and watch_keys:
                     if self.processor:
-                        self.processor.watch_counter += 1
-                        watch_id = f"`${{__VIEW_ID__}}-watch-{self.processor.watch_counter}-${{__loop.index}}`"
+                        watch_id = self.processor.reactive_ids.watch_id(loop_scoped=True)
                     else:
                         watch_id = "`${__VIEW_ID__}-watch-0-${__loop.index}`"
                     result = f"{parent_concat_var} += this.__reactive({watch_id}, {watch_keys}, () => {{ if({condition}){{ return `"
-                # If inside a loop but no state vars, use concat += with IIFE
+                # If inside a loop but no state vars, use concat += with a plain ternary
+                # (no closure per iteration; invariant conditions are hoisted at @endfor/@endwhile)
                 elif parent_is_loop:
-                    result = f"{parent_concat_var} += (() => {{ if({condition}){{ return `"
+                    result = f"{parent_concat_var} += ({condition}) ? `"
+                    output.append(result)
+                    self._add_hoist_candidate(stack[-1], len(output) - 1, condition)
+                    stack.append(('if', len(output), watch_keys, is_attribute_context, parent_is_loop, None, {'has_else': False}))
+                    return True
                 # Only wrap with __watch for block-level directives (not attributes, not in loops)
                 elif is_attribute_context or not watch_keys:
                     # Attribute directive or no state vars - no watch wrapping
@@ -78,8 +94,7 @@ class ConditionalHandlers:
                 else:
                     # Block directive with state vars - wrap with __watch
                     if self.processor:
-                        self.processor.watch_counter += 1
-                        watch_id = f"`${{__VIEW_ID__}}-watch-{self.processor.watch_counter}`"
+                        watch_id = self.processor.reactive_ids.watch_id()
                     else:
                         watch_id = "`${__VIEW_ID__}-watch-0`"
                     result = f"${{this.__reactive({watch_id}, {watch_keys}, () => {{ if({condition}){{ return `"
@@ -89,6 +104,41 @@ class ConditionalHandlers:
                 return True
         return False
     
+    def _folded_if(self, stack):
+        """Fold state of the innermost @if when its condition was a compile-time constant"""
+        if stack and stack[-1][0] == 'if' and len(stack[-1]) > 5:
+            return stack[-1][5]
+        return None
+    
+    def _ternary_if(self, stack):
+        """Ternary state of the innermost @if when it was emitted as `cond ? ... : ''` in a loop body"""
+        if stack and stack[-1][0] == 'if' and len(stack[-1]) > 6:
+            return stack[-1][6]
+        return None
+    
+    def _add_hoist_candidate(self, loop_entry, output_index, condition):
+        """Remember a loop-body ternary condition; @endfor/@endwhile hoists it when loop-invariant"""
+        if loop_entry and isinstance(loop_entry[-1], list):
+            loop_entry[-1].append((output_index, condition))
+    
+    def _collected_sections(self):
+        """Sections list the template processor is filling for the current compile"""
+        return getattr(self.processor, 'collected_sections', None)
+    
+    def _open_folded_branch(self, fold, output):
+        """Remember where a folded branch starts in the output and in the collected sections"""
+        fold['start'] = len(output)
+        sections = self._collected_sections()
+        fold['sections_start'] = len(sections) if sections is not None else 0
+    
+    def _close_folded_branch(self, fold, output):
+        """Drop everything emitted by a branch that can never be taken, including its @section/@block"""
+        if not fold['active']:
+            del output[fold['start']:]
+            sections = self._collected_sections()
+            if sections is not None:
+                del sections[fold['sections_start']:]
+    
     def process_elseif_directive(self, line, stack, output):
         """Process @elseif directive"""
         elseif_pos = line.find('(')
@@ -96,17 +146,39 @@ class ConditionalHandlers:
             condition_text, end_pos = extract_balanced_parentheses(line, elseif_pos)
             if condition_text is not None:
                 condition_php = condition_text.strip()
+                
+                fold = self._folded_if(stack)
+                if fold is not None:
+                    self._close_folded_branch(fold, output)
+                    self._open_folded_branch(fold, output)
+                    if fold['taken']:
+                        fold['active'] = False
+                        return True
+                    constant = fold_php_condition(condition_php)
+                    if constant is not NOT_CONSTANT:
+                        fold['active'] = fold['taken'] = constant
+                        return True
+                    # Every previous branch was false: the rest of the chain is a plain @if
+                    is_attribute = stack.pop()[3]
+                    return self.process_if_directive(f"@if({condition_text})", stack, output, is_attribute)
+                
                 condition = php_to_js(condition_php)
                 
+                if self._ternary_if(stack) is not None:
+                    output.append(f"` : ({condition}) ? `")
+                    if len(stack) > 1:
+                        self._add_hoist_candidate(stack[-2], len(output) - 1, condition)
+                    return True
+                
                 # Extract variables and merge with existing if block's watch keys
                 variables = self._extract_variables(condition)
                 state_vars_used = variables & self.state_variables
                 
-                # Update watch_keys in stack
+                # Update watch_keys in stack (keep is_attribute / parent_is_loop)
                 if stack and stack[-1][0] == 'if':
                     existing_keys = set(stack[-1][2]) if len(stack[-1]) > 2 else set()
                     new_keys = existing_keys | state_vars_used
-                    stack[-1] = ('if', stack[-1][1], list(new_keys))
+                    stack[-1] = ('if', stack[-1][1], list(new_keys)) + tuple(stack[-1][3:])
                 
                 result = f"`; }} else if({condition}){{ return `"
                 output.append(result)
@@ -120,18 +192,44 @@ class ConditionalHandlers:
         if stack and stack[-1][0] == 'if':
             parent_is_loop = stack[-1][4] if len(stack[-1]) > 4 else False
         
+        fold = self._folded_if(stack)
+        if fold is not None:
+            self._close_folded_branch(fold, output)
+            self._open_folded_branch(fold, output)
+            fold['active'] = not fold['taken']
+            fold['taken'] = True
+            return True
+        
+        ternary = self._ternary_if(stack)
+        if ternary is not None:
+            ternary['has_else'] = True
+            output.append("` : `")
+            return True
+        
         result = f"`; }} else {{ return `"
         output.append(result)
         return True
     
     def process_endif_directive(self, stack, output):
         """Process @endif directive"""
+        fold = self._folded_if(stack)
+        if fold is not None:
+            self._close_folded_branch(fold, output)
+            stack.pop()
+            return True
+        
         if stack and stack[-1][0] == 'if':
             is_attribute = stack[-1][3] if len(stack[-1]) > 3 else False
             parent_is_loop = stack[-1][4] if len(stack[-1]) > 4 else False
             watch_keys = stack[-1][2] if len(stack[-1]) > 2 else []
+            ternary = self._ternary_if(stack)
             stack.pop()
             
+            if ternary is not None:
+                # Loop body ternary: `cond ? `...` : ''` (or the @else branch)
+                output.append('`;' if ternary['has_else'] else "` : '';")
+                return True
+            
             output.append('`; }')
             output.append("return '';")
             
@@ -139,9 +237,6 @@ class ConditionalHandlers:
                 # Inside loop with state vars - close watch without template wrapper
                 # Pattern: })); where } closes arrow func, )) closes watch call, ; ends statement
                 output.append('});')
-            elif parent_is_loop:
-                # Inside loop without state vars - close IIFE with immediate execution
-                output.append('})')
             else:
                 # Normal block - close IIFE or watch
                 output.append('})}')
@@ -186,8 +281,7 @@ class ConditionalHandlers:
                         result = f"{concat_var} += this.__execute(() => {{\n{switch_logic}"
                     else:
                         if self.processor:
-                            self.processor.watch_counter += 1
-                            watch_id = f"`${{__VIEW_ID__}}-watch-{self.processor.watch_counter}`"
+                            watch_id = self.processor.reactive_ids.watch_id()
                         else:
                             watch_id = "`${__VIEW_ID__}-watch-0`"
                         result = f"{concat_var} += this.__reactive({watch_id}, {watch_keys}, () => {{\n{switch_logic}"
@@ -197,8 +291,7 @@ class ConditionalHandlers:
                         result = f"${{this.__execute(() => {{\n{switch_logic}"
                     else:
                         if self.processor:
-                            self.processor.watch_counter += 1
-                            watch_id = f"`${{__VIEW_ID__}}-watch-{self.processor.watch_counter}`"
+                            watch_id = self.processor.reactive_ids.watch_id()
                         else:
                             watch_id = "`${__VIEW_ID__}-watch-0`"
                         result = f"${{this.__reactive({watch_id}, {watch_keys}, () => {{\n{switch_logic}"
@@ -0,0 +1,343 @@
+"""
+Compile-time constant folding cho PHP expressions chỉ gồm literal
+
+Ví dụ {{ 'Total: ' . 10 * 3 }}, @if(true), @class(['a' => true]) (thường do layout
+generator sinh ra) được tính lúc compile thay vì chuyển thành JS chạy lại mỗi lần render.
+Hỗ trợ số, chuỗi, true/false/null, số học, nối chuỗi (.), so sánh, logic, ?? và ternary
+theo thứ tự ưu tiên của PHP 8. Expression có biến, hàm, hoặc phép toán mà PHP type
+juggling khó đoán (string + int, so sánh lỏng khác kiểu...) thì không fold.
+"""
+
+import html
+import re
+
+NOT_CONSTANT = object()
+
+_INT_MAX = 2 ** 63 - 1
+_INT_MIN = -2 ** 63
+
+_TOKEN_PATTERN = re.compile(r"""
+    (?P<ws>\s+)
+  | (?P<number>0[xX][0-9a-fA-F_]+|0[bB][01_]+|0[oO][0-7_]+|(?:\d[\d_]*)?\.\d[\d_]*(?:[eE][+-]?\d+)?|\d[\d_]*(?:\.(?!\.)[\d_]*)?(?:[eE][+-]?\d+)?)
+  | (?P<sq>'(?:[^'\\]|\\.)*')
+  | (?P<dq>"(?:[^"\\]|\\.)*")
+  | (?P<op>===|!==|<=>|\*\*|==|!=|<>|<=|>=|&&|\|\||\?\?|\?:|[-+*/%.!<>?:()])
+  | (?P<word>[A-Za-z_]\w*)
+""", re.VERBOSE)
+
+_KEYWORD_VALUES = {'true': True, 'false': False, 'null': None}
+_WORD_OPERATORS = {'and', 'or', 'xor'}
+
+# Binary operator -> (precedence, right associative); PHP 8 order, '.' below '+'/'-'
+_BINARY = {
+    'or': (1, False), 'xor': (2, False), 'and': (3, False),
+    '??': (5, True),
+    '||': (6, False), '&&': (7, False),
+    '==': (8, False), '!=': (8, False), '<>': (8, False), '===': (8, False), '!==': (8, False), '<=>': (8, False),
+    '<': (9, False), '<=': (9, False), '>': (9, False), '>=': (9, False),
+    '.': (10, False),
+    '+': (11, False), '-': (11, False),
+    '*': (12, False), '/': (12, False), '%': (12, False),
+    '**': (14, True),
+}
+_TERNARY_PRECEDENCE = 4
+_UNARY_PRECEDENCE = 13
+
+_DQ_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'v': '\v', 'f': '\f', '\\': '\\', '"': '"', '$': '$'}
+
+
+class _NotConstant(Exception):
+    pass
+
+
+def _tokenize(expr):
+    tokens = []
+    pos = 0
+    while pos < len(expr):
+        match = _TOKEN_PATTERN.match(expr, pos)
+        if not match:
+            raise _NotConstant()
+        pos = match.end()
+        kind = match.lastgroup
+        text = match.group()
+        if kind == 'ws':
+            continue
+        if kind == 'number':
+            tokens.append(('value', _parse_number(text)))
+        elif kind == 'sq':
+            tokens.append(('value', re.sub(r"\\([\\'])", r'\1', text[1:-1])))
+        elif kind == 'dq':
+            tokens.append(('value', _parse_double_quoted(text[1:-1])))
+        elif kind == 'word':
+            lowered = text.lower()
+            if lowered in _KEYWORD_VALUES:
+                tokens.append(('value', _KEYWORD_VALUES[lowered]))
+            elif lowered in _WORD_OPERATORS:
+                tokens.append(('op', lowered))
+            else:
+                # Constants, function names... are not foldable
+                raise _NotConstant()
+        else:
+            tokens.append(('op', text))
+    return tokens
+
+
+def _parse_number(text):
+    text = text.replace('_', '')
+    if text[:2].lower() in ('0x', '0b', '0o'):
+        return int(text, 0)
+    if any(c in text for c in '.eE'):
+        return float(text)
+    if len(text) > 1 and text.startswith('0'):
+        return int(text, 8)
+    return int(text)
+
+
+def _parse_double_quoted(body):
+    out = []
+    i = 0
+    while i < len(body):
+        c = body[i]
+        if c == '$':
+            # Interpolation ("\\$x" is an escaped backslash followed by $x)
+            raise _NotConstant()
+        if c == '\\' and i + 1 < len(body):
+            nxt = body[i + 1]
+            if nxt not in _DQ_ESCAPES:
+                raise _NotConstant()
+            out.append(_DQ_ESCAPES[nxt])
+            i += 2
+            continue
+        out.append(c)
+        i += 1
+    return ''.join(out)
+
+
+class _Parser:
+    """Precedence-climbing evaluator over literal tokens"""
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def take(self, op=None):
+        token = self.peek()
+        if token[0] is None or (op is not None and token != ('op', op)):
+            raise _NotConstant()
+        self.pos += 1
+        return token
+
+    def parse(self):
+        value = self.expression(0)
+        if self.pos != len(self.tokens):
+            raise _NotConstant()
+        return value
+
+    def expression(self, min_precedence):
+        left = self.unary()
+        previous_ternary = None
+        while True:
+            kind, op = self.peek()
+            if kind != 'op':
+                break
+            if op in ('?', '?:') and _TERNARY_PRECEDENCE >= min_precedence:
+                if previous_ternary and not (previous_ternary == op == '?:'):
+                    # PHP 8: unparenthesized nested ternary is a compile error (only a ?: b ?: c chains)
+                    raise _NotConstant()
+                previous_ternary = op
+                self.pos += 1
+                if op == '?:':
+                    right = self.expression(_TERNARY_PRECEDENCE + 1)
+                    left = left if _truthy(left) else right
+                    continue
+                when_true = self.expression(0)
+                self.take(':')
+                when_false = self.expression(_TERNARY_PRECEDENCE + 1)
+                left = when_true if _truthy(left) else when_false
+                continue
+            if op not in _BINARY:
+                break
+            precedence, right_assoc = _BINARY[op]
+            if precedence < min_precedence:
+                break
+            self.pos += 1
+            right = self.expression(precedence if right_assoc else precedence + 1)
+            left = _binary(op, left, right)
+        return left
+
+    def unary(self):
+        kind, value = self.peek()
+        if kind == 'value':
+            self.pos += 1
+            return value
+        if (kind, value) == ('op', '('):
+            self.pos += 1
+            inner = self.expression(0)
+            self.take(')')
+            return inner
+        if kind == 'op' and value in ('!', '-', '+'):
+            self.pos += 1
+            operand = self.expression(_UNARY_PRECEDENCE)
+            if value == '!':
+                return not _truthy(operand)
+            _require_number(operand)
+            return _check_int(-operand) if value == '-' else operand
+        raise _NotConstant()
+
+
+def _truthy(value):
+    """PHP boolean conversion"""
+    if isinstance(value, str):
+        return value not in ('', '0')
+    return bool(value)
+
+
+def _require_number(*values):
+    for value in values:
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise _NotConstant()
+
+
+def _check_int(value):
+    if isinstance(value, int) and not _INT_MIN <= value <= _INT_MAX:
+        # PHP would overflow to float
+        raise _NotConstant()
+    return value
+
+
+def _comparable(left, right):
+    """Loose comparison is only folded where PHP 8 and a naive comparison agree"""
+    if isinstance(left, bool) and isinstance(right, bool):
+        return True
+    if isinstance(left, str) and isinstance(right, str):
+        return not (_is_numeric_string(left) or _is_numeric_string(right))
+    try:
+        _require_number(left, right)
+    except _NotConstant:
+        return left is None and right is None
+    return True
+
+
+def _is_numeric_string(value):
+    return re.fullmatch(r'\s*[+-]?(\d+(\.\d*)?|\.\d+)([eE][+-]?\d+)?\s*', value) is not None
+
+
+def _binary(op, left, right):
+    if op == '.':
+        return to_php_string(left) + to_php_string(right)
+    if op in ('&&', 'and'):
+        return _truthy(left) and _truthy(right)
+    if op in ('||', 'or'):
+        return _truthy(left) or _truthy(right)
+    if op == 'xor':
+        return _truthy(left) != _truthy(right)
+    if op == '??':
+        return right if left is None else left
+    if op == '===':
+        return type(left) is type(right) and left == right
+    if op == '!==':
+        return not (type(left) is type(right) and left == right)
+    if op in ('==', '!=', '<>', '<', '<=', '>', '>=', '<=>'):
+        if not _comparable(left, right):
+            raise _NotConstant()
+        if op == '==':
+            return left == right
+        if op in ('!=', '<>'):
+            return left != right
+        if left is None:
+            left = right = 0
+        if op == '<':
+            return left < right
+        if op == '<=':
+            return left <= right
+        if op == '>':
+            return left > right
+        if op == '>=':
+            return left >= right
+        return (left > right) - (left < right)
+
+    _require_number(left, right)
+    if op == '+':
+        return _check_int(left + right)
+    if op == '-':
+        return _check_int(left - right)
+    if op == '*':
+        return _check_int(left * right)
+    if op == '**':
+        if isinstance(left, int) and isinstance(right, int) and right >= 0:
+            if right > 64 and abs(left) > 1:
+                raise _NotConstant()
+            return _check_int(left ** right)
+        raise _NotConstant()
+    if op == '/':
+        if right == 0:
+            # DivisionByZeroError at runtime - leave it to PHP/JS
+            raise _NotConstant()
+        if isinstance(left, int) and isinstance(right, int) and left % right == 0:
+            return _check_int(left // right)
+        return left / right
+    if op == '%':
+        left, right = int(left), int(right)
+        if right == 0:
+            # 5 % 0.5: PHP converts operands to int first → DivisionByZeroError
+            raise _NotConstant()
+        # PHP % truncates toward zero (sign follows the dividend)
+        result = abs(left) % abs(right)
+        return -result if left < 0 else result
+    raise _NotConstant()
+
+
+def to_php_string(value):
+    """PHP string conversion (echo / concatenation)"""
+    if value is True:
+        return '1'
+    if value is False or value is None:
+        return ''
+    if isinstance(value, float):
+        if value != value or value in (float('inf'), float('-inf')):
+            raise _NotConstant()
+        text = '%.14G' % value
+        if 'E' in text:
+            # PHP formats these as 1.0E+25; not worth mirroring
+            raise _NotConstant()
+        return '-0' if text == '-0' else text
+    return str(value)
+
+
+def fold_php_constant(expr):
+    """Evaluate a literal-only PHP expression; returns NOT_CONSTANT when it cannot be folded safely"""
+    if not expr or not expr.strip():
+        return NOT_CONSTANT
+    try:
+        return _Parser(_tokenize(expr.strip())).parse()
+    except (_NotConstant, ValueError, OverflowError, ZeroDivisionError, RecursionError):
+        return NOT_CONSTANT
+
+
+def fold_php_condition(expr):
+    """Fold a condition to True/False, or NOT_CONSTANT"""
+    value = fold_php_constant(expr)
+    return NOT_CONSTANT if value is NOT_CONSTANT else _truthy(value)
+
+
+def fold_php_echo(expr, escape=True):
+    """
+    Fold {{ expr }} / {!! expr !!} to the text PHP would print, escaped for a JS template literal.
+    Returns None when the expression is not constant.
+    """
+    value = fold_php_constant(expr)
+    if value is NOT_CONSTANT:
+        return None
+    try:
+        text = to_php_string(value)
+    except _NotConstant:
+        return None
+    if '@' in text or '{' in text:
+        # Would be picked up again as a directive / echo by later passes
+        return None
+    if escape:
+        text = html.escape(text, quote=True).replace('&#x27;', '&#039;')
+    return text.replace('\\', '\\\\').replace('`', '\\`').replace('${', '\\${')
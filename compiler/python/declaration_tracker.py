@@ -3,8 +3,10 @@ Declaration Tracker - Track thứ tự khai báo của @vars, @let, @const, @use
 """
 
 import re
-from utils import extract_balanced_parentheses
+from utils import extract_balanced_parentheses, replace_delimited_blocks, VERBATIM_OPEN, VERBATIM_CLOSE
 from php_converter import php_to_js, convert_php_array_to_json
+from models import Declaration, DeclaredVariable
+from expression_tokenizer import split_top_level, find_top_level
 
 class DeclarationTracker:
     """Track all variable declarations in order"""
@@ -14,7 +16,7 @@ class DeclarationTracker:
     
     def reset(self):
         """Reset tracker state"""
-        self.declarations = []  # List of {type, position, content, variables}
+        self.declarations = []  # List of Declaration(type, position, content, variables)
         
     def parse_all_declarations(self, blade_code):
         """Parse all declarations and track their order"""
@@ -34,7 +36,7 @@ class DeclarationTracker:
         self._find_usestate_declarations(blade_code_filtered)
         
         # Sort by position
-        self.declarations.sort(key=lambda x: x['position'])
+        self.declarations.sort(key=lambda x: x.position)
         
         return self.declarations
     
@@ -44,7 +46,7 @@ class DeclarationTracker:
     
     def _remove_verbatim_blocks(self, blade_code):
         """Remove @verbatim...@endverbatim blocks to avoid parsing declarations inside them"""
-        return re.sub(r'@verbatim\s*.*?\s*@endverbatim', '', blade_code, flags=re.DOTALL | re.IGNORECASE)
+        return replace_delimited_blocks(blade_code, VERBATIM_OPEN, VERBATIM_CLOSE, lambda full_block, inner: '')
     
     def _find_vars_declarations(self, blade_code):
         """Find all @vars declarations"""
@@ -54,12 +56,12 @@ class DeclarationTracker:
             content, end_pos = extract_balanced_parentheses(blade_code, start_pos)
             if content is not None and content.strip():
                 variables = self._parse_vars_content(content.strip())
-                self.declarations.append({
-                    'type': 'vars',
-                    'position': match.start(),
-                    'content': content.strip(),
-                    'variables': variables
-                })
+                self.declarations.append(Declaration(
+                    type='vars',
+                    position=match.start(),
+                    content=content.strip(),
+                    variables=tuple(variables)
+                ))
     
     def _find_let_declarations(self, blade_code):
         """Find all @let declarations"""
@@ -69,12 +71,12 @@ class DeclarationTracker:
             content, end_pos = extract_balanced_parentheses(blade_code, start_pos)
             if content is not None and content.strip():
                 variables = self._parse_let_content(content.strip())
-                self.declarations.append({
-                    'type': 'let',
-                    'position': match.start(),
-                    'content': content.strip(),
-                    'variables': variables
-                })
+                self.declarations.append(Declaration(
+                    type='let',
+                    position=match.start(),
+                    content=content.strip(),
+                    variables=tuple(variables)
+                ))
     
     def _find_const_declarations(self, blade_code):
         """Find all @const declarations"""
@@ -84,12 +86,12 @@ class DeclarationTracker:
             content, end_pos = extract_balanced_parentheses(blade_code, start_pos)
             if content is not None and content.strip():
                 variables = self._parse_const_content(content.strip())
-                self.declarations.append({
-                    'type': 'const',
-                    'position': match.start(),
-                    'content': content.strip(),
-                    'variables': variables
-                })
+                self.declarations.append(Declaration(
+                    type='const',
+                    position=match.start(),
+                    content=content.strip(),
+                    variables=tuple(variables)
+                ))
     
     def _find_usestate_declarations(self, blade_code):
         """Find all @useState declarations with format @useState($value, $varName, $setVarName)"""
@@ -100,12 +102,12 @@ class DeclarationTracker:
             if content is not None and content.strip():
                 variables = self._parse_usestate_content(content.strip())
                 if variables:  # Only add if we found valid variables
-                    self.declarations.append({
-                        'type': 'useState',
-                        'position': match.start(),
-                        'content': content.strip(),
-                        'variables': variables
-                    })
+                    self.declarations.append(Declaration(
+                        type='useState',
+                        position=match.start(),
+                        content=content.strip(),
+                        variables=tuple(variables)
+                    ))
     
     def _parse_vars_content(self, content):
         """Parse @vars content and extract variables"""
@@ -128,19 +130,19 @@ class DeclarationTracker:
                     var_value = part[equals_pos + 1:].strip()
                     # Convert PHP to JS
                     var_value_js = self._convert_php_to_js(var_value)
-                    variables.append({
-                        'name': var_name,
-                        'value': var_value_js,
-                        'hasDefault': True
-                    })
+                    variables.append(DeclaredVariable(
+                        name=var_name,
+                        value=var_value_js,
+                        has_default=True
+                    ))
             else:
                 # No default value: $test
                 var_name = part.strip().lstrip('$')
-                variables.append({
-                    'name': var_name,
-                    'value': None,
-                    'hasDefault': False
-                })
+                variables.append(DeclaredVariable(
+                    name=var_name,
+                    value=None,
+                    has_default=False
+                ))
         
         return variables
     
@@ -168,21 +170,21 @@ class DeclarationTracker:
                     var_name = part[:equals_pos].strip().lstrip('$')
                     var_value = part[equals_pos + 1:].strip()
                     var_value_js = self._convert_php_to_js(var_value)
-                    variables.append({
-                        'name': var_name,
-                        'value': var_value_js,
-                        'hasDefault': True,
-                        'isDestructuring': False
-                    })
+                    variables.append(DeclaredVariable(
+                        name=var_name,
+                        value=var_value_js,
+                        has_default=True,
+                        is_destructuring=False
+                    ))
             else:
                 # No assignment
                 var_name = part.strip().lstrip('$')
-                variables.append({
-                    'name': var_name,
-                    'value': None,
-                    'hasDefault': False,
-                    'isDestructuring': False
-                })
+                variables.append(DeclaredVariable(
+                    name=var_name,
+                    value=None,
+                    has_default=False,
+                    is_destructuring=False
+                ))
         
         return variables
     
@@ -200,9 +202,7 @@ class DeclarationTracker:
             if self._is_destructuring(part):
                 var_info = self._parse_destructuring(part)
                 if var_info:
-                    # Check if it's useState
-                    if var_info.get('value') and 'useState(' in var_info['value']:
-                        var_info['isUseState'] = True
+                    # is_use_state is already set when the right side calls useState(...)
                     variables.append(var_info)
                 continue
             
@@ -213,13 +213,13 @@ class DeclarationTracker:
                     var_name = part[:equals_pos].strip().lstrip('$')
                     var_value = part[equals_pos + 1:].strip()
                     var_value_js = self._convert_php_to_js(var_value)
-                    variables.append({
-                        'name': var_name,
-                        'value': var_value_js,
-                        'hasDefault': True,
-                        'isDestructuring': False,
-                        'isUseState': False
-                    })
+                    variables.append(DeclaredVariable(
+                        name=var_name,
+                        value=var_value_js,
+                        has_default=True,
+                        is_destructuring=False,
+                        is_use_state=False
+                    ))
         
         return variables
     
@@ -251,68 +251,21 @@ class DeclarationTracker:
         # Convert right side to JS
         right_js = self._convert_php_to_js(right)
         
-        return {
-            'names': var_names,
-            'value': right_js,
-            'isDestructuring': True,
-            'destructuringType': 'array' if '[' in left else 'object',
-            'isUseState': 'useState(' in right_js
-        }
+        return DeclaredVariable(
+            names=tuple(var_names),
+            value=right_js,
+            is_destructuring=True,
+            destructuring_type='array' if '[' in left else 'object',
+            is_use_state='useState(' in right_js
+        )
     
     def _split_by_comma(self, text):
         """Split by comma, respecting brackets and parentheses"""
-        parts = []
-        current = ''
-        depth = 0
-        in_string = False
-        string_char = ''
-        
-        for char in text:
-            if char in ['"', "'"]:
-                if in_string and char == string_char:
-                    in_string = False
-                elif not in_string:
-                    in_string = True
-                    string_char = char
-            elif not in_string:
-                if char in ['(', '[', '{']:
-                    depth += 1
-                elif char in [')', ']', '}']:
-                    depth -= 1
-                elif char == ',' and depth == 0:
-                    parts.append(current.strip())
-                    current = ''
-                    continue
-            
-            current += char
-        
-        if current.strip():
-            parts.append(current.strip())
-        
-        return parts
+        return split_top_level(text, ',')
     
     def _find_first_equals(self, text):
         """Find first = sign outside of brackets/parentheses"""
-        depth = 0
-        in_string = False
-        string_char = ''
-        
-        for i, char in enumerate(text):
-            if char in ['"', "'"]:
-                if in_string and char == string_char:
-                    in_string = False
-                elif not in_string:
-                    in_string = True
-                    string_char = char
-            elif not in_string:
-                if char in ['(', '[', '{']:
-                    depth += 1
-                elif char in [')', ']', '}']:
-                    depth -= 1
-                elif char == '=' and depth == 0:
-                    return i
-        
-        return -1
+        return find_top_level(text, '=')
     
     def _convert_php_to_js(self, expr):
         """Convert PHP expression to JavaScript"""
@@ -352,13 +305,13 @@ class DeclarationTracker:
                 value_js = self._convert_php_to_js(value)
                 
                 # Create a destructuring variable like @const([$varName, $setVarName] = useState(value))
-                return [{
-                    'names': [var_name, setter_name],
-                    'value': f'useState({value_js})',
-                    'isDestructuring': True,
-                    'destructuringType': 'array',
-                    'isUseState': True
-                }]
+                return [DeclaredVariable(
+                    names=(var_name, setter_name),
+                    value=f'useState({value_js})',
+                    is_destructuring=True,
+                    destructuring_type='array',
+                    is_use_state=True
+                )]
         
         # Original 3-parameter format
         if len(parts) == 3:
@@ -372,13 +325,13 @@ class DeclarationTracker:
             setter_name = setter_name.lstrip('$')
             
             # Create a destructuring variable like @let([$varName, $setVarName] = useState($value))
-            return [{
-                'names': [var_name, setter_name],
-                'value': f'useState({self._convert_php_to_js(value)})',
-                'isDestructuring': True,
-                'destructuringType': 'array',
-                'isUseState': True
-            }]
+            return [DeclaredVariable(
+                names=(var_name, setter_name),
+                value=f'useState({self._convert_php_to_js(value)})',
+                is_destructuring=True,
+                destructuring_type='array',
+                is_use_state=True
+            )]
         
         return []
     
@@ -409,12 +362,12 @@ class DeclarationTracker:
                 setter_name = f'set{key[0].upper()}{key[1:]}' if key else 'setValue'
                 
                 # Create destructuring for each state
-                variables.append({
-                    'names': [key, setter_name],
-                    'value': f'useState({value_js})',
-                    'isDestructuring': True,
-                    'destructuringType': 'array',
-                    'isUseState': True
-                })
+                variables.append(DeclaredVariable(
+                    names=(key, setter_name),
+                    value=f'useState({value_js})',
+                    is_destructuring=True,
+                    destructuring_type='array',
+                    is_use_state=True
+                ))
         
         return variables
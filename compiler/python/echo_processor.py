@@ -6,18 +6,21 @@ Phân biệt context: content, attribute value, tag body
 import re
 from php_js_converter import php_to_js_advanced
 from config import APP_VIEW_NAMESPACE, APP_HELPER_NAMESPACE
+from constant_folder import fold_php_echo
+from reactive_ids import ReactiveIdAllocator
 
 class EchoProcessor:
-    def __init__(self, state_variables=None, is_typescript=False):
+    def __init__(self, state_variables=None, is_typescript=False, reactive_ids=None):
         """
         Initialize echo processor with state variables
         
         Args:
             state_variables (set): Set of variable names from useState, let, const
             is_typescript (bool): Whether generating TypeScript code
+            reactive_ids (ReactiveIdAllocator): Block ID allocator shared with the template processor
         """
         self.state_variables = state_variables or set()
-        self.reactive_counter = 0
+        self.reactive_ids = reactive_ids or ReactiveIdAllocator.from_env()
         self._is_typescript = is_typescript
     
     def process_echo_expressions(self, template_content):
@@ -253,7 +256,11 @@ class EchoProcessor:
                     # Static - process inline
                     processed_value = attr_value
                     for expr_info in expressions:
-                        if expr_info['type'] == 'escaped':
+                        # Literal-only expressions are printed at compile time
+                        replacement = fold_php_echo(expr_info['php'], escape=expr_info['type'] == 'escaped')
+                        if replacement is not None:
+                            pass
+                        elif expr_info['type'] == 'escaped':
                             replacement = f"${{{APP_HELPER_NAMESPACE}.escString({expr_info['js']})}}"
                         else:
                             replacement = f"${{{expr_info['js']}}}"
@@ -321,6 +328,10 @@ class EchoProcessor:
         
         def replace_escaped_echo(match):
             expr = match.group(1).strip()
+            # Literal-only expression ({{ 'Total: ' . 10 * 3 }}): inline the printed text
+            folded = fold_php_echo(expr)
+            if folded is not None:
+                return folded
             js_expr = php_to_js_advanced(expr)
             variables = self._extract_variables(expr)
             
@@ -353,13 +364,16 @@ class EchoProcessor:
                 state_vars_list = list(state_vars_used)
                 # Use new __reactive method for better performance
                 rc_param = "(__rc__: any)" if self._is_typescript else "(__rc__)"
-                return f"${{this.__reactive(`{self._generate_reactive_id()}`, {state_vars_list}, {rc_param} => {js_expr}, {{type: 'output', escapeHTML: true}})}}"
+                return f"${{this.__reactive({self._generate_reactive_id()}, {state_vars_list}, {rc_param} => {js_expr}, {{type: 'output', escapeHTML: true}})}}"
             else:
                 # Static output
                 return f"${{{APP_HELPER_NAMESPACE}.escString({js_expr})}}"
         
         def replace_unescaped_echo(match):
             expr = match.group(1).strip()
+            folded = fold_php_echo(expr, escape=False)
+            if folded is not None:
+                return folded
             js_expr = php_to_js_advanced(expr)
             variables = self._extract_variables(expr)
             
@@ -387,7 +401,7 @@ class EchoProcessor:
                 # Reactive output (unescaped) using new __reactive method
                 state_vars_list = list(state_vars_used)
                 rc_param = "(__rc__: any)" if self._is_typescript else "(__rc__)"
-                return f"${{this.__reactive(`{self._generate_reactive_id()}`, {state_vars_list}, {rc_param} => {js_expr}, {{type: 'output', escapeHTML: false}})}}"
+                return f"${{this.__reactive({self._generate_reactive_id()}, {state_vars_list}, {rc_param} => {js_expr}, {{type: 'output', escapeHTML: false}})}}"
             else:
                 # Static output
                 return f"${{{js_expr}}}"
@@ -665,7 +679,6 @@ class EchoProcessor:
     
     def _generate_reactive_id(self):
         """
-        Generate unique reactive component ID
+        Generate unique reactive component ID (JavaScript expression)
         """
-        self.reactive_counter += 1
-        return f"rc-${{__VIEW_ID__}}-{self.reactive_counter}"
+        return self.reactive_ids.output_id()
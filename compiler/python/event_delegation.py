@@ -0,0 +1,77 @@
+"""
+Event delegation mode (ONEJS_EVENT_DELEGATION=1)
+
+Mặc định mỗi element có @click/@input/... gọi this.__addEventConfig(...) → một listener
+cho mỗi element lúc mount. Ở mode này element chỉ mang một reference nhỏ:
+    <button data-on-click="${__VIEW_ID__}:1">       (handler list hằng → bảng tĩnh của view)
+    <li data-on-click="${this.__eventRef("click", 2, [...])}">   (handler có closure)
+Giá trị luôn có tiền tố view ID, nên listener của view cha không chạy nhầm handler của view con
+(handler ID chỉ duy nhất trong một view).
+và view có một bảng sự kiện:
+    const __EVENT_TABLE__ = Object.freeze({types: ["click"], handlers: {"click": {"1": __EVENT_HANDLERS_0__}}});
+Runtime (EventDelegator) gắn một listener cho mỗi event type trên view root.
+Event không bubble (focus, blur, mouseenter, load, scroll...) vẫn dùng __addEventConfig.
+"""
+
+import json
+import os
+
+EVENT_TABLE_NAME = '__EVENT_TABLE__'
+
+# Events that bubble to the view root
+DELEGATED_EVENT_TYPES = frozenset([
+    'click', 'dblclick', 'auxclick', 'contextmenu', 'mousedown', 'mouseup', 'mouseover', 'mouseout',
+    'mousemove', 'wheel', 'keydown', 'keyup', 'keypress', 'input', 'change', 'submit', 'reset',
+    'focusin', 'focusout', 'touchstart', 'touchmove', 'touchend', 'touchcancel',
+    'pointerdown', 'pointerup', 'pointermove', 'pointerover', 'pointerout', 'pointercancel',
+    'dragstart', 'drag', 'dragend', 'dragenter', 'dragleave', 'dragover', 'drop',
+    'copy', 'cut', 'paste', 'beforeinput', 'selectstart',
+])
+
+
+def event_delegation_enabled():
+    """ONEJS_EVENT_DELEGATION=1 emits data-on-* references and a per-view event table"""
+    return os.environ.get('ONEJS_EVENT_DELEGATION', '0').lower() in ('1', 'true', 'yes', 'on')
+
+
+class DelegatedEventTable:
+    """Handler IDs and the static (constant handler list) part of one view's event table"""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.handler_counter = 0
+        self.types = []
+        self.static_handlers = {}  # event type -> {handler id: hoisted const name}
+
+    @classmethod
+    def from_env(cls):
+        return cls(enabled=event_delegation_enabled())
+
+    def delegates(self, event_type):
+        return self.enabled and event_type.lower() in DELEGATED_EVENT_TYPES
+
+    def attribute(self, event_type, handlers_js, is_constant):
+        """data-on-<type> attribute of one directive site"""
+        event_type = event_type.lower()
+        if event_type not in self.types:
+            self.types.append(event_type)
+        self.handler_counter += 1
+        handler_id = self.handler_counter
+        if is_constant:
+            self.static_handlers.setdefault(event_type, {})[str(handler_id)] = handlers_js
+            return f'data-on-{event_type}="${{__VIEW_ID__}}:{handler_id}"'
+        return f'data-on-{event_type}="${{this.__eventRef("{event_type}", {handler_id}, {handlers_js})}}"'
+
+    def declaration(self):
+        """Module-level const of the event table ('' when the view has no delegated events)"""
+        if not self.types:
+            return ''
+        handlers = ', '.join(
+            f'{json.dumps(event_type)}: {{' + ', '.join(f'"{handler_id}": {name}' for handler_id, name in entries.items()) + '}'
+            for event_type, entries in self.static_handlers.items()
+        )
+        return f'const {EVENT_TABLE_NAME} = Object.freeze({{types: {json.dumps(self.types)}, handlers: {{{handlers}}}}});'
+
+    def config_line(self):
+        """`events: __EVENT_TABLE__` entry of the setup config"""
+        return f"\n        events: {EVENT_TABLE_NAME}," if self.types else ''
@@ -3,6 +3,13 @@ Event Directive Processor - Xử lý event directives theo format mới
 """
 
 import re
+from models import EventHandlerConfig
+from static_fragment_hoister import hoisting_enabled
+from event_delegation import DelegatedEventTable
+from expression_tokenizer import split_top_level
+
+# Params that are plain JS literals: "str", 'str', numbers, true/false/null
+CONSTANT_PARAM_PATTERN = re.compile(r"""^(?:"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*'|-?\d+(?:\.\d+)?|true|false|null)$""")
 
 class EventDirectiveProcessor:
     def __init__(self, usestate_variables=None):
@@ -11,6 +18,13 @@ class EventDirectiveProcessor:
         @param usestate_variables: Set of variable names that have useState declarations
         """
         self.usestate_variables = usestate_variables or set()
+        # Handler descriptors/lists with constant params, hoisted to module-level consts
+        # JS value -> const name (insertion order = declaration order)
+        self.hoist_configs = hoisting_enabled()
+        self.hoisted_configs = {}
+        self._hoist_counts = {}
+        # ONEJS_EVENT_DELEGATION: data-on-* references + per-view event table (event_delegation.py)
+        self.event_table = DelegatedEventTable.from_env()
     
     def process_event_directive(self, event_type, expression):
         """
@@ -51,12 +65,7 @@ class EventDirectiveProcessor:
                     if handler:
                         # Parameters đã được xử lý bởi parse_handler_parameters
                         # (có thể là object config string hoặc giá trị thông thường)
-                        processed_params = handler['params']
-                        
-                        # Build handler object
-                        params_str = ','.join(processed_params)
-                        handler_str = f'{{"handler":"{handler["handler"]}","params":[{params_str}]}}'
-                        handler_items.append(handler_str)
+                        handler_items.append(self._handler_item(handler))
                 else:
                     # Biểu thức hoặc hàm có $ prefix
                     # Kiểm tra xem có nested function calls phức tạp không
@@ -67,13 +76,11 @@ class EventDirectiveProcessor:
                         handler = self._parse_handler_with_dollar(part)
                         if handler:
                             # Parse và process parameters (có thể chứa function calls)
-                            params_string = ', '.join(handler['params'])
+                            params_string = ', '.join(handler.params)
                             processed_params = self.parse_handler_parameters(params_string)
                             
                             # Build handler object
-                            params_str = ','.join(processed_params)
-                            handler_str = f'{{"handler":"{handler["handler"]}","params":[{params_str}]}}'
-                            handler_items.append(handler_str)
+                            handler_items.append(self._handler_item(EventHandlerConfig(handler.handler, tuple(processed_params))))
                         else:
                             # Nếu không parse được → dùng arrow function
                             expressions = self._split_expressions_by_semicolon(part)
@@ -92,6 +99,12 @@ class EventDirectiveProcessor:
             # Luôn dùng __addEventConfig với mixed format, giữ nguyên thứ tự
             if handler_items:
                 handlers_str = f'[{",".join(handler_items)}]'
+                # Toàn bộ handlers là hằng → dùng chung một list đã hoist
+                is_constant = all(item in self.hoisted_configs.values() for item in handler_items)
+                if is_constant:
+                    handlers_str = self._hoist(f'Object.freeze({handlers_str})', '__EVENT_HANDLERS_')
+                if self.event_table.delegates(event_type):
+                    return self.event_table.attribute(event_type, handlers_str, is_constant)
                 event_config = f'this.__addEventConfig("{event_type}", {handlers_str})'
                 return f"${{{event_config}}}"
             
@@ -101,6 +114,30 @@ class EventDirectiveProcessor:
             print(f"Event directive error: {e}")
             return ''
     
+    def _handler_item(self, config):
+        """Handler descriptor JS: hoisted const name when every param is a literal, else inline object"""
+        if self.hoist_configs and all(CONSTANT_PARAM_PATTERN.match(param.strip()) for param in config.params):
+            return self._hoist(config.to_js(frozen=True), '__EVENT_HANDLER_')
+        return config.to_js()
+    
+    def _hoist(self, js_value, prefix):
+        """Register a frozen constant (deduplicated per view) and return its name"""
+        name = self.hoisted_configs.get(js_value)
+        if name is None:
+            count = self._hoist_counts.get(prefix, 0)
+            self._hoist_counts[prefix] = count + 1
+            name = f'{prefix}{count}__'
+            self.hoisted_configs[js_value] = name
+        return name
+    
+    def hoisted_declarations(self):
+        """Module-level const declarations for hoisted handler configs"""
+        declarations = [f'const {name} = {js_value};' for js_value, name in self.hoisted_configs.items()]
+        table = self.event_table.declaration()
+        if table:
+            declarations.append(table)
+        return '\n'.join(declarations)
+    
     def parse_event_handlers(self, expression):
         """
         Parse multiple event handlers từ expression
@@ -136,19 +173,13 @@ class EventDirectiveProcessor:
             # Parse parameters
             params = self.parse_handler_parameters(params_string)
             
-            return {
-                'handler': handler_name,
-                'params': params
-            }
+            return EventHandlerConfig(handler_name, tuple(params))
         else:
             # No parentheses - just function name
             match = re.match(r'^([a-zA-Z_][a-zA-Z0-9_]*)$', handler_string.strip())
             if match:
                 handler_name = match.group(1)
-                return {
-                    'handler': handler_name,
-                    'params': []
-                }
+                return EventHandlerConfig(handler_name)
         
         return None
     
@@ -176,10 +207,9 @@ class EventDirectiveProcessor:
                     # Build object config string
                     # in_params_context=True vì đang xử lý params trong object config
                     processed_handler_params = []
-                    for p in handler['params']:
+                    for p in handler.params:
                         processed_handler_params.append(self.process_parameter(p.strip(), in_params_context=True))
-                    params_str = ','.join(processed_handler_params)
-                    handler_str = f'{{"handler":"{handler["handler"]}","params":[{params_str}]}}'
+                    handler_str = EventHandlerConfig(handler.handler, tuple(processed_handler_params)).to_js()
                     processed_params.append(handler_str)
                     continue
             
@@ -233,10 +263,7 @@ class EventDirectiveProcessor:
             # Parse parameters
             params = self.split_by_comma(params_string)
             
-            return {
-                'handler': handler_name,
-                'params': params
-            }
+            return EventHandlerConfig(handler_name, tuple(params))
         
         return None
     
@@ -265,18 +292,12 @@ class EventDirectiveProcessor:
                 # Parse parameters
                 params = self.split_by_comma(params_string)
                 
-                return {
-                    'handler': setter_name,
-                    'params': params
-                }
+                return EventHandlerConfig(setter_name, tuple(params))
             else:
                 # Không phải state variable → dùng tên hàm bình thường (bỏ $)
                 params = self.split_by_comma(params_string)
                 
-                return {
-                    'handler': func_name,
-                    'params': params
-                }
+                return EventHandlerConfig(func_name, tuple(params))
         
         return None
     
@@ -527,111 +548,14 @@ class EventDirectiveProcessor:
         """
         if ';' not in expr:
             return [expr]
-        
-        expressions = []
-        current = ''
-        paren_count = 0
-        bracket_count = 0
-        in_quotes = False
-        quote_char = ''
-        
-        i = 0
-        while i < len(expr):
-            char = expr[i]
-            
-            if not in_quotes:
-                if char in ['"', "'"]:
-                    in_quotes = True
-                    quote_char = char
-                    current += char
-                elif char == '(':
-                    paren_count += 1
-                    current += char
-                elif char == ')':
-                    paren_count -= 1
-                    current += char
-                elif char == '[':
-                    bracket_count += 1
-                    current += char
-                elif char == ']':
-                    bracket_count -= 1
-                    current += char
-                elif char == ';' and paren_count == 0 and bracket_count == 0:
-                    # Semicolon at level 0 - expression separator
-                    if current.strip():
-                        expressions.append(current.strip())
-                    current = ''
-                    i += 1
-                    continue
-                else:
-                    current += char
-            else:
-                current += char
-                if char == quote_char and (i == 0 or expr[i-1] != '\\'):
-                    in_quotes = False
-                    quote_char = ''
-            
-            i += 1
-        
-        # Add last expression
-        if current.strip():
-            expressions.append(current.strip())
-        
-        return expressions if expressions else [expr]
+
+        return split_top_level(expr, ';', drop_empty=True) or [expr]
     
     def split_by_comma(self, expression):
         """
         Split expression by comma, respecting nested parentheses, square brackets and quotes
         """
-        params = []
-        current = ''
-        paren_count = 0
-        bracket_count = 0
-        in_quotes = False
-        quote_char = ''
-        
-        i = 0
-        while i < len(expression):
-            char = expression[i]
-            
-            if not in_quotes:
-                if char in ['"', "'"]:
-                    in_quotes = True
-                    quote_char = char
-                    current += char
-                elif char == '(':
-                    paren_count += 1
-                    current += char
-                elif char == ')':
-                    paren_count -= 1
-                    current += char
-                elif char == '[':
-                    bracket_count += 1
-                    current += char
-                elif char == ']':
-                    bracket_count -= 1
-                    current += char
-                elif char == ',' and paren_count == 0 and bracket_count == 0:
-                    # Comma at level 0 - parameter separator
-                    params.append(current.strip())
-                    current = ''
-                    i += 1
-                    continue
-                else:
-                    current += char
-            else:
-                current += char
-                if char == quote_char and (i == 0 or expression[i-1] != '\\'):
-                    in_quotes = False
-                    quote_char = ''
-            
-            i += 1
-        
-        # Add last parameter
-        if current.strip():
-            params.append(current.strip())
-        
-        return params
+        return split_top_level(expression, ',')
     
     def build_event_config(self, event_type, handlers):
         """
@@ -640,18 +564,12 @@ class EventDirectiveProcessor:
         handler_configs = []
         
         for handler in handlers:
-            handler_name = handler['handler']
-            params = handler['params']
-            
             # Process parameters để handle special cases
             processed_params = []
-            for param in params:
+            for param in handler.params:
                 processed_params.append(self.process_parameter(param))
             
-            handler_configs.append({
-                'handler': handler_name,
-                'params': processed_params
-            })
+            handler_configs.append(EventHandlerConfig(handler.handler, tuple(processed_params)))
         
         # Build JavaScript array string manually để control quoting
         handlers_str = self.build_handlers_string(handler_configs)
@@ -665,8 +583,7 @@ class EventDirectiveProcessor:
         handlers = []
         
         for config in handler_configs:
-            handler_name = config['handler']
-            params = config['params']
+            params = config.params
             
             # Build params array with proper quoting
             processed_params = []
@@ -709,11 +626,8 @@ class EventDirectiveProcessor:
                     # Convert to string for non-string types
                     processed_params.append(str(param))
             
-            params_str = ','.join(processed_params)
-            
-            # Build handler object
-            handler_str = f'{{"handler":"{handler_name}","params":[{params_str}]}}'
-            handlers.append(handler_str)
+            # Build handler object (hoisted const when all params are literals)
+            handlers.append(self._handler_item(EventHandlerConfig(config.handler, tuple(processed_params))))
         
         return f'[{",".join(handlers)}]'
 
@@ -927,10 +841,9 @@ class EventDirectiveProcessor:
                         if handler:
                             # Build object config string
                             processed_handler_params = []
-                            for p in handler['params']:
+                            for p in handler.params:
                                 processed_handler_params.append(self.process_parameter(p.strip(), in_params_context=True))
-                            params_str_inner = ','.join(processed_handler_params)
-                            handler_str = f'{{"handler":"{handler["handler"]}","params":[{params_str_inner}]}}'
+                            handler_str = EventHandlerConfig(handler.handler, tuple(processed_handler_params)).to_js()
                             processed_params.append(handler_str)
                             continue
                     
@@ -979,10 +892,9 @@ class EventDirectiveProcessor:
                         if handler:
                             # Build object config string
                             processed_handler_params = []
-                            for p in handler['params']:
+                            for p in handler.params:
                                 processed_handler_params.append(self.process_parameter(p.strip(), in_params_context=True))
-                            params_str_inner = ','.join(processed_handler_params)
-                            handler_str = f'{{"handler":"{handler["handler"]}","params":[{params_str_inner}]}}'
+                            handler_str = EventHandlerConfig(handler.handler, tuple(processed_handler_params)).to_js()
                             processed_params.append(handler_str)
                             continue
                     
@@ -1075,18 +987,13 @@ class EventDirectiveProcessor:
         
         # Add handlers (objects) SAU
         for handler in handlers:
-            handler_name = handler['handler']
-            params = handler['params']
-            
             # Process parameters
             processed_params = []
-            for param in params:
+            for param in handler.params:
                 processed_params.append(self.process_parameter(param))
             
-            # Build handler object
-            params_str = ','.join(processed_params)
-            handler_str = f'{{"handler":"{handler_name}","params":[{params_str}]}}'
-            handler_items.append(handler_str)
+            # Build handler object (hoisted const when all params are literals)
+            handler_items.append(self._handler_item(EventHandlerConfig(handler.handler, tuple(processed_params))))
         
         handlers_str = f'[{",".join(handler_items)}]'
         return f'this.__addEventConfig("{event_type}", {handlers_str})'
@@ -0,0 +1,122 @@
+"""
+Tokenizer dùng chung cho tham số directive (event, @class, @style, @wrapper/@attr, @useState...)
+
+Trước đây mỗi handler có splitter riêng (split_by_comma, _split_array_items, _smart_split,
+_split_top_level, _split_params_by_comma, _split_by_comma...) quét lại từng ký tự của cùng một
+chuỗi tham số. Giờ chuỗi được quét một lần thành mask "top-level" (ngoài quote, ngoài (), [], {});
+split/find chỉ còn tìm delimiter trên mask đó. Kết quả cache theo nội dung chuỗi nên một argument
+được nhiều handler split nhiều lần chỉ bị quét một lần.
+"""
+
+from functools import lru_cache
+
+OPENERS = '([{'
+CLOSERS = ')]}'
+QUOTES = '"\''
+
+
+class ExpressionTokens:
+    """Top-level structure of one argument string (immutable, shared through the cache)"""
+
+    __slots__ = ('text', 'top_level', '_positions')
+
+    def __init__(self, text):
+        self.text = text
+        # top_level[i] == 1: character i is outside quotes and outside every bracket pair
+        top_level = bytearray(len(text))
+        depth = 0
+        quote = ''
+        i = 0
+        n = len(text)
+        while i < n:
+            char = text[i]
+            if quote:
+                if char == '\\':
+                    i += 2
+                    continue
+                if char == quote:
+                    quote = ''
+            elif char in QUOTES:
+                quote = char
+            elif char in OPENERS:
+                depth += 1
+            elif char in CLOSERS:
+                # Unbalanced closers do not make the rest of the string nested
+                depth = max(0, depth - 1)
+            elif depth == 0:
+                top_level[i] = 1
+            i += 1
+        self.top_level = bytes(top_level)
+        self._positions = {}
+
+    def positions(self, delimiter):
+        """Start indexes of the top-level occurrences of delimiter (non-overlapping)"""
+        cached = self._positions.get(delimiter)
+        if cached is not None:
+            return cached
+        found = []
+        text = self.text
+        size = len(delimiter)
+        index = text.find(delimiter)
+        while index != -1:
+            if all(self.top_level[index + k] for k in range(size)):
+                found.append(index)
+                index = text.find(delimiter, index + size)
+            else:
+                index = text.find(delimiter, index + 1)
+        result = tuple(found)
+        self._positions[delimiter] = result
+        return result
+
+    def split(self, delimiter=',', strip=True, drop_empty=False):
+        """
+        Parts between top-level delimiters
+        - strip: strip each part
+        - drop_empty: drop whitespace-only parts (a trailing empty part is always dropped)
+        """
+        parts = []
+        last = 0
+        for index in self.positions(delimiter):
+            parts.append(self.text[last:index])
+            last = index + len(delimiter)
+        parts.append(self.text[last:])
+        if not parts[-1].strip():
+            parts.pop()
+        if drop_empty:
+            parts = [part for part in parts if part.strip()]
+        if strip:
+            parts = [part.strip() for part in parts]
+        return parts
+
+    def find(self, delimiter, start=0):
+        """First top-level occurrence of delimiter at or after start, -1 when none"""
+        for index in self.positions(delimiter):
+            if index >= start:
+                return index
+        return -1
+
+
+@lru_cache(maxsize=4096)
+def tokenize_expression(text):
+    """Cached ExpressionTokens of an argument string"""
+    return ExpressionTokens(text)
+
+
+@lru_cache(maxsize=4096)
+def _split_cached(text, delimiter, strip, drop_empty):
+    return tuple(tokenize_expression(text).split(delimiter, strip, drop_empty))
+
+
+def split_top_level(text, delimiter=',', strip=True, drop_empty=False):
+    """Split text by delimiter outside quotes and (), [], {} (returns a new list)"""
+    return list(_split_cached(text, delimiter, strip, drop_empty))
+
+
+def find_top_level(text, delimiter, start=0):
+    """Index of the first top-level delimiter in text, -1 when none"""
+    return tokenize_expression(text).find(delimiter, start)
+
+
+def top_level_positions(text, delimiter):
+    """Indexes of every top-level delimiter in text"""
+    return tokenize_expression(text).positions(delimiter)
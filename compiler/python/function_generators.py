@@ -3,11 +3,20 @@ Generators cho các functions (render, prerender, init, etc.)
 """
 
 from config import JS_FUNCTION_PREFIX, HTML_ATTR_PREFIX
+from static_fragment_hoister import StaticFragmentHoister
+from html_minifier import HtmlTemplateMinifier
+from render_cse import RenderCSE
 import re
 
 class FunctionGenerators:
     def __init__(self, is_typescript=False):
         self._is_typescript = is_typescript
+        # Static template literals hoisted out of render (module-level consts)
+        self.static_hoister = StaticFragmentHoister.from_env()
+        # Compile-time HTML minification (ONEJS_MINIFY_HTML)
+        self.html_minifier = HtmlTemplateMinifier.from_env()
+        # Repeated pure ${...} expressions bound once per render scope (ONEJS_RENDER_CSE)
+        self.render_cse = RenderCSE.from_env()
     
     def generate_render_function(self, template_content, vars_declaration, extended_view, extends_expression, extends_data, sections_info=None, has_prerender=False, setup_script="", directives_line="", outer_before="", outer_after=""):
         """Generate render function with support for outer content (junk content)"""
@@ -46,10 +55,10 @@ class FunctionGenerators:
         filtered_template = template_content
         if sections_info and has_prerender:
             for section in sections_info:
-                section_name = section['name']
-                use_vars = section.get('useVars', False)
-                preloader = section.get('preloader', False)
-                section_type = section.get('type', 'long')
+                section_name = section.name
+                use_vars = section.use_vars
+                preloader = section.preloader
+                section_type = section.type
                 
                 # Remove sections that are already in prerender
                 # Only remove static sections (not using vars) that are in prerender
@@ -118,12 +127,19 @@ class FunctionGenerators:
         filtered_template_escaped = re.sub(r'this\.useBlock\(', 'this.__useBlock(', filtered_template_escaped)
         filtered_template_escaped = re.sub(r'this\.showError\(', 'this.__showError(', filtered_template_escaped)
         
+        # Minify HTML, then hoist static subtrees (literals without ${...}) to module-level consts
+        render_expression = self.html_minifier.minify(f"`{filtered_template_escaped}`")
+        render_expression = self.static_hoister.hoist(render_expression)
+        cse_declarations, render_expression = self.render_cse.eliminate(render_expression)
+        cse_lines = ''.join(f"                {line}\n" for line in cse_declarations.splitlines())
+        
         if extended_view:
             data_param = ", " + extends_data if extends_data else ""
             return f"""function() {{
-            {update_call_line}{view_id_line}{setup_line}    let __outputRenderedContent__ = '';
+            {update_call_line}{view_id_line}{setup_line}            this.__beginRender();
+            let __outputRenderedContent__ = '';
 {junk_var_line}{junk_content_before}            try {{
-                __outputRenderedContent__ = `{filtered_template_escaped}`;
+{cse_lines}                __outputRenderedContent__ = {render_expression};
             }} catch(e) {{
                 if (e instanceof Error) {{
                     __outputRenderedContent__ = this.__showError(e.message);
@@ -137,9 +153,10 @@ class FunctionGenerators:
         elif extends_expression:
             data_param = ", " + extends_data if extends_data else ""
             return f"""function() {{
-            {update_call_line}{view_id_line}{setup_line}    let __outputRenderedContent__ = '';
+            {update_call_line}{view_id_line}{setup_line}            this.__beginRender();
+            let __outputRenderedContent__ = '';
 {junk_var_line}{junk_content_before}            try {{
-                __outputRenderedContent__ = `{filtered_template_escaped}`;
+{cse_lines}                __outputRenderedContent__ = {render_expression};
             }} catch(e) {{
                 if (e instanceof Error) {{
                     __outputRenderedContent__ = this.__showError(e.message);
@@ -153,9 +170,10 @@ class FunctionGenerators:
             }}"""
         else:
             return f"""function() {{
-            {update_call_line}{view_id_line}{setup_line}    let __outputRenderedContent__ = '';
+            {update_call_line}{view_id_line}{setup_line}            this.__beginRender();
+            let __outputRenderedContent__ = '';
 {junk_var_line}{junk_content_before}            try {{
-                __outputRenderedContent__ = `{filtered_template_escaped}`;
+{cse_lines}                __outputRenderedContent__ = {render_expression};
             }} catch(e) {{
                 if (e instanceof Error) {{
                     __outputRenderedContent__ = this.__showError(e.message);
@@ -181,7 +199,7 @@ class FunctionGenerators:
             return "function() {\n    return null;\n}"
         
         # Check if any section uses variables from @vars
-        has_sections_with_vars = any(section.get('useVars', False) for section in (sections_info or []))
+        has_sections_with_vars = any(section.use_vars for section in (sections_info or []))
         
         # Check if there are conditional structures with vars
         has_conditional_with_vars = conditional_content and conditional_content.get('has_conditional_with_vars', False)
@@ -193,10 +211,10 @@ class FunctionGenerators:
         prerender_sections = []
         
         for section in (sections_info or []):
-            section_name = section['name']
-            use_vars = section.get('useVars', False)
-            preloader = section.get('preloader', False)
-            section_type = section.get('type', 'long')
+            section_name = section.name
+            use_vars = section.use_vars
+            preloader = section.preloader
+            section_type = section.type
             
             if not use_vars:
                 # Static sections (không dùng biến) - render trực tiếp trong prerender
@@ -282,44 +300,3 @@ class FunctionGenerators:
             }
             return __outputRenderedContent__;
             }"""
-    
-    def _convert_all_to_scan(self, template_content):
-        """Convert all methods to Scan versions"""
-        processed_template = template_content
-        
-        # Replace all methods with Scan versions
-        processed_template = re.sub(r'this\.addBlock\(', 'this.__blockScan(', processed_template)
-        processed_template = re.sub(r'this\.renderFollowingBlock\(', 'this.__followScan(', processed_template)
-        processed_template = re.sub(r'this\.__include\(', 'this.__includeScan(', processed_template)
-        processed_template = re.sub(r'this\.__includeif\(', 'this.__includeifScan(', processed_template)
-        processed_template = re.sub(r'this\.__includewhen\(', 'this.__includewhenScan(', processed_template)
-        processed_template = re.sub(r'this\.__extends\(', 'this.__extendsScan(', processed_template)
-        processed_template = re.sub(r'this\.__showError\(', 'this.__showErrorScan(', processed_template)
-        # Replace App.View.section with this.__sectionScan (for short sections)
-        processed_template = re.sub(r'App\.View\.section\(', 'this.__sectionScan(', processed_template)
-        # Replace this.__section with this.__sectionScan (for long sections)
-        processed_template = re.sub(r'this\.__section\(', 'this.__sectionScan(', processed_template)
-        # Replace App.View.text with this.__textScan
-        processed_template = re.sub(r'App\.View\.text\(', 'this.__textScan(', processed_template)
-        # Replace this.__text with this.__textScan
-        processed_template = re.sub(r'this\.__text\(', 'this.__textScan(', processed_template)
-        # Replace App.View.foreach with this.__foreachScan
-        processed_template = re.sub(r'App\.View\.foreach\(', 'this.__foreachScan(', processed_template)
-        # Replace this.__foreach with this.__foreachScan
-        processed_template = re.sub(r'this\.__foreach\(', 'this.__foreachScan(', processed_template)
-        processed_template = re.sub(r'this\.subscribe\(', 'this.__subscribeScan(', processed_template)
-        processed_template = re.sub(r'this\.__subscribe\(', 'this.__subscribeScan(', processed_template)
-        processed_template = re.sub(r'this\.__follow\(', 'this.__followScan(', processed_template)
-        processed_template = re.sub(r'this\.__block\(', 'this.__blockScan(', processed_template)
-        # Replace block-related methods (both with and without __ prefix)
-        processed_template = re.sub(r'this\.subscribeBlock\(', 'this.__subscribeBlockScan(', processed_template)
-        processed_template = re.sub(r'this\.__subscribeBlock\(', 'this.__subscribeBlockScan(', processed_template)
-        processed_template = re.sub(r'this\.useBlock\(', 'this.__useBlockScan(', processed_template)
-        processed_template = re.sub(r'this\.__useBlock\(', 'this.__useBlockScan(', processed_template)
-        # Replace event-related methods
-        processed_template = re.sub(r'this\.__addEventConfig\(', 'this.__addEventConfigScan(', processed_template)
-        processed_template = re.sub(r'this\.__addEventQuickHandle\(', 'this.__addEventQuickHandleScan(', processed_template)
-        # Replace App.View.renderView with App.View.scanRenderedView
-        processed_template = re.sub(r'App\.View\.renderView\(', 'App.View.scanRenderedView(', processed_template)
-        
-        return processed_template
\ No newline at end of file
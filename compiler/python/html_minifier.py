@@ -0,0 +1,212 @@
+"""
+Compile-time HTML minification cho template literal trong render/prerender
+
+Trước đây whitespace chỉ được collapse lúc bundle (html-minify-plugin.js quét lại
+mọi file JS bằng regex). Compiler đã biết chính xác template literal nào chứa HTML
+nên có thể minify ngay khi sinh code:
+- Xoá HTML comment (trừ IE conditional <!--[if ...]>)
+- Xoá whitespace có xuống dòng nằm giữa hai tag (indentation của template)
+- Collapse các whitespace còn lại thành một dấu cách
+- Giữ nguyên nội dung <pre>, <textarea>, <script>, <style> (kể cả khi trải qua nhiều ${...})
+
+File đã minify có marker HTML_MINIFIED_MARKER để bundler bỏ qua regex pass.
+"""
+
+import os
+import re
+
+HTML_MINIFIED_MARKER = '// @onejs:html-minified'
+
+RAW_TAGS = ('pre', 'textarea', 'script', 'style')
+RAW_OPEN_PATTERN = re.compile(r'<(' + '|'.join(RAW_TAGS) + r')(?![\w-])', re.IGNORECASE)
+COMMENT_PATTERN = re.compile(r'<!--(?!\[if)[\s\S]*?-->')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
+def html_minification_enabled():
+    """ONEJS_MINIFY_HTML=1 emits minified HTML in render/prerender template literals"""
+    return os.environ.get('ONEJS_MINIFY_HTML', '0').lower() in ('1', 'true', 'yes', 'on')
+
+
+class _Unbalanced(Exception):
+    pass
+
+
+class HtmlTemplateMinifier:
+    """Minify the static HTML parts of the template literals in generated JS code"""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.applied = False  # True once some code of this view was minified
+
+    @classmethod
+    def from_env(cls):
+        return cls(enabled=html_minification_enabled())
+
+    def minify(self, code):
+        """Return code with minified template literals (unchanged when it cannot be scanned reliably)"""
+        if not self.enabled or '`' not in code:
+            return code
+        self._raw_tag = None
+        try:
+            result, end = self._scan_code(code, 0, nested=False)
+        except _Unbalanced:
+            return code
+        if end != len(code):
+            return code
+        self.applied = True
+        return result
+
+    def _scan_code(self, code, i, nested):
+        """Copy JS code until the end (or the '}' closing a ${...} when nested), minifying literals"""
+        out = []
+        depth = 0
+        n = len(code)
+        while i < n:
+            c = code[i]
+            if c in ('"', "'"):
+                j = i + 1
+                while j < n and code[j] != c:
+                    if code[j] == '\\':
+                        j += 1
+                    elif code[j] == '\n':
+                        raise _Unbalanced()
+                    j += 1
+                if j >= n:
+                    raise _Unbalanced()
+                out.append(code[i:j + 1])
+                i = j + 1
+                continue
+            if c == '/' and code.startswith('//', i):
+                j = code.find('\n', i)
+                j = n if j == -1 else j
+                out.append(code[i:j])
+                i = j
+                continue
+            if c == '/' and code.startswith('/*', i):
+                j = code.find('*/', i + 2)
+                if j == -1:
+                    raise _Unbalanced()
+                out.append(code[i:j + 2])
+                i = j + 2
+                continue
+            if c == '`':
+                literal, i = self._scan_literal(code, i + 1)
+                out.append(literal)
+                continue
+            if c == '{':
+                depth += 1
+            elif c == '}':
+                if depth == 0:
+                    if not nested:
+                        raise _Unbalanced()
+                    return ''.join(out), i
+                depth -= 1
+            out.append(c)
+            i += 1
+        if nested:
+            raise _Unbalanced()
+        return ''.join(out), i
+
+    def _scan_literal(self, code, i):
+        """Scan a template literal body starting after its opening backtick"""
+        # parts: ('text', body, raw tag at start) | ('expr', processed code)
+        parts = []
+        start = i
+        n = len(code)
+        while True:
+            if i >= n:
+                raise _Unbalanced()
+            c = code[i]
+            if c == '\\':
+                i += 2
+                continue
+            if c == '`' or code.startswith('${', i):
+                text = code[start:i]
+                parts.append(('text', text, self._raw_tag))
+                self._raw_tag = self._track_raw(text, self._raw_tag)
+                if c == '`':
+                    break
+                expr, i = self._scan_code(code, i + 2, nested=True)
+                parts.append(('expr', expr))
+                i += 1  # closing '}'
+                start = i
+                continue
+            i += 1
+
+        is_html = any(part[0] == 'text' and '<' in part[1] for part in parts)
+        out = ['`']
+        last = len(parts) - 1
+        for index, part in enumerate(parts):
+            if part[0] == 'expr':
+                out.append('${' + part[1] + '}')
+            elif is_html:
+                out.append(self._minify_text(part[1], part[2], index == 0, index == last))
+            else:
+                out.append(part[1])
+        out.append('`')
+        return ''.join(out), i + 1
+
+    @staticmethod
+    def _track_raw(text, raw_tag):
+        """Raw element still open at the end of text"""
+        pos = 0
+        while True:
+            if raw_tag:
+                close = re.compile(r'</' + raw_tag, re.IGNORECASE).search(text, pos)
+                if not close:
+                    return raw_tag
+                raw_tag, pos = None, close.end()
+            else:
+                match = RAW_OPEN_PATTERN.search(text, pos)
+                if not match:
+                    return None
+                raw_tag, pos = match.group(1).lower(), match.end()
+
+    def _minify_text(self, text, raw_tag, literal_start, literal_end):
+        """Minify one static segment; raw element content is copied verbatim"""
+        out = []
+        pos = 0
+        while pos < len(text):
+            if raw_tag:
+                close = re.compile(r'</' + raw_tag, re.IGNORECASE).search(text, pos)
+                if not close:
+                    out.append(text[pos:])
+                    break
+                out.append(text[pos:close.start()])
+                pos = close.start()
+                raw_tag = None
+                continue
+            match = RAW_OPEN_PATTERN.search(text, pos)
+            chunk_end = match.start() if match else len(text)
+            out.append(self._collapse(
+                text[pos:chunk_end],
+                literal_start and pos == 0,
+                literal_end and not match,
+            ))
+            if not match:
+                break
+            # Keep the raw open tag itself as written
+            tag_end = text.find('>', match.end())
+            tag_end = len(text) if tag_end == -1 else tag_end + 1
+            out.append(text[match.start():tag_end])
+            pos = tag_end
+            raw_tag = match.group(1).lower()
+        return ''.join(out)
+
+    @staticmethod
+    def _collapse(chunk, at_literal_start, at_literal_end):
+        chunk = COMMENT_PATTERN.sub('', chunk)
+
+        def replace(match):
+            run = match.group()
+            if '\n' in run:
+                before = chunk[match.start() - 1] if match.start() > 0 else None
+                after = chunk[match.end()] if match.end() < len(chunk) else None
+                left_edge = before == '>' or (before is None and at_literal_start)
+                right_edge = after == '<' or (after is None and at_literal_end)
+                if left_edge and right_edge:
+                    return ''
+            return ' '
+
+        return WHITESPACE_PATTERN.sub(replace, chunk)
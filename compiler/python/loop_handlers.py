@@ -5,13 +5,18 @@ Handlers cho các loop directives (@foreach, @for, etc.)
 from config import JS_FUNCTION_PREFIX
 from php_converter import php_to_js
 from utils import extract_balanced_parentheses
+from loop_invariants import LoopInvariantHoister
 import re
 
+# ", key: <expr>" after "as $item" in @foreach(...)
+FOREACH_KEY_PATTERN = re.compile(r',\s*key\s*:\s*(.+)$', re.DOTALL)
+
 class LoopHandlers:
     def __init__(self, state_variables=None, processor=None, is_typescript=False):
         self.state_variables = state_variables or set()
         self.processor = processor
         self._is_typescript = is_typescript
+        self.hoister = LoopInvariantHoister()
     
     def _extract_variables(self, expr):
         """Extract variable names from expression, excluding method names after dot notation"""
@@ -40,6 +45,12 @@ class LoopHandlers:
         if foreach_pos != -1:
             foreach_content, end_pos = extract_balanced_parentheses(line, foreach_pos)
             if foreach_content is not None:
+                # Optional row key: @foreach($todos as $todo, key: $todo->id)
+                key_expr_php = None
+                key_match = FOREACH_KEY_PATTERN.search(foreach_content, max(foreach_content.find(' as '), 0))
+                if key_match:
+                    key_expr_php = key_match.group(1).strip()
+                    foreach_content = foreach_content[:key_match.start()]
                 as_match = re.match(r'\s*(.*?)\s+as\s+\$?(\w+)(\s*=>\s*\$?(\w+))?\s*$', foreach_content)
                 if as_match:
                     array_expr_php = as_match.group(1)
@@ -65,6 +76,25 @@ class LoopHandlers:
                     state_vars_used = variables & self.state_variables
                     watch_keys = list(state_vars_used) if state_vars_used else []
                     
+                    if key_expr_php and not is_attribute_context:
+                        # Keyed list: runtime diffs row keys and only inserts/removes/moves/re-renders changed rows
+                        # Nested in a loop: one list per iteration of the enclosing loop
+                        in_loop = any(entry[0] in ('foreach', 'for', 'while') for entry in stack)
+                        if self.processor:
+                            list_id = self.processor.reactive_ids.watch_id(loop_scoped=in_loop)
+                        elif in_loop:
+                            list_id = "`${__VIEW_ID__}-watch-0-${__loop.index}`"
+                        else:
+                            list_id = "`${__VIEW_ID__}-watch-0`"
+                        key_params = f"{value_var}, {key_var}" if as_match.group(3) else f"{value_var}, __loopKey"
+                        if self._is_typescript:
+                            key_params = ', '.join(f"{param}: any" for param in key_params.split(', '))
+                        key_fn = f"({key_params}) => {php_to_js(key_expr_php)}"
+                        # Items getter: the state flush re-reads the list when patching it
+                        output.append(f"${{this.__foreachKeyed({list_id}, {watch_keys}, () => {array_expr}, {key_fn}, {callback}")
+                        stack.append(('foreach', len(output), is_attribute_context, True))
+                        return True
+                    
                     # Use this.__foreach for instance method
                     foreach_call = f"this.__foreach({array_expr}, {callback}"
                     
@@ -75,8 +105,7 @@ class LoopHandlers:
                     else:
                         # Block directive - wrap with __reactive
                         if self.processor:
-                            self.processor.watch_counter += 1
-                            watch_id = f"`${{__VIEW_ID__}}-watch-{self.processor.watch_counter}`"
+                            watch_id = self.processor.reactive_ids.watch_id()
                         else:
                             watch_id = "`${__VIEW_ID__}-watch-0`"
                         result = f"${{this.__reactive({watch_id}, {watch_keys}, () => {foreach_call}"
@@ -90,9 +119,10 @@ class LoopHandlers:
         """Process @endforeach directive"""
         if stack and stack[-1][0] == 'foreach':
             is_attribute = stack[-1][2] if len(stack[-1]) > 2 else False
+            is_keyed = stack[-1][3] if len(stack[-1]) > 3 else False
             stack.pop()
-            if is_attribute:
-                # Attribute directive - no watch wrapper
+            if is_attribute or is_keyed:
+                # Attribute directive / keyed list - no watch wrapper
                 output.append('`)}')
             else:
                 # Block directive - close watch wrapper
@@ -140,14 +170,14 @@ class LoopHandlers:
                         result = f"${{{for_call}"
                     else:
                         if self.processor:
-                            self.processor.watch_counter += 1
-                            watch_id = f"`${{__VIEW_ID__}}-watch-{self.processor.watch_counter}`"
+                            watch_id = self.processor.reactive_ids.watch_id()
                         else:
                             watch_id = "`${__VIEW_ID__}-watch-0`"
                         result = f"${{this.__reactive({watch_id}, {watch_keys}, () => {{ return {for_call}"
                     
                     output.append(result)
-                    stack.append(('for', len(output), is_attribute_context, has_watch))
+                    # Last item: @if ternaries of the body that may be hoisted at @endfor
+                    stack.append(('for', len(output), is_attribute_context, has_watch, var_name, []))
                     return True
         return False
     
@@ -156,6 +186,8 @@ class LoopHandlers:
         if stack and stack[-1][0] == 'for':
             is_attribute = stack[-1][2] if len(stack[-1]) > 2 else False
             has_watch = stack[-1][3] if len(stack[-1]) > 3 else False
+            if len(stack[-1]) > 5:
+                self.hoister.hoist(output, stack[-1][1], stack[-1][5], {stack[-1][4], '__loop', 'loop'}, 'for (')
             stack.pop()
             
             if is_attribute:
@@ -206,14 +238,13 @@ class LoopHandlers:
                     result = f"${{this.__execute(() => {{\n{while_logic}"
                 else:
                     if self.processor:
-                        self.processor.watch_counter += 1
-                        watch_id = f"`${{__VIEW_ID__}}-watch-{self.processor.watch_counter}`"
+                        watch_id = self.processor.reactive_ids.watch_id()
                     else:
                         watch_id = "`${__VIEW_ID__}-watch-0`"
                     result = f"${{this.__reactive({watch_id}, {watch_keys}, () => {{\n{while_logic}"
                 
                 output.append(result)
-                stack.append(('while', len(output), is_attribute_context))
+                stack.append(('while', len(output), is_attribute_context, variables, []))
                 return True
         return False
     
@@ -221,6 +252,9 @@ class LoopHandlers:
         """Process @endwhile directive"""
         if stack and stack[-1][0] == 'while':
             is_attribute = stack[-1][2] if len(stack[-1]) > 2 else False
+            if len(stack[-1]) > 4:
+                # Variables of the @while condition change between iterations
+                self.hoister.hoist(output, stack[-1][1], stack[-1][4], stack[-1][3] | {'__loop', 'loop'}, 'while(')
             stack.pop()
             
             if is_attribute:
@@ -0,0 +1,105 @@
+"""
+Hoist loop-invariant @if conditions ra khỏi thân @for/@while
+
+Trong @for/@while mỗi @if không có state var được sinh thành một ternary:
+    __forOutputContent__ += (cond) ? `...` : '';
+Nếu cond không tham chiếu biến của vòng lặp (biến đếm, __loop, biến trong điều kiện
+@while, biến bị gán trong thân vòng lặp) thì nó được tính một lần trước vòng lặp:
+    const __ifCond1__ = (cond);
+    for (let i = 0; ...) { __forOutputContent__ += __ifCond1__ ? `...` : ''; }
+Chỉ hoist điều kiện "thuần" (không gọi hàm, không gán, không ++/--) để thứ tự
+side effect không đổi. Điều kiện đọc property/index (obj.done, items[0]) không được
+hoist nếu thân vòng lặp có lời gọi hàm (vd. {{ $obj->finish() }} có thể đổi obj),
+trừ helper thuần trong render_cse.PURE_HELPERS.
+"""
+
+import re
+from render_cse import PURE_HELPERS, HELPER_NAMESPACES
+
+IDENTIFIER_PATTERN = re.compile(r'(?<![\w$.])([A-Za-z_$][\w$]*)')
+# Calls, assignments, ++/--, new/await/yield: evaluating once would change behaviour
+IMPURE_PATTERN = re.compile(
+    r'[\w$\])]\s*\?\.\s*\(|[\w$\])]\s*\(|\+\+|--|(?<![=!<>])=(?![=>])|\b(?:new|await|yield|delete)\b'
+)
+STRING_PATTERN = re.compile(r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'|`(?:\\.|[^`\\])*`')
+MEMBER_ACCESS_PATTERN = re.compile(r'[\w$\])]\s*(?:\?\.|\.|\[)')
+CALL_PATTERN = re.compile(r'([\w$.]*[\w$\])])\s*(?:\?\.\s*)?\(')
+JS_WORDS = {'true', 'false', 'null', 'undefined', 'typeof', 'instanceof', 'in', 'void', 'this', 'NaN', 'Infinity'}
+
+
+def condition_identifiers(condition):
+    """Root identifiers read by a JS condition (property names after '.' excluded)"""
+    code = STRING_PATTERN.sub('""', condition)
+    return {name for name in IDENTIFIER_PATTERN.findall(code) if name not in JS_WORDS}
+
+
+def is_pure_condition(condition):
+    return not IMPURE_PATTERN.search(STRING_PATTERN.sub('""', condition))
+
+
+def reads_members(condition):
+    """obj.prop / obj?.prop / obj[i]: the value can change without the root being reassigned"""
+    return bool(MEMBER_ACCESS_PATTERN.search(STRING_PATTERN.sub('""', condition)))
+
+
+def _is_pure_call(callee):
+    return any(callee.startswith(namespace) and callee[len(namespace):] in PURE_HELPERS
+               for namespace in HELPER_NAMESPACES)
+
+
+def has_impure_call(code):
+    """Any call other than the pure App.Helper/App.View helpers (may mutate objects read by a condition)"""
+    return any(not _is_pure_call(callee) for callee in CALL_PATTERN.findall(code))
+
+
+def _write_pattern(name):
+    name = re.escape(name)
+    return re.compile(
+        rf'(?<![\w$.]){name}\s*(?:[-+*/%&|^]|\*\*|<<|>>>?|&&|\|\||\?\?)?=(?![=>])'
+        rf'|(?:\+\+|--)\s*{name}(?![\w$])|(?<![\w$.]){name}\s*(?:\+\+|--)'
+    )
+
+
+class LoopInvariantHoister:
+    """Per-view counter for the hoisted condition constants"""
+
+    def __init__(self):
+        self.counter = 0
+
+    def hoist(self, output, loop_start, candidates, loop_vars, loop_keyword):
+        """Move invariant candidate conditions before the loop statement of output[loop_start - 1]
+
+        Args:
+            candidates: [(output index, JS condition)] of the ternaries emitted directly in the loop body
+            loop_vars: names that change between iterations (counter, __loop, @while condition vars)
+            loop_keyword: 'for (' / 'while(' - start of the loop statement in the header entry
+        """
+        if not candidates or loop_start < 1:
+            return
+        header = output[loop_start - 1]
+        keyword_pos = header.rfind('\n' + loop_keyword)
+        if keyword_pos == -1:
+            return
+        body = ''.join(output[loop_start:])
+        body_calls = has_impure_call(body)
+
+        declarations = []
+        for index, condition in candidates:
+            names = condition_identifiers(condition)
+            if not names or names & set(loop_vars) or not is_pure_condition(condition):
+                continue
+            if any(_write_pattern(name).search(body) for name in names):
+                continue
+            if body_calls and reads_members(condition):
+                # Only bare identifiers/literals survive calls in the body
+                continue
+            ternary = f"({condition}) ?"
+            if ternary not in output[index]:
+                continue
+            self.counter += 1
+            const_name = f"__ifCond{self.counter}__"
+            output[index] = output[index].replace(ternary, f"{const_name} ?", 1)
+            declarations.append(f"\nconst {const_name} = ({condition});")
+
+        if declarations:
+            output[loop_start - 1] = header[:keyword_pos] + ''.join(declarations) + header[keyword_pos:]
@@ -5,35 +5,55 @@ Main compiler class tổng hợp tất cả các module
 import re
 import json
 import os
+import threading
+from dataclasses import replace
 from config import JS_FUNCTION_PREFIX, HTML_ATTR_PREFIX, APP_HELPER_NAMESPACE
 from parsers import DirectiveParsers
-from template_processor import TemplateProcessor
 from template_analyzer import TemplateAnalyzer
-from function_generators import FunctionGenerators
 from compiler_utils import CompilerUtils
-from wrapper_parser import WrapperParser
-from register_parser import RegisterParser
 from config import ViewConfig
-from declaration_tracker import DeclarationTracker
 from binding_directive_service import BindingDirectiveService
-from style_directive_handler import StyleDirectiveHandler
-from show_directive_handler import ShowDirectiveHandler
+from compilation_context import CompilationContext
+from memory_report import MemoryReporter
+from models import SectionInfo
+from state_dependency_map import collect_state_dependencies, format_state_dependencies
+from state_usage import dead_state_elimination_enabled, find_unused_states
+from html_minifier import HTML_MINIFIED_MARKER
+from style_extractor import style_extraction_enabled, extract_style
+from utils import (
+    replace_delimited_blocks, VERBATIM_OPEN, VERBATIM_CLOSE, SSR_OPEN, SSR_CLOSE,
+    REGISTER_OPEN, REGISTER_CLOSE, BLADE_COMMENT_OPEN, BLADE_COMMENT_CLOSE,
+)
+
+# systemData keys destructured in $__setup__ (only the ones a view actually references are emitted)
+SYSTEM_DATA_BINDINGS = (
+    '__base__', '__layout__', '__page__', '__component__', '__template__',
+    '__context__', '__partial__', '__system__', '__env = {}', '__helper = {}',
+)
 
 class BladeCompiler:
-    def __init__(self):
+    def __init__(self, memory_reporter=None):
+        # Stateless components shared by every compile; per-view state lives on CompilationContext
         self.parsers = DirectiveParsers()
-        self._is_typescript = False  # Initialize TypeScript flag FIRST
-        self.template_processor = TemplateProcessor(is_typescript=self._is_typescript)
         self.template_analyzer = TemplateAnalyzer()
-        self.function_generators = FunctionGenerators(is_typescript=self._is_typescript)
         self.compiler_utils = CompilerUtils()
-        self.wrapper_parser = WrapperParser()
-        self.register_parser = RegisterParser()
-        self.declaration_tracker = DeclarationTracker()
         self.binding_directive_service = BindingDirectiveService()
-        self.style_directive_handler = StyleDirectiveHandler()
-        self.show_directive_handler = ShowDirectiveHandler()
         self.view_template = self._load_view_template()
+        # Opt-in per-view memory accounting (ONEJS_MEMORY_REPORT=1)
+        self.memory_reporter = memory_reporter or MemoryReporter.from_env()
+        # Called with the stage name whenever a compile enters a new pipeline stage
+        self.stage_hook = None
+        self._local = threading.local()
+    
+    @property
+    def current_stage(self):
+        """Pipeline stage of the most recent compile on the calling thread"""
+        return getattr(self._local, 'stage', None)
+    
+    @property
+    def extracted_styles(self):
+        """Styles extracted by the most recent compile on the calling thread (ONEJS_EXTRACT_STYLES=1)"""
+        return getattr(self._local, 'extracted_styles', [])
     
     def _load_view_template(self):
         """Load view.js template from compiler/templates/"""
@@ -57,9 +77,7 @@ class BladeCompiler:
         return view_path
         
     def compile_blade_to_js(self, blade_code, view_name, function_name=None, factory_function_name=None):
-        """Main compiler function"""
-        blade_code = blade_code.strip()
-        
+        """Main compiler function (safe to call concurrently from several threads)"""
         # If function_name not provided, generate from view_name
         if function_name is None:
             function_name = self.convert_view_path_to_function_name(view_name)
@@ -68,8 +86,27 @@ class BladeCompiler:
         if factory_function_name is None:
             factory_function_name = function_name
         
-        # Reset watch counter for this view (each view starts from watch-1)
-        self.template_processor.watch_counter = 0
+        ctx = CompilationContext(view_name, function_name, factory_function_name)
+        self._local.extracted_styles = ctx.extracted_styles
+        with self.memory_reporter.track(view_name):
+            return self._compile_blade_to_js(ctx, blade_code)
+    
+    def _enter_stage(self, ctx, stage):
+        """Record the pipeline stage being executed (used for time budget reports)"""
+        ctx.stage = stage
+        self._local.stage = stage
+        if self.stage_hook:
+            self.stage_hook(stage)
+    
+    def _compile_blade_to_js(self, ctx, blade_code):
+        """Compile one view (see compile_blade_to_js)"""
+        view_name = ctx.view_name
+        function_name = ctx.function_name
+        factory_function_name = ctx.factory_function_name
+        blade_code = blade_code.strip()
+        
+        self._enter_stage(ctx, 'protect-blocks')
+        # Each view starts from watch-1 (fresh TemplateProcessor on the context)
         
         # ========================================================================
         # PRIORITY 1 (HIGHEST): Process @verbatim...@endverbatim blocks FIRST
@@ -80,19 +117,19 @@ class BladeCompiler:
         verbatim_blocks = {}
         verbatim_counter = 0
         
-        def protect_verbatim_block(match):
+        def protect_verbatim_block(full_block, inner):
             nonlocal verbatim_counter
             # Store the ENTIRE content between @verbatim and @endverbatim
             # This content will be restored EXACTLY as-is at the end
-            content = match.group(1)
+            content = inner.strip()
             placeholder = f"__VERBATIM_BLOCK_{verbatim_counter}__"
             verbatim_blocks[placeholder] = content
             verbatim_counter += 1
             return placeholder
         
         # Match @verbatim...@endverbatim (case insensitive, multiline)
-        verbatim_pattern = r'@verbatim\s*(.*?)\s*@endverbatim'
-        blade_code = re.sub(verbatim_pattern, protect_verbatim_block, blade_code, flags=re.DOTALL | re.IGNORECASE)
+        # Linear scanner instead of r'@verbatim\s*(.*?)\s*@endverbatim' (quadratic when unterminated)
+        blade_code = replace_delimited_blocks(blade_code, VERBATIM_OPEN, VERBATIM_CLOSE, protect_verbatim_block)
         
         # ========================================================================
         # ========================================================================
@@ -106,8 +143,7 @@ class BladeCompiler:
         # Remove @ssr...@endssr and all case variations
         # Matches: @serverside/@endserverside, @serverSide/@endServerSide, @ssr/@endssr, 
         #          @SSR/@endSSR, @useSSR/@enduseSSR, @useSsr/@enduseSsr, etc.
-        ssr_pattern = r'@(?:serverside|serverSide|ssr|SSR|useSSR|useSsr)\b[\s\S]*?@end(?:serverside|serverSide|ServerSide|SSR|Ssr|ssr|useSSR|useSsr)\b'
-        blade_code = re.sub(ssr_pattern, '', blade_code, flags=re.IGNORECASE)
+        blade_code = replace_delimited_blocks(blade_code, SSR_OPEN, SSR_CLOSE, lambda full_block, inner: '')
         
         # ========================================================================
         # PRIORITY 3: Process @register/@endregister blocks BEFORE escaping backticks
@@ -118,11 +154,10 @@ class BladeCompiler:
         register_blocks = {}
         register_counter = 0
         
-        def protect_register_block(match):
+        def protect_register_block(full_content, inner):
             nonlocal register_counter
             # Get full match including @register and @endregister
             # Note: This will NOT match @register inside @verbatim (already replaced)
-            full_content = match.group(0)
             placeholder = f"__REGISTER_BLOCK_{register_counter}__"
             register_blocks[placeholder] = full_content
             register_counter += 1
@@ -131,8 +166,7 @@ class BladeCompiler:
         # Match @register with optional parameters and @endregister (case insensitive)
         # Also match aliases: @setup/@endsetup, @script/@endscript
         # IMPORTANT: This will NOT match inside @verbatim blocks (already protected)
-        register_pattern = r'@(?:register|setup|script)\s*(?:\([^)]*\))?\s*(.*?)\s*@end(?:register|setup|script)'
-        blade_code = re.sub(register_pattern, protect_register_block, blade_code, flags=re.DOTALL | re.IGNORECASE)
+        blade_code = replace_delimited_blocks(blade_code, REGISTER_OPEN, REGISTER_CLOSE, protect_register_block)
         
         # ========================================================================
         # Protect <script setup> blocks from backtick escaping
@@ -166,19 +200,13 @@ class BladeCompiler:
         for placeholder, original_content in script_setup_blocks.items():
             blade_code = blade_code.replace(placeholder, original_content)
         
-        # Reset parser states to avoid data leakage between views
-        if hasattr(self.register_parser, 'reset'):
-            self.register_parser.reset()
-        # Note: wrapper_parser không reset vì dữ liệu từ wraper.js không thay đổi
+        # Parser states are per-context, so nothing leaks between views
         
         # Parse wrapper content
-        wrapper_function_content, wrapper_config_content = self.wrapper_parser.parse_wrapper_file()
-        
-        # Initialize update_functions list for storing update$stateKey functions
-        self.update_functions = []
+        wrapper_function_content, wrapper_config_content = ctx.wrapper_parser.parse_wrapper_file()
         
         # Remove Blade comments
-        blade_code = re.sub(r'{{--.*?--}}', '', blade_code, flags=re.DOTALL)
+        blade_code = replace_delimited_blocks(blade_code, BLADE_COMMENT_OPEN, BLADE_COMMENT_CLOSE, lambda full_block, inner: '')
         
         # Check for directives - support both @await and @await(...)
         has_await = bool('@await' in blade_code and (
@@ -189,6 +217,7 @@ class BladeCompiler:
         has_fetch = '@fetch(' in blade_code
         has_subscribe = ('@subscribe(' in blade_code) or re.search(r'@dontsubscribe\b', blade_code, flags=re.IGNORECASE)
         
+        self._enter_stage(ctx, 'register')
         # Parse register data EARLY to detect TypeScript
         # Extract unescaped content from @register blocks BEFORE restoring to blade_code
         register_content_unescaped = None
@@ -212,32 +241,28 @@ class BladeCompiler:
         # Parse register data
         register_data = None
         if register_content_unescaped:
-            register_data = self.register_parser.parse_register_content(register_content_unescaped, view_name)
+            register_data = ctx.register_parser.parse_register_content(register_content_unescaped, view_name)
         elif register_content:
-            register_data = self.register_parser.parse_register_content(register_content, view_name)
+            register_data = ctx.register_parser.parse_register_content(register_content, view_name)
         
         # If no @register directive, check for <script setup> tags
         if not register_data:
             setup_match = re.search(r'<script\s+setup[^>]*>(.*?)</script>', blade_code, re.DOTALL | re.IGNORECASE)
             if setup_match:
                 full_script_tag = setup_match.group(0)
-                register_data = self.register_parser.parse_register_content(full_script_tag, view_name)
+                register_data = ctx.register_parser.parse_register_content(full_script_tag, view_name)
         
         # Set TypeScript flag based on register_data
         setup_lang = register_data.get('setupLang') if register_data else None
-        self._is_typescript = (setup_lang == 'typescript')
-        
         # Update TemplateProcessor with TypeScript flag after we know the language
-        self.template_processor._is_typescript = self._is_typescript
-        self.template_processor.echo_processor._is_typescript = self._is_typescript
-        self.template_processor.loop_handlers._is_typescript = self._is_typescript
-        self.function_generators._is_typescript = self._is_typescript
+        ctx.set_typescript(setup_lang == 'typescript')
         
+        self._enter_stage(ctx, 'declarations')
         # NEW: Use DeclarationTracker to parse all declarations in order
-        all_declarations = self.declaration_tracker.parse_all_declarations(blade_code)
+        all_declarations = ctx.declaration_tracker.parse_all_declarations(blade_code)
         
         # Generate wrapper declarations from tracked declarations
-        wrapper_declarations_code, variable_list, state_declarations = self._generate_wrapper_declarations(all_declarations)
+        wrapper_declarations_code, variable_list, state_declarations = self._generate_wrapper_declarations(ctx, all_declarations)
         
         # Parse main components (keep for compatibility, but we'll use DeclarationTracker results)
         extended_view, extends_expression, extends_data = self.parsers.parse_extends(blade_code)
@@ -249,13 +274,8 @@ class BladeCompiler:
         # Extract usestate_variables for event processor
         usestate_variables = self._extract_usestate_variables(usestate_declarations, all_declarations)
         
-        # Update template_processor with usestate_variables (don't reinitialize to preserve watch_counter)
-        self.template_processor.state_variables = usestate_variables
-        self.template_processor.conditional_handlers.state_variables = usestate_variables
-        self.template_processor.loop_handlers.state_variables = usestate_variables
-        self.template_processor.event_processor.state_variables = usestate_variables
-        self.template_processor.echo_processor.state_variables = usestate_variables
-        self.template_processor.class_binding_handler.state_variables = usestate_variables
+        # Update processors (template, style, show) with usestate_variables
+        ctx.set_state_variables(usestate_variables)
         
         # Parse block directives
         blade_code = self.parsers.parse_block_directives(blade_code)
@@ -293,9 +313,10 @@ class BladeCompiler:
                 pattern = rf'<script\s+{script_type}[^>]*>.*?</script>'
                 register_content = re.sub(pattern, '', register_content, flags=re.DOTALL | re.IGNORECASE)
         
+        self._enter_stage(ctx, 'template')
         # Process template content
         # NOTE: verbatim blocks are already protected as placeholders, so they won't be processed
-        template_content, sections = self.template_processor.process_template(blade_code)
+        template_content, sections = ctx.template_processor.process_template(blade_code)
         
         # ========================================================================
         # Restore @verbatim blocks - escape backticks for template string safety
@@ -386,6 +407,7 @@ class BladeCompiler:
                                     template_content = template_content[:start_pos] + template_content[config_end:]
                                     break
         
+        self._enter_stage(ctx, 'sections')
         # Generate sections info
         sections_info = self.template_analyzer.analyze_sections_info(sections, vars_declaration, has_await, has_fetch)
         
@@ -394,21 +416,15 @@ class BladeCompiler:
             for section_name, script_obj in register_data['sections'].items():
                 # Tìm section trong sections_info list
                 section_found = False
-                for section_info in sections_info:
-                    if section_info.get('name') == section_name:
-                        section_info['script'] = script_obj
+                for index, section_info in enumerate(sections_info):
+                    if section_info.name == section_name:
+                        sections_info[index] = replace(section_info, script=script_obj)
                         section_found = True
                         break
                 
                 # Nếu không tìm thấy, thêm section mới
                 if not section_found:
-                    sections_info.append({
-                        'name': section_name,
-                        'type': 'short',
-                        'preloader': False,
-                        'useVars': False,
-                        'script': script_obj
-                    })
+                    sections_info.append(SectionInfo(name=section_name, script=script_obj))
         
         # Analyze conditional structures outside sections
         conditional_content = self.template_analyzer.analyze_conditional_structures(template_content, vars_declaration, has_await, has_fetch)
@@ -456,12 +472,12 @@ class BladeCompiler:
                                     # Only process valid state keys
                                     if state_key and state_key.isalnum():
                                         # Store update function for later (outside render)
-                                        self.update_functions.append(f"    const update${state_key} = (value) => {{")
-                                        self.update_functions.append(f"        if(__STATE__.__.canUpdateStateByKey){{")
-                                        self.update_functions.append(f"            updateStateByKey('{state_key}', value);")
-                                        self.update_functions.append(f"            {state_key} = value;")
-                                        self.update_functions.append(f"        }}")
-                                        self.update_functions.append(f"    }};")
+                                        ctx.update_functions.append(f"    const update${state_key} = (value) => {{")
+                                        ctx.update_functions.append(f"        if(__STATE__.__.canUpdateStateByKey){{")
+                                        ctx.update_functions.append(f"            updateStateByKey('{state_key}', value);")
+                                        ctx.update_functions.append(f"            {state_key} = value;")
+                                        ctx.update_functions.append(f"        }}")
+                                        ctx.update_functions.append(f"    }};")
                                         # Add state initialization (inside render)
                                         processed_declarations.append(f"    update${state_key}({value});")
                                         has_usestate_declarations = True
@@ -494,12 +510,12 @@ class BladeCompiler:
                                         value_match = re.search(r'useState\(([^)]+)\)', line)
                                         value = value_match.group(1).strip() if value_match else 'null'
                                         # Store update function for later (outside render)
-                                        self.update_functions.append(f"    const update${state_key} = (value) => {{")
-                                        self.update_functions.append(f"        if(__STATE__.__.canUpdateStateByKey){{")
-                                        self.update_functions.append(f"            updateStateByKey('{state_key}', value);")
-                                        self.update_functions.append(f"            {state_key} = value;")
-                                        self.update_functions.append(f"        }}")
-                                        self.update_functions.append(f"    }};")
+                                        ctx.update_functions.append(f"    const update${state_key} = (value) => {{")
+                                        ctx.update_functions.append(f"        if(__STATE__.__.canUpdateStateByKey){{")
+                                        ctx.update_functions.append(f"            updateStateByKey('{state_key}', value);")
+                                        ctx.update_functions.append(f"            {state_key} = value;")
+                                        ctx.update_functions.append(f"        }}")
+                                        ctx.update_functions.append(f"    }};")
                                         # Add state initialization (inside render)
                                         processed_declarations.append(f"    update${state_key}({value});")
                                         has_usestate_declarations = True
@@ -540,12 +556,12 @@ class BladeCompiler:
                                 # Only process valid state keys
                                 if state_key and state_key.isalnum():
                                     # Store update function for later (outside render)
-                                    self.update_functions.append(f"    const update${state_key} = (value) => {{")
-                                    self.update_functions.append(f"        if(__STATE__.__.canUpdateStateByKey){{")
-                                    self.update_functions.append(f"            updateStateByKey('{state_key}', value);")
-                                    self.update_functions.append(f"            {state_key} = value;")
-                                    self.update_functions.append(f"        }}")
-                                    self.update_functions.append(f"    }};")
+                                    ctx.update_functions.append(f"    const update${state_key} = (value) => {{")
+                                    ctx.update_functions.append(f"        if(__STATE__.__.canUpdateStateByKey){{")
+                                    ctx.update_functions.append(f"            updateStateByKey('{state_key}', value);")
+                                    ctx.update_functions.append(f"            {state_key} = value;")
+                                    ctx.update_functions.append(f"        }}")
+                                    ctx.update_functions.append(f"    }};")
                                     # Add state initialization (inside render)
                                     init_state_initializations.append(f"    update${state_key}({value});")
                             else:
@@ -572,12 +588,12 @@ class BladeCompiler:
                                     value_match = re.search(r'useState\(([^)]+)\)', line)
                                     value = value_match.group(1).strip() if value_match else 'null'
                                     # Store update function for later (outside render)
-                                    self.update_functions.append(f"    const update${state_key} = (value) => {{")
-                                    self.update_functions.append(f"        if(__STATE__.__.canUpdateStateByKey){{")
-                                    self.update_functions.append(f"            updateStateByKey('{state_key}', value);")
-                                    self.update_functions.append(f"            {state_key} = value;")
-                                    self.update_functions.append(f"        }}")
-                                    self.update_functions.append(f"    }};")
+                                    ctx.update_functions.append(f"    const update${state_key} = (value) => {{")
+                                    ctx.update_functions.append(f"        if(__STATE__.__.canUpdateStateByKey){{")
+                                    ctx.update_functions.append(f"            updateStateByKey('{state_key}', value);")
+                                    ctx.update_functions.append(f"            {state_key} = value;")
+                                    ctx.update_functions.append(f"        }}")
+                                    ctx.update_functions.append(f"    }};")
                                     # Add state initialization (inside render)
                                     init_state_initializations.append(f"    update${state_key}({value});")
                             else:
@@ -590,12 +606,12 @@ class BladeCompiler:
                                         state_key = state_key[1:]
                                     if state_key and state_key.isalnum():
                                         # Store update function for later (outside render)
-                                        self.update_functions.append(f"    const update${state_key} = (value) => {{")
-                                        self.update_functions.append(f"        if(__STATE__.__.canUpdateStateByKey){{")
-                                        self.update_functions.append(f"            {state_key} = value;")
-                                        self.update_functions.append(f"        }}")
-                                        self.update_functions.append(f"        return updateStateByKey('{state_key}', value);")
-                                        self.update_functions.append(f"    }};")
+                                        ctx.update_functions.append(f"    const update${state_key} = (value) => {{")
+                                        ctx.update_functions.append(f"        if(__STATE__.__.canUpdateStateByKey){{")
+                                        ctx.update_functions.append(f"            {state_key} = value;")
+                                        ctx.update_functions.append(f"        }}")
+                                        ctx.update_functions.append(f"        return updateStateByKey('{state_key}', value);")
+                                        ctx.update_functions.append(f"    }};")
                                         # Add state initialization (inside render)
                                         init_state_initializations.append(f"    update${state_key}({value});")
         
@@ -619,21 +635,19 @@ class BladeCompiler:
             usestate_declarations, let_declarations, const_declarations
         )
         
+        self._enter_stage(ctx, 'bindings')
         # Process binding directives (@val and @bind)
         template_content = self.binding_directive_service.process_all_binding_directives(template_content)
         
-        # Update style and show handlers with state variables
-        self.style_directive_handler.state_variables = usestate_variables
-        self.show_directive_handler.state_variables = usestate_variables
-        
         # Process @style directive
-        template_content = self.style_directive_handler.process_style_directive(template_content)
+        template_content = ctx.style_directive_handler.process_style_directive(template_content)
         
         # Process @show directive  
-        template_content = self.show_directive_handler.process_show_directive(template_content)
+        template_content = ctx.show_directive_handler.process_show_directive(template_content)
         
+        self._enter_stage(ctx, 'render')
         # Generate render function (setup script will be added to view function instead)
-        render_function = self.function_generators.generate_render_function(template_content, vars_declaration, extended_view, extends_expression, extends_data, sections_info, has_prerender, "", directives_line, outer_before, outer_after)
+        render_function = ctx.function_generators.generate_render_function(template_content, vars_declaration, extended_view, extends_expression, extends_data, sections_info, has_prerender, "", directives_line, outer_before, outer_after)
         
         # Generate init function
         init_code = '\n    '.join(init_functions) if init_functions else ''
@@ -647,10 +661,16 @@ class BladeCompiler:
             prerender_vars_line = ""
         
         
-        prerender_func = self.function_generators.generate_prerender_function(has_await, has_fetch, prerender_vars_line, view_id_line, template_content, extended_view, extends_expression, extends_data, sections_info, conditional_content, has_prerender)
+        prerender_func = ctx.function_generators.generate_prerender_function(has_await, has_fetch, prerender_vars_line, view_id_line, template_content, extended_view, extends_expression, extends_data, sections_info, conditional_content, has_prerender)
+        prerender_func = ctx.function_generators.html_minifier.minify(prerender_func)
         
         # Generate loadServerData function - empty function (logic removed)
-        load_server_data_func = self.function_generators.generate_load_server_data_function()
+        load_server_data_func = ctx.function_generators.generate_load_server_data_function()
+        # Module-level consts hoisted out of render (event handler configs, static fragments)
+        static_constants = '\n'.join(filter(None, [
+            ctx.template_processor.event_processor.hoisted_declarations(),
+            ctx.function_generators.static_hoister.declarations(),
+        ]))
         
         # CSS functions - combine CSS từ @onInit và @register
         combined_css_content = css_content.copy() if css_content else []
@@ -673,16 +693,16 @@ class BladeCompiler:
         # Process sections_info to handle script objects properly
         sections_js_object = {}
         for section in sections_info:
-            section_name = section.get('name', '')
+            section_name = section.name
             section_config = {
-                'type': section.get('type', 'short'),
-                'preloader': section.get('preloader', False),
-                'useVars': section.get('useVars', False)
+                'type': section.type,
+                'preloader': section.preloader,
+                'useVars': section.use_vars
             }
             
             # Handle script object - keep as JavaScript object, not JSON string
-            if 'script' in section and section['script']:
-                section_config['script'] = section['script']  # Keep as JavaScript object string
+            if section.script:
+                section_config['script'] = section.script  # Keep as JavaScript object string
             else:
                 section_config['script'] = '{}'
             
@@ -708,9 +728,9 @@ class BladeCompiler:
         # Collect long section names for renderLongSections
         render_long_sections = []
         for section in sections_info:
-            section_type = section.get('type', 'short')
+            section_type = section.type
             if section_type == 'long':
-                section_name = section.get('name', '')
+                section_name = section.name
                 if section_name:
                     render_long_sections.append(f'"{section_name}"')
         
@@ -783,6 +803,21 @@ class BladeCompiler:
         # Detect state keys for registration - chỉ từ @let và @const, không từ @useState
         state_keys = self._detect_state_keys(blade_code, let_declarations, const_declarations, "")
         
+        # Dead-state elimination: drop wiring of useState keys nothing refers to
+        state_declarations = self._eliminate_dead_states(view_name, state_declarations, [
+            render_function, prerender_func, static_constants, wrapper_function_content, wrapper_declarations_code,
+            *(init_functions or []),
+            register_data.get('setupContent') if register_data else None,
+            register_data.get('lifecycle') if register_data else None,
+            # @fetch config and inline <script> bodies are emitted with the view too
+            self.compiler_utils.format_fetch_config(fetch_config) if fetch_config else None,
+            *(script.content for script in (register_data.get('scripts') or [] if register_data else [])
+              if script.type == 'code'),
+        ])
+        state_registrations = self._generate_state_registrations(ctx, state_declarations)
+        if state_registrations:
+            wrapper_declarations_code = wrapper_declarations_code + '\n' + state_registrations
+        
         # Add wrapper function content to view function
         # Combine wrapper content and declarations first, then add indentation
         combined_content = ""
@@ -820,13 +855,13 @@ class BladeCompiler:
         if register_data and register_data.get('scripts'):
             scripts_data = register_data['scripts']
             for index, script in enumerate(scripts_data):
-                if script['type'] == 'code' and script.get('content', '').strip():
+                if script.type == 'code' and script.content.strip():
                     # Generate unique function name/key for script wrapper
                     script_function_name = f"__script_{view_name.replace('.', '_')}_{index}"
                     script_function_map[index] = script_function_name
                     
                     # Wrap script content in View.registerScript() call
-                    script_content = script['content']
+                    script_content = script.content
                     # Indent script content for better readability
                     indented_content = '\n'.join('    ' + line if line.strip() else line 
                                                  for line in script_content.split('\n'))
@@ -859,8 +894,8 @@ class BladeCompiler:
         
         # NOTE: Update functions are now handled by DeclarationTracker
         # No need to add update functions here anymore
-        # if self.update_functions:
-        #     update_functions_js = "\n".join(self.update_functions) + "\n"
+        # if ctx.update_functions:
+        #     update_functions_js = "\n".join(ctx.update_functions) + "\n"
         #     wrapper_function_line = wrapper_function_line + update_functions_js
         
         # Prepare userDefined properties từ register_data (extract từ object)
@@ -947,20 +982,20 @@ class BladeCompiler:
             scripts_json_parts = []
             
             for index, script in enumerate(scripts_data):
-                script_parts = [f'"type":"{script["type"]}"']
+                script_parts = [f'"type":"{script.type}"']
                 
-                if script['type'] == 'code':
+                if script.type == 'code':
                     # Use function wrapper instead of content string
                     if index in script_function_map:
                         script_function_name = script_function_map[index]
                         script_parts.append(f'"function":"{script_function_name}"')
                     else:
                         # Fallback: use content if function not generated
-                        content_escaped = script["content"].replace('"', '\\"').replace('\n', '\\n')
+                        content_escaped = script.content.replace('"', '\\"').replace('\n', '\\n')
                         script_parts.append(f'"content":"{content_escaped}"')
-                elif script['type'] == 'src':
+                elif script.type == 'src':
                     # Process Blade syntax in src
-                    src_value = script["src"]
+                    src_value = script.src
                     if '{{' in src_value and '}}' in src_value:
                         # Convert Blade syntax to template string
                         processed_src = self._convert_blade_to_template_string(src_value)
@@ -970,12 +1005,12 @@ class BladeCompiler:
                         script_parts.append(f'"src":"{src_value}"')
                 
                 # Add id, className, attributes
-                if script.get('id'):
-                    script_parts.append(f'"id":"{script["id"]}"')
-                if script.get('className'):
-                    script_parts.append(f'"className":"{script["className"]}"')
-                if script.get('attributes'):
-                    attrs_json = self.compiler_utils.format_attributes_to_json(script['attributes'])
+                if script.id:
+                    script_parts.append(f'"id":"{script.id}"')
+                if script.class_name:
+                    script_parts.append(f'"className":"{script.class_name}"')
+                if script.attributes:
+                    attrs_json = self.compiler_utils.format_attributes_to_json(script.attributes_dict)
                     script_parts.append(f'"attributes":{attrs_json}')
                 
                 scripts_json_parts.append('{' + ','.join(script_parts) + '}')
@@ -995,16 +1030,24 @@ class BladeCompiler:
         if register_data and register_data.get('styles'):
             styles_data = register_data['styles']
             styles_json_parts = []
+            extract_styles = style_extraction_enabled()
             
             for style in styles_data:
-                style_parts = [f'"type":"{style["type"]}"']
+                if extract_styles and style.type == 'code':
+                    # CSS goes to the context stylesheet; the view only keeps the ID
+                    extracted = extract_style(view_name, style)
+                    ctx.extracted_styles.append(extracted)
+                    styles_json_parts.append(f'{{"type":"ref","id":"{extracted["id"]}"}}')
+                    continue
+                
+                style_parts = [f'"type":"{style.type}"']
                 
-                if style['type'] == 'code':
-                    content_escaped = style["content"].replace('"', '\\"').replace('\n', '\\n')
+                if style.type == 'code':
+                    content_escaped = style.content.replace('"', '\\"').replace('\n', '\\n')
                     style_parts.append(f'"content":"{content_escaped}"')
-                elif style['type'] == 'href':
+                elif style.type == 'href':
                     # Process Blade syntax in href
-                    href_value = style["href"]
+                    href_value = style.href
                     if '{{' in href_value and '}}' in href_value:
                         # Convert Blade syntax to template string
                         processed_href = self._convert_blade_to_template_string(href_value)
@@ -1014,12 +1057,12 @@ class BladeCompiler:
                         style_parts.append(f'"href":"{href_value}"')
                 
                 # Add id, className, attributes
-                if style.get('id'):
-                    style_parts.append(f'"id":"{style["id"]}"')
-                if style.get('className'):
-                    style_parts.append(f'"className":"{style["className"]}"')
-                if style.get('attributes'):
-                    attrs_json = self.compiler_utils.format_attributes_to_json(style['attributes'])
+                if style.id:
+                    style_parts.append(f'"id":"{style.id}"')
+                if style.class_name:
+                    style_parts.append(f'"className":"{style.class_name}"')
+                if style.attributes:
+                    attrs_json = self.compiler_utils.format_attributes_to_json(style.attributes_dict)
                     style_parts.append(f'"attributes":{attrs_json}')
                 
                 styles_json_parts.append('{' + ','.join(style_parts) + '}')
@@ -1102,6 +1145,14 @@ class BladeCompiler:
             except Exception:
                 pass
 
+        self._enter_stage(ctx, 'assemble')
+        # state key -> keyed list IDs, consumed by StateManager on flush
+        state_dependencies = collect_state_dependencies(prerender_func + render_function, ctx.state_variables)
+        state_dependencies_line = ""
+        if state_dependencies:
+            state_dependencies_line = "\n        stateDependencies: " + format_state_dependencies(state_dependencies) + ","
+        # ONEJS_EVENT_DELEGATION: per-view event table (event type -> handler IDs)
+        events_line = ctx.template_processor.event_processor.event_table.config_line()
         # Always add imports from oneview (not onelaraveljs)
         # Calculate __VIEW_NAMESPACE__ (view path without filename)
         view_parts = view_name.split('.')
@@ -1110,6 +1161,21 @@ class BladeCompiler:
         # Class name is function_name + "View"
         class_name = function_name + "View"
         
+        # __VIEW_CONFIG__ object (view.js template and fallback template: same __VIEW_META__.config)
+        view_config_content = """hasSuperView: """ + has_super_view + """,
+    viewType: '""" + view_type + """',
+    sections: """ + sections_json + """,
+    wrapperConfig: """ + wrapper_config_value + """,""" + wrapper_props_line + """
+    hasAwaitData: """ + str(has_await).lower() + """,
+    hasFetchData: """ + str(has_fetch).lower() + """,
+    usesVars: """ + str(bool(vars_declaration)).lower() + """,
+    hasSections: """ + str(bool(sections)).lower() + """,
+    hasSectionPreload: """ + str(any(section.preloader for section in sections_info)).lower() + """,
+    hasPrerender: """ + str(has_prerender).lower() + """,
+    renderLongSections: """ + render_long_sections_json + """,
+    renderSections: """ + render_sections_json + """,
+    prerenderSections: """ + prerender_sections_json
+        
         # Use template if available, otherwise fallback to hardcoded template
         if self.view_template:
             # Read template and replace placeholders
@@ -1129,21 +1195,6 @@ class BladeCompiler:
             return_template = return_template.replace("const __VIEW_TYPE__ = 'view';",
                                                      f"const __VIEW_TYPE__ = '{view_type}';")
             
-            # Build __VIEW_CONFIG__ object
-            view_config_content = """hasSuperView: """ + has_super_view + """,
-    viewType: '""" + view_type + """',
-    sections: """ + sections_json + """,
-    wrapperConfig: """ + wrapper_config_value + """,""" + wrapper_props_line + """
-    hasAwaitData: """ + str(has_await).lower() + """,
-    hasFetchData: """ + str(has_fetch).lower() + """,
-    usesVars: """ + str(bool(vars_declaration)).lower() + """,
-    hasSections: """ + str(bool(sections)).lower() + """,
-    hasSectionPreload: """ + str(any(section.get('preloader', False) for section in sections_info)).lower() + """,
-    hasPrerender: """ + str(has_prerender).lower() + """,
-    renderLongSections: """ + render_long_sections_json + """,
-    renderSections: """ + render_sections_json + """,
-    prerenderSections: """ + prerender_sections_json
-            
             # Replace [VIEW_CONFIG_PLACEHOLDER]
             return_template = return_template.replace('[VIEW_CONFIG_PLACEHOLDER]', view_config_content)
             
@@ -1156,47 +1207,13 @@ class BladeCompiler:
                 raw_wrapper_content = raw_wrapper_content + wrapper_declarations_code + "\n"
             
             # Build setup config content (tất cả options cho setup)
-            # Check if TypeScript for type annotations
-            setup_lang = register_data.get('setupLang') if register_data else None
-            is_typescript = (setup_lang == 'typescript')
-            
-            # Add types for TypeScript
-            data_param = 'data: any' if is_typescript else 'data'
-            key_value_params = 'key: string, value: any' if is_typescript else 'key, value'
-            
             setup_config_content = """superView: """ + super_view_config + """,
         subscribe: """ + subscribe_js + """,
         fetch: """ + (self.compiler_utils.format_fetch_config(fetch_config) if fetch_config else 'null') + """,
         data: __data__,
         viewId: __VIEW_ID__,
-        path: __VIEW_PATH__,""" + scripts_line + """,""" + styles_line + """,""" + resources_line + """,
-        commitConstructorData: function() {
-            // Then update states from data
-            """ + self._generate_state_updates(state_declarations) + """
-            // Finally lock state updates
-            """ + ("lockUpdateRealState();" if state_declarations else "") + """
-        },
-        updateVariableData: function(""" + data_param + """) {
-            // Update all variables first
-            for (const key in data) {
-                if (data.hasOwnProperty(key)) {
-                    // Call updateVariableItemData directly from config
-                    if (typeof this.config.updateVariableItemData === 'function') {
-                        this.config.updateVariableItemData.call(this, key, data[key]);
-                    }
-                }
-            }
-            // Then update states from data
-            """ + self._generate_state_updates(state_declarations) + """
-            // Finally lock state updates
-            """ + ("lockUpdateRealState();" if state_declarations else "") + """
-        },
-        updateVariableItemData: function(""" + key_value_params + """) {
-            this.data[key] = value;
-            if (typeof __UPDATE_DATA_TRAIT__[key] === "function") {
-                __UPDATE_DATA_TRAIT__[key](value);
-            }
-        },
+        path: __VIEW_PATH__,""" + scripts_line + """,""" + styles_line + """,""" + resources_line + """,""" + state_dependencies_line + events_line + """
+        """ + self._generate_data_handlers(state_declarations) + """,
         prerender: """ + prerender_func + """,
         render: """ + render_function + """"""
             
@@ -1369,12 +1386,18 @@ class BladeCompiler:
                 return_template = return_template.replace('[COMPONENT_SCRIPT_CONTENTS]\n', '')
                 return_template = return_template.replace('[COMPONENT_SCRIPT_CONTENTS]', '')
             
+            # Replace [STATIC_TEMPLATE_CONSTANTS] - static fragments hoisted out of render
+            if static_constants:
+                return_template = return_template.replace('[STATIC_TEMPLATE_CONSTANTS]', '\n' + static_constants)
+            else:
+                return_template = return_template.replace('[STATIC_TEMPLATE_CONSTANTS]\n', '')
+            
             # Add script_registrations_line at the beginning (not setup_script_line anymore)
             return_template = script_registrations_line + return_template
             
         else:
             # Fallback to old hardcoded template
-            return_template = setup_script_line + script_registrations_line + """import { View } from 'oneview';
+            return_template = setup_script_line + script_registrations_line + """import { View, createStateHelpers, createViewDataHandlers } from 'oneview';
 import { app } from 'oneview';
 
 // nều có code trước export default trong script setup thì thêm vào đây
@@ -1382,7 +1405,17 @@ import { app } from 'oneview';
 const __VIEW_PATH__ = '""" + view_name + """';
 const __VIEW_NAMESPACE__ = '""" + view_namespace + """';
 const __VIEW_TYPE__ = '""" + view_type + """';
-
+const __VIEW_CONFIG__ = {
+    """ + view_config_content + """
+};
+export const __VIEW_META__ = Object.freeze({
+    path: __VIEW_PATH__,
+    namespace: __VIEW_NAMESPACE__,
+    type: __VIEW_TYPE__,
+    factory: '""" + function_name + """',
+    config: __VIEW_CONFIG__
+});
+""" + (static_constants + "\n" if static_constants else "") + """
 class """ + class_name + """ extends View {
     $__config__ = {};
     constructor(App, systemData) {
@@ -1393,8 +1426,9 @@ class """ + class_name + """ extends View {
     $__setup__(__data__, systemData) {
         const App = this.__ctrl__.App;
         const __STATE__ = this.__ctrl__.states;
-        const {__base__, __layout__, __page__, __component__, __template__, __context__, __partial__, __system__, __env = {}, __helper = {}} = systemData;
+[SYSTEM_DATA_BINDINGS]
         const __VIEW_ID__ = __data__.__SSR_VIEW_ID__ || """ + JS_FUNCTION_PREFIX + """.generateViewId();
+        const { useState, updateRealState, lockUpdateRealState, updateStateByKey } = createStateHelpers(__STATE__);
         """ + wrapper_function_line + """
     this.__ctrl__.setUserDefined({
         """ + user_defined_properties + """
@@ -1414,38 +1448,12 @@ class """ + class_name + """ extends View {
         path: __VIEW_PATH__,
         usesVars: """ + str(bool(vars_declaration)).lower() + """,
         hasSections: """ + str(bool(sections)).lower() + """,
-        hasSectionPreload: """ + str(any(section.get('preloader', False) for section in sections_info)).lower() + """,
+        hasSectionPreload: """ + str(any(section.preloader for section in sections_info)).lower() + """,
         hasPrerender: """ + str(has_prerender).lower() + """,
         renderLongSections: """ + render_long_sections_json + """,
         renderSections: """ + render_sections_json + """,
-        prerenderSections: """ + prerender_sections_json + """,""" + scripts_line + """,""" + styles_line + """,""" + resources_line + """,
-        commitConstructorData: function() {
-            // Then update states from data
-            """ + self._generate_state_updates(state_declarations) + """
-            // Finally lock state updates
-            """ + ("lockUpdateRealState();" if state_declarations else "") + """
-        },
-        updateVariableData: function(data) {
-            // Update all variables first
-            for (const key in data) {
-                if (data.hasOwnProperty(key)) {
-                    // Call updateVariableItemData directly from config
-                    if (typeof this.config.updateVariableItemData === 'function') {
-                        this.config.updateVariableItemData.call(this, key, data[key]);
-                    }
-                }
-            }
-            // Then update states from data
-            """ + self._generate_state_updates(state_declarations) + """
-            // Finally lock state updates
-            """ + ("lockUpdateRealState();" if state_declarations else "") + """
-        },
-        updateVariableItemData: function(key, value) {
-            this.data[key] = value;
-            if (typeof __UPDATE_DATA_TRAIT__[key] === "function") {
-                __UPDATE_DATA_TRAIT__[key](value);
-            }
-        },
+        prerenderSections: """ + prerender_sections_json + """,""" + scripts_line + """,""" + styles_line + """,""" + resources_line + """,""" + state_dependencies_line + events_line + """
+        """ + self._generate_data_handlers(state_declarations) + """,
         prerender: """ + prerender_func + """,
         render: """ + render_function + """
     });
@@ -1459,7 +1467,8 @@ export function """ + function_name + """(__data__ = {}, systemData = {}) {
     const view = new """ + class_name + """(App, systemData);
     view.$__setup__(__data__, systemData);
     return view;
-}"""
+}
+""" + function_name + """.meta = __VIEW_META__;"""
         
         # Restore verbatim blocks in final return_template (in case any were in scripts/styles)
         # For scripts/styles, we also need to escape backticks and ${} if they're in template strings
@@ -1480,6 +1489,8 @@ export function """ + function_name + """(__data__ = {}, systemData = {}) {
             
             return_template = return_template.replace(placeholder, protected_content)
         
+        return_template = return_template.replace('[SYSTEM_DATA_BINDINGS]\n', self._system_data_bindings(return_template))
+        
         # Handle type markers based on language
         setup_lang = register_data.get('setupLang') if register_data else None
         if setup_lang == 'typescript':
@@ -1491,11 +1502,23 @@ export function """ + function_name + """(__data__ = {}, systemData = {}) {
             # JavaScript: Remove all type markers
             return_template = self._remove_type_markers_for_javascript(return_template)
         
+        if ctx.function_generators.html_minifier.applied:
+            # Bundler-time html-minify pass skips files carrying this marker
+            return_template = HTML_MINIFIED_MARKER + '\n' + return_template
+        
         return return_template
     
-    def _typed(self, plain, typed=None):
+    def _system_data_bindings(self, code):
+        """systemData destructuring line for $__setup__, limited to the names used by the view"""
+        used = [binding for binding in SYSTEM_DATA_BINDINGS
+                if re.search(r'\b' + re.escape(binding.split(' ')[0]) + r'\b', code)]
+        if not used:
+            return ''
+        return '        const {' + ', '.join(used) + '} = systemData;\n'
+    
+    def _typed(self, ctx, plain, typed=None):
         """Helper method to add TypeScript types"""
-        if not self._is_typescript:
+        if not ctx.is_typescript:
             return plain
         # If typed version provided, use it; otherwise add ': any' to parameters
         if typed:
@@ -1509,7 +1532,7 @@ export function """ + function_name + """(__data__ = {}, systemData = {}) {
         """Add TypeScript type annotations to generated code
         
         DEPRECATED: This function is no longer used. Types are now added during code generation
-        using conditional logic based on self._is_typescript flag. Keeping this for reference only.
+        using conditional logic based on ctx.is_typescript flag. Keeping this for reference only.
         """
         
         # Add type to ViewController constructor
@@ -1534,25 +1557,6 @@ export function """ + function_name + """(__data__ = {}, systemData = {}) {
             code
         )
         
-        # Add types to helper arrow functions in $__setup__
-        code = re.sub(
-            r'const useState = \(value\)',
-            r'const useState = (value: any)',
-            code
-        )
-        
-        code = re.sub(
-            r'const updateRealState = \(state\)',
-            r'const updateRealState = (state: any)',
-            code
-        )
-        
-        code = re.sub(
-            r'const updateStateByKey = \(key, state\)',
-            r'const updateStateByKey = (key: string, state: any)',
-            code
-        )
-        
         # Add types to state setter functions (setCount, setTodos, etc.)
         code = re.sub(
             r'(const set\w+ = )\(state\)( =>)',
@@ -1581,20 +1585,6 @@ export function """ + function_name + """(__data__ = {}, systemData = {}) {
             code
         )
         
-        # Add types to updateVariableData function
-        code = re.sub(
-            r'updateVariableData: function\(data\)',
-            r'updateVariableData: function(data: any)',
-            code
-        )
-        
-        # Add types to updateVariableItemData function
-        code = re.sub(
-            r'updateVariableItemData: function\(key, value\)',
-            r'updateVariableItemData: function(key: string, value: any)',
-            code
-        )
-        
         # Add types to factory function
         code = re.sub(
             r'(export function ' + re.escape(function_name) + r'\()__data__ = \{\}, systemData = \{\}(\))',
@@ -1646,7 +1636,7 @@ export function """ + function_name + """(__data__ = {}, systemData = {}) {
             return sections_used
         
         for section in sections_info:
-            section_name = section.get('name', '')
+            section_name = section.name
             if section_name:
                 # Check if section is used in template content
                 if f"App.View.section('{section_name}'" in template_content:
@@ -1664,13 +1654,13 @@ export function """ + function_name + """(__data__ = {}, systemData = {}) {
         # If has prerender, check which sections are used
         # For now, we'll include sections that have preloader or are used with await/fetch
         for section in sections_info:
-            section_name = section.get('name', '')
+            section_name = section.name
             if section_name:
                 # Include sections that have preloader
-                if section.get('preloader', False):
+                if section.preloader:
                     sections_used.append(section_name)
                 # Include sections used with await/fetch (these typically need prerender)
-                elif (has_await or has_fetch) and section.get('useVars', False):
+                elif (has_await or has_fetch) and section.use_vars:
                     sections_used.append(section_name)
         
         return sections_used
@@ -1697,11 +1687,11 @@ export function """ + function_name + """(__data__ = {}, systemData = {}) {
         
         # Extract from all_declarations (from DeclarationTracker)
         for decl in all_declarations:
-            if decl.get('type') in ['useState', 'const', 'let']:
-                variables = decl.get('variables', [])
+            if decl.type in ['useState', 'const', 'let']:
+                variables = decl.variables
                 for var in variables:
-                    if var.get('isUseState'):
-                        names = var.get('names', [])
+                    if var.is_use_state:
+                        names = var.names
                         if names and len(names) > 0:
                             # First name is the state variable
                             state_var = names[0]
@@ -1800,7 +1790,7 @@ export function """ + function_name + """(__data__ = {}, systemData = {}) {
             return False
         
         # Check if any section uses vars
-        has_sections_with_vars = any(section.get('useVars', False) for section in sections_info)
+        has_sections_with_vars = any(section.use_vars for section in sections_info)
         
         # Check if template content uses vars
         has_template_with_vars = self._template_uses_vars(template_content, vars_names)
@@ -2055,7 +2045,7 @@ export function """ + function_name + """(__data__ = {}, systemData = {}) {
         
         return None
     
-    def _generate_wrapper_declarations(self, declarations):
+    def _generate_wrapper_declarations(self, ctx, declarations):
         """
         Generate wrapper function declarations from DeclarationTracker
         Returns: (wrapper_code, variable_list, state_declarations)
@@ -2067,14 +2057,14 @@ export function """ + function_name + """(__data__ = {}, systemData = {}) {
         state_declarations = []  # Store useState declarations separately
         
         # First, generate __UPDATE_DATA_TRAIT__ with conditional type annotation
-        if self._is_typescript:
+        if ctx.is_typescript:
             wrapper_lines.append("    const __UPDATE_DATA_TRAIT__: any = {};")
         else:
             wrapper_lines.append("    const __UPDATE_DATA_TRAIT__ = {};")
         
         for decl in declarations:
-            decl_type = decl['type']
-            variables = decl['variables']
+            decl_type = decl.type
+            variables = decl.variables
 
             
             if decl_type == 'vars':
@@ -2082,14 +2072,14 @@ export function """ + function_name + """(__data__ = {}, systemData = {}) {
                 # Build destructuring parts with defaults when provided
                 destructure_parts = []
                 for var in variables:
-                    var_name = var['name']
-                    if var['hasDefault']:
-                        destructure_parts.append(f"{var_name} = {var['value']}")
+                    var_name = var.name
+                    if var.has_default:
+                        destructure_parts.append(f"{var_name} = {var.value}")
                     else:
                         destructure_parts.append(f"{var_name}")
                     # Add to __UPDATE_DATA_TRAIT__ and variable list
                     # Add type annotation for TypeScript
-                    if self._is_typescript:
+                    if ctx.is_typescript:
                         update_trait_items.append(f"    __UPDATE_DATA_TRAIT__.{var_name} = (value: any) => {var_name} = value;")
                     else:
                         update_trait_items.append(f"    __UPDATE_DATA_TRAIT__.{var_name} = value => {var_name} = value;")
@@ -2102,13 +2092,13 @@ export function """ + function_name + """(__data__ = {}, systemData = {}) {
                 # Process @let variables
                 for var in variables:
 
-                    if var.get('isDestructuring'):
+                    if var.is_destructuring:
                         # Handle destructuring
-                        if var.get('isUseState'):
+                        if var.is_use_state:
                             # [$stateKey, $setter] = useState($value)
                             # Keep OLD state registration style, not React style!
-                            names = var['names']
-                            value = var['value']
+                            names = var.names
+                            value = var.value
                             
                             # Extract state key and setter name
                             if len(names) >= 2:
@@ -2132,10 +2122,10 @@ export function """ + function_name + """(__data__ = {}, systemData = {}) {
                             # Don't add to variable_list or update_trait (useState variables)
                         else:
                             # Regular destructuring: [$a, $b] = [1, 2]
-                            names = var['names']
-                            value = var['value']
-                            bracket_type = '[' if var['destructuringType'] == 'array' else '{'
-                            close_bracket = ']' if var['destructuringType'] == 'array' else '}'
+                            names = var.names
+                            value = var.value
+                            bracket_type = '[' if var.destructuring_type == 'array' else '{'
+                            close_bracket = ']' if var.destructuring_type == 'array' else '}'
                             wrapper_lines.append(f"    let {bracket_type}{', '.join(names)}{close_bracket} = {value};")
                             
                             # Add each destructured variable to update trait and variable list
@@ -2144,15 +2134,15 @@ export function """ + function_name + """(__data__ = {}, systemData = {}) {
                                 variable_list.append(name)
                     else:
                         # Regular variable
-                        var_name = var['name']
-                        if var['hasDefault']:
-                            wrapper_lines.append(f"    let {var_name} = {var['value']};")
+                        var_name = var.name
+                        if var.has_default:
+                            wrapper_lines.append(f"    let {var_name} = {var.value};")
                         else:
                             wrapper_lines.append(f"    let {var_name};")
                         
                         # Add to update trait and variable list
                         # Add type annotation for TypeScript
-                        if self._is_typescript:
+                        if ctx.is_typescript:
                             update_trait_items.append(f"    __UPDATE_DATA_TRAIT__.{var_name} = (value: any) => {var_name} = value;")
                         else:
                             update_trait_items.append(f"    __UPDATE_DATA_TRAIT__.{var_name} = value => {var_name} = value;")
@@ -2161,13 +2151,13 @@ export function """ + function_name + """(__data__ = {}, systemData = {}) {
             elif decl_type == 'const':
                 # Process @const variables
                 for var in variables:
-                    if var.get('isDestructuring'):
+                    if var.is_destructuring:
                         # Handle destructuring
-                        if var.get('isUseState'):
+                        if var.is_use_state:
                             # [$stateKey, $setter] = useState($value)
                             # Keep OLD state registration style!
-                            names = var['names']
-                            value = var['value']
+                            names = var.names
+                            value = var.value
                             
                             # Extract state key and setter name
                             if len(names) >= 2:
@@ -2191,26 +2181,26 @@ export function """ + function_name + """(__data__ = {}, systemData = {}) {
                             # Don't add to variable_list or update_trait (useState variables)
                         else:
                             # Regular const destructuring
-                            names = var['names']
-                            value = var['value']
-                            bracket_type = '[' if var['destructuringType'] == 'array' else '{'
-                            close_bracket = ']' if var['destructuringType'] == 'array' else '}'
+                            names = var.names
+                            value = var.value
+                            bracket_type = '[' if var.destructuring_type == 'array' else '{'
+                            close_bracket = ']' if var.destructuring_type == 'array' else '}'
                             wrapper_lines.append(f"    const {bracket_type}{', '.join(names)}{close_bracket} = {value};")
                             # Const variables are not mutable, don't add to update_trait or variable_list
                     else:
                         # Regular const
-                        var_name = var['name']
-                        if var['hasDefault']:
-                            wrapper_lines.append(f"    const {var_name} = {var['value']};")
+                        var_name = var.name
+                        if var.has_default:
+                            wrapper_lines.append(f"    const {var_name} = {var.value};")
                         # Const variables are not mutable, don't add to update_trait or variable_list
             
             elif decl_type == 'useState':
                 # Process @useState directives - same as @let/@const with useState
                 for var in variables:
-                    if var.get('isDestructuring') and var.get('isUseState'):
+                    if var.is_destructuring and var.is_use_state:
                         # [@useState($value, $varName, $setVarName)] becomes [$varName, $setVarName] = useState($value)
-                        names = var['names']
-                        value = var['value']
+                        names = var.names
+                        value = var.value
                         
                         # Extract state key and setter name
                         if len(names) >= 2:
@@ -2237,12 +2227,18 @@ export function """ + function_name + """(__data__ = {}, systemData = {}) {
         
         # Generate __VARIABLE_LIST__ with conditional type annotation
         variable_list_str = ', '.join([f'"{v}"' for v in variable_list])
-        if self._is_typescript:
+        if ctx.is_typescript:
             wrapper_lines.append(f"    const __VARIABLE_LIST__: any = [{variable_list_str}];")
         else:
             wrapper_lines.append(f"    const __VARIABLE_LIST__ = [{variable_list_str}];")
         
-        # Generate OLD style state registrations
+        wrapper_code = '\n'.join(wrapper_lines)
+        
+        return wrapper_code, variable_list, state_declarations
+    
+    def _generate_state_registrations(self, ctx, state_declarations):
+        """Generate OLD style state registrations (register, setter, update$key) for useState declarations"""
+        wrapper_lines = []
         for state in state_declarations:
             state_key = state['stateKey']
             setter_name = state['setterName']  # Keep user-declared name as is
@@ -2260,12 +2256,12 @@ export function """ + function_name + """(__data__ = {}, systemData = {}) {
             internal_register = f"set${state_key}"  # __set$todosRegister
             wrapper_lines.append(f"    const {internal_register} = __STATE__.__.register('{state_key}');")
             # Add type annotation for state variable in TypeScript
-            if self._is_typescript:
+            if ctx.is_typescript:
                 wrapper_lines.append(f"    let {state_key}: any = null;")
             else:
                 wrapper_lines.append(f"    let {state_key} = null;")
             # Add type annotation for TypeScript
-            if self._is_typescript:
+            if ctx.is_typescript:
                 wrapper_lines.append(f"    const {setter_name} = (state: any) => {{")
             else:
                 wrapper_lines.append(f"    const {setter_name} = (state) => {{")
@@ -2277,7 +2273,7 @@ export function """ + function_name + """(__data__ = {}, systemData = {}) {
             # Add update$stateKey function - use state_key as is  
             update_func_name = f"update${state_key}"
             # Add type annotation for TypeScript
-            if self._is_typescript:
+            if ctx.is_typescript:
                 wrapper_lines.append(f"    const {update_func_name} = (value: any) => {{")
             else:
                 wrapper_lines.append(f"    const {update_func_name} = (value) => {{")
@@ -2287,9 +2283,18 @@ export function """ + function_name + """(__data__ = {}, systemData = {}) {
             wrapper_lines.append(f"        }}")
             wrapper_lines.append(f"    }};")
         
-        wrapper_code = '\n'.join(wrapper_lines)
-        
-        return wrapper_code, variable_list, state_declarations
+        return '\n'.join(wrapper_lines)
+    
+    def _eliminate_dead_states(self, view_name, state_declarations, sources):
+        """Drop useState declarations never referenced in sources, with a warning per dropped key"""
+        if not state_declarations or not dead_state_elimination_enabled():
+            return state_declarations
+        unused = find_unused_states(state_declarations, sources)
+        for state in unused:
+            print(f"Warning: state '{state['stateKey']}' in view '{view_name}' is never used; "
+                  f"register/{state['setterName']}/update${state['stateKey']} were not generated "
+                  f"(ONEJS_ELIMINATE_DEAD_STATE=0 to keep them).")
+        return [state for state in state_declarations if state not in unused]
     
     def _convert_blade_to_template_string(self, blade_expression):
         """Convert Blade expressions like {{ asset('css/file.css') }} to template string format"""
@@ -2314,6 +2319,19 @@ export function """ + function_name + """(__data__ = {}, systemData = {}) {
         result = re.sub(r'\{\{\s*([^}]+)\s*\}\}', replace_blade_expression, blade_expression)
         return result
 
+    def _generate_data_handlers(self, state_declarations):
+        """
+        commitConstructorData/updateVariableData/updateVariableItemData via the shared
+        createViewDataHandlers runtime helper; only the state updates are view-specific
+        """
+        if not state_declarations:
+            return "...createViewDataHandlers(__UPDATE_DATA_TRAIT__)"
+        return ("...createViewDataHandlers(__UPDATE_DATA_TRAIT__, () => {\n"
+                "            // Update states from data, then lock state updates\n"
+                "            " + self._generate_state_updates(state_declarations) + "\n"
+                "            lockUpdateRealState();\n"
+                "        })")
+
     def _generate_state_updates(self, state_declarations):
         """Generate state update calls for updateVariableData function"""
         if not state_declarations:
@@ -0,0 +1,130 @@
+"""
+Memory accounting cho từng view khi compile (opt-in, dùng tracemalloc)
+"""
+
+import os
+import sys
+import threading
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+
+# Default threshold: 8 MB peak traced allocation per view
+DEFAULT_THRESHOLD_KB = 8192
+DEFAULT_TOP_N = 5
+# Records kept between reports (a long-lived worker compiles without ever printing a report)
+MAX_RECORDS = 256
+
+
+class MemoryReporter:
+    """
+    Record peak traced allocation and top retained allocation sites per compiled view
+
+    Sites come from a before/after snapshot diff: they show memory still held when the
+    compile finished, not where the peak was reached.
+    """
+
+    def __init__(self, enabled=False, threshold_kb=DEFAULT_THRESHOLD_KB, top_n=DEFAULT_TOP_N):
+        self.enabled = enabled
+        self.threshold_bytes = int(threshold_kb) * 1024
+        self.top_n = int(top_n)
+        self.records = deque(maxlen=MAX_RECORDS)
+        # tracemalloc is process-wide: tracked compiles run one at a time
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        """
+        Build reporter from environment variables (passed by CLI wrapper):
+        - ONEJS_MEMORY_REPORT=1 enables the report
+        - ONEJS_MEMORY_THRESHOLD_KB sets the flag threshold (default 8192)
+        - ONEJS_MEMORY_TOP sets the number of retained allocation sites kept (default 5)
+        """
+        enabled = os.environ.get('ONEJS_MEMORY_REPORT', '').lower() in ('1', 'true', 'yes', 'on')
+        threshold_kb = os.environ.get('ONEJS_MEMORY_THRESHOLD_KB') or DEFAULT_THRESHOLD_KB
+        top_n = os.environ.get('ONEJS_MEMORY_TOP') or DEFAULT_TOP_N
+        return cls(enabled=enabled, threshold_kb=threshold_kb, top_n=top_n)
+
+    @contextmanager
+    def track(self, view_name):
+        """Trace allocations made while compiling one view"""
+        if not self.enabled:
+            yield None
+            return
+        
+        with self._lock, self._trace(view_name) as record:
+            yield record
+
+    @contextmanager
+    def _trace(self, view_name):
+        # Only start/stop tracemalloc if nobody else is tracing already
+        started_here = not tracemalloc.is_tracing()
+        if started_here:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        before = tracemalloc.take_snapshot()
+        record = {'view': view_name, 'peak': 0, 'current': 0, 'retained_sites': [], 'flagged': False}
+        try:
+            yield record
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot()
+            if started_here:
+                tracemalloc.stop()
+
+            # Ignore allocations made by tracemalloc itself and by this module
+            filters = [
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+            ]
+            stats = after.filter_traces(filters).compare_to(before.filter_traces(filters), 'lineno')
+
+            record['peak'] = peak
+            record['current'] = current
+            record['retained_sites'] = [
+                (f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}", stat.size_diff, stat.count_diff)
+                for stat in stats[:self.top_n]
+                if stat.size_diff > 0
+            ]
+            record['flagged'] = peak >= self.threshold_bytes
+            self.records.append(record)
+
+    def flagged(self):
+        """Records whose peak allocation exceeded the threshold"""
+        return [record for record in self.records if record['flagged']]
+
+    def format_report(self):
+        """Format the collected records as plain text"""
+        if not self.records:
+            return ""
+
+        lines = [f"Memory report ({len(self.records)} view(s), threshold {self.threshold_bytes // 1024} KB):"]
+        for record in self.records:
+            marker = '!!' if record['flagged'] else '  '
+            lines.append(f"{marker} {record['view']}: peak {record['peak'] / 1024:.1f} KB, retained {record['current'] / 1024:.1f} KB")
+            if record['retained_sites']:
+                lines.append("     top retained allocation sites:")
+            for site, size, count in record['retained_sites']:
+                short_site = os.sep.join(site.split(os.sep)[-2:])
+                lines.append(f"       {size / 1024:8.1f} KB  {count:6d} blocks  {short_site}")
+
+        flagged = self.flagged()
+        if flagged:
+            lines.append(f"{len(flagged)} view(s) above threshold: " + ', '.join(record['view'] for record in flagged))
+        return '\n'.join(lines)
+
+    def drain(self):
+        """Return and clear the collected records"""
+        records = list(self.records)
+        self.records.clear()
+        return records
+
+    def print_report(self, stream=None):
+        """
+        Print the report (stderr by default so it never mixes with compiled output)
+        and drain the records, so a reused compiler only reports views compiled since
+        """
+        report = self.format_report()
+        if report:
+            print(report, file=stream or sys.stderr)
+        self.drain()
@@ -0,0 +1,75 @@
+"""
+Typed data model cho pipeline: declarations, sections, scripts/styles và event handlers
+
+Các class dùng __slots__ (Python 3.10+) và frozen=True nên nhẹ hơn dict, truy cập
+thuộc tính nhanh hơn, và hash/serialize được (dataclasses.asdict) cho batch/cache.
+"""
+
+import sys
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+# dataclass(slots=True) requires Python 3.10+; older interpreters get regular dataclasses
+_MODEL_OPTIONS = {'frozen': True, 'slots': True} if sys.version_info >= (3, 10) else {'frozen': True}
+
+
+@dataclass(**_MODEL_OPTIONS)
+class DeclaredVariable:
+    """One variable inside a @vars/@let/@const/@useState declaration"""
+    name: Optional[str] = None
+    value: Optional[str] = None
+    has_default: bool = False
+    # Destructuring: [$a, $b] = ... or {a, b} = ...
+    names: Tuple[str, ...] = ()
+    is_destructuring: bool = False
+    destructuring_type: Optional[str] = None  # 'array' | 'object'
+    is_use_state: bool = False
+
+
+@dataclass(**_MODEL_OPTIONS)
+class Declaration:
+    """A @vars/@let/@const/@useState directive and its position in the template"""
+    type: str
+    position: int
+    content: str
+    variables: Tuple[DeclaredVariable, ...] = ()
+
+
+@dataclass(**_MODEL_OPTIONS)
+class SectionInfo:
+    """Result of TemplateAnalyzer.analyze_sections_info for one @section"""
+    name: str
+    type: str = 'short'  # 'short' | 'long'
+    use_vars: bool = False
+    preloader: bool = False
+    script: Optional[str] = None  # JavaScript object string from @register
+
+
+@dataclass(**_MODEL_OPTIONS)
+class ScriptResource:
+    """A <script>, <style> or <link rel="stylesheet"> collected by RegisterParser"""
+    type: str  # 'code' | 'src' (scripts) | 'href' (stylesheets)
+    content: str = ''
+    src: str = ''
+    href: str = ''
+    id: str = ''
+    class_name: str = ''
+    attributes: Tuple[Tuple[str, object], ...] = ()
+
+    @property
+    def attributes_dict(self):
+        return dict(self.attributes)
+
+
+@dataclass(**_MODEL_OPTIONS)
+class EventHandlerConfig:
+    """A named event handler and its (JavaScript) params: {"handler": ..., "params": [...]}"""
+    handler: str
+    params: Tuple[str, ...] = ()
+
+    def to_js(self, frozen=False):
+        """Render as the object literal passed to __addEventConfig (Object.freeze'd when hoisted)"""
+        params = ",".join(self.params)
+        if frozen:
+            return f'Object.freeze({{"handler":"{self.handler}","params":Object.freeze([{params}])}})'
+        return f'{{"handler":"{self.handler}","params":[{params}]}}'
@@ -4,7 +4,7 @@ Parsers cho các directive (@extends, @vars, @fetch, @onInit)
 
 import re
 import json
-from utils import extract_balanced_parentheses
+from utils import extract_balanced_parentheses, replace_delimited_blocks, VERBATIM_OPEN, VERBATIM_CLOSE
 from php_converter import php_to_js, convert_php_array_to_json, convert_php_array_with_php_r
 
 class DirectiveParsers:
@@ -20,7 +20,7 @@ class DirectiveParsers:
     def _remove_verbatim_blocks(self, blade_code):
         """Loại bỏ @verbatim...@endverbatim blocks để tránh xử lý directives bên trong"""
         # Loại bỏ tất cả content trong @verbatim blocks
-        filtered_code = re.sub(r'@verbatim\s*.*?\s*@endverbatim', '', blade_code, flags=re.DOTALL | re.IGNORECASE)
+        filtered_code = replace_delimited_blocks(blade_code, VERBATIM_OPEN, VERBATIM_CLOSE, lambda full_block, inner: '')
         return filtered_code
     
     def parse_extends(self, blade_code):
@@ -4,6 +4,7 @@ PHP to JavaScript Converter - Advanced version for complex data structures
 
 import re
 from typing import List, Dict, Any, Tuple
+from utils import has_ternary_marker
 
 class PHPToJSConverter:
     """Advanced PHP to JavaScript converter for complex data structures"""
@@ -31,7 +32,7 @@ class PHPToJSConverter:
             if re.search(r'[=!<>]=?', expr):
                 pass  # Skip string concatenation for comparison operators
             # Skip ternary operators like condition ? value1 : value2
-            elif re.search(r'\?.*:', expr):
+            elif has_ternary_marker(expr):
                 pass  # Skip string concatenation for ternary operators
             # Check if this is object access pattern (var->method) - skip if so
             # Pattern: anything->anything (not just $var->method)
@@ -74,7 +75,7 @@ class PHPToJSConverter:
             # Skip comparison operators like ===, ==, !=, !==, <, >, <=, >=
             if not re.search(r'[=!<>]=?', expr):
                 # Skip ternary operators like condition ? value1 : value2
-                if not re.search(r'\?.*:', expr):
+                if not has_ternary_marker(expr):
                     if '.' in expr and ('$' in expr or '+' in expr):
                         expr = re.sub(r'\+([\'"][^\'\"]*[\'\"])\+', r'+\1+', expr)
         
@@ -462,7 +463,7 @@ class PHPToJSConverter:
             if re.search(r'[=!<>]=?|==|!=|<=|>=|===|!==', expr_without_strings):
                 return expr
             # Skip ternary operators like condition ? value1 : value2
-            if re.search(r'\?.*:', expr):
+            if has_ternary_marker(expr):
                 return expr
             
             # Skip JS style property access (obj.prop)
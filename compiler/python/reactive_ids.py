@@ -0,0 +1,51 @@
+"""
+ID cho reactive/watch blocks
+
+Mặc định mỗi block có ID dạng `${__VIEW_ID__}-watch-3` / `rc-${__VIEW_ID__}-7`, tức là
+một lần nối chuỗi mỗi block mỗi lần render và marker dài trong SSR HTML. Ở chế độ
+compact (ONEJS_COMPACT_REACTIVE_IDS=1) compiler cấp slot số nguyên duy nhất trong view:
+    this.__reactive(3, ['todos'], ...)
+runtime ghép slot với view instance một lần (ViewController.resolveReactiveId).
+Block trong @for/@while vẫn cần index của vòng lặp: `3-${__loop.index}`.
+
+Compact là opt-in: block runtime render __reactive/__watch phải resolve slot qua
+resolveReactiveId, nếu không marker `3` của hai view instance sẽ trùng nhau.
+"""
+
+import os
+
+
+def compact_reactive_ids_enabled():
+    """ONEJS_COMPACT_REACTIVE_IDS=1 emits integer slots instead of `${__VIEW_ID__}-watch-n` / `rc-${__VIEW_ID__}-n`"""
+    return os.environ.get('ONEJS_COMPACT_REACTIVE_IDS', '0').lower() in ('1', 'true', 'yes', 'on')
+
+
+class ReactiveIdAllocator:
+    """Allocate the IDs of one view's reactive blocks (JavaScript expressions)"""
+
+    def __init__(self, compact=False):
+        self.compact = compact
+        self.slot_counter = 0  # compact mode: one sequence for every block
+        self.watch_counter = 0
+        self.output_counter = 0
+
+    @classmethod
+    def from_env(cls):
+        return cls(compact=compact_reactive_ids_enabled())
+
+    def watch_id(self, loop_scoped=False):
+        """ID of a directive block (@if, @foreach, @for, @while, @include...)"""
+        self.watch_counter += 1
+        if self.compact:
+            self.slot_counter += 1
+            return f"`{self.slot_counter}-${{__loop.index}}`" if loop_scoped else str(self.slot_counter)
+        suffix = '-${__loop.index}' if loop_scoped else ''
+        return f"`${{__VIEW_ID__}}-watch-{self.watch_counter}{suffix}`"
+
+    def output_id(self):
+        """ID of a reactive {{ }} / {!! !!} output"""
+        self.output_counter += 1
+        if self.compact:
+            self.slot_counter += 1
+            return str(self.slot_counter)
+        return f"`rc-${{__VIEW_ID__}}-{self.output_counter}`"
@@ -0,0 +1,210 @@
+"""
+Regex audit: fuzz các pattern/scanner của compiler với input bệnh lý tăng dần
+và báo lỗi nếu thời gian chạy tăng siêu tuyến tính (catastrophic backtracking).
+Scanner thay cho regex cũ còn được so kết quả với regex đó (EQUIVALENCE_CASES).
+
+Usage:
+    python3 regex_audit.py [--max-exponent 1.5] [--legacy] [--verbose]
+"""
+
+import math
+import random
+import re
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils import (
+    VERBATIM_OPEN, VERBATIM_CLOSE, SSR_OPEN, SSR_CLOSE,
+    BLADE_COMMENT_OPEN, BLADE_COMMENT_CLOSE, REGISTER_OPEN, REGISTER_CLOSE,
+    replace_delimited_blocks, has_ternary_marker, extract_quoted_attribute,
+)
+
+DEFAULT_SIZES = (4000, 8000, 16000, 32000)
+LEGACY_QUOTED_ATTRIBUTE = r'%s=(["\'])([^"\']*?(?:\{\{[^}]*\}\}[^"\']*?)*[^"\']*?)\1'
+DEFAULT_MAX_EXPONENT = 1.5
+REPEATS = 3
+
+
+class AuditCase:
+    """One pattern (or scanner) under audit and the fragments used to fuzz it"""
+
+    def __init__(self, name, target, fragments, prefix='', suffix='', sizes=DEFAULT_SIZES):
+        self.name = name
+        self.target = target
+        self.fragments = fragments
+        self.prefix = prefix
+        self.suffix = suffix
+        self.sizes = sizes
+
+    def inputs(self, size, seed=0):
+        """Pathological inputs of roughly `size` chars: one per fragment, plus a random mix"""
+        for fragment in self.fragments:
+            yield self.prefix + fragment * (size // len(fragment) + 1) + self.suffix
+        rng = random.Random(seed)
+        parts = []
+        length = 0
+        while length < size:
+            fragment = rng.choice(self.fragments)
+            parts.append(fragment)
+            length += len(fragment)
+        yield self.prefix + ''.join(parts) + self.suffix
+
+
+def _strip(_full, _inner):
+    return ''
+
+
+# Production patterns / scanners (must stay linear)
+AUDIT_CASES = [
+    AuditCase('verbatim_blocks',
+              lambda s: replace_delimited_blocks(s, VERBATIM_OPEN, VERBATIM_CLOSE, _strip),
+              ['@verbatim ', '@verbatim\n \t', '@VERBATIM @endverb']),
+    AuditCase('ssr_blocks',
+              lambda s: replace_delimited_blocks(s, SSR_OPEN, SSR_CLOSE, _strip),
+              ['@ssr ', '@serverSide\n', '@useSSR @endss']),
+    AuditCase('blade_comments',
+              lambda s: replace_delimited_blocks(s, BLADE_COMMENT_OPEN, BLADE_COMMENT_CLOSE, _strip),
+              ['{{-- ', '{{---}', '{{-- -- }']),
+    AuditCase('register_blocks',
+              lambda s: replace_delimited_blocks(s, REGISTER_OPEN, REGISTER_CLOSE, _strip),
+              ['@register ', '@setup(', '@script( x ) @endscr']),
+    AuditCase('ternary_marker',
+              has_ternary_marker,
+              ['?', '? ', '?\n:', '??']),
+    AuditCase('script_src_attribute',
+              lambda s: extract_quoted_attribute(s, 'src'),
+              ['{{a}}x', '{{ " }} ', '{{', 'src="', "src='{{ \" }} "],
+              prefix='src="', suffix="'"),
+    AuditCase('style_href_attribute',
+              lambda s: extract_quoted_attribute(s, 'href'),
+              ['{{a}}x', "{{ ' }}", '{{ }', 'href="'],
+              prefix='href="', suffix="'"),
+]
+
+# Patterns replaced by the scanners above (kept for --legacy benchmarking)
+LEGACY_CASES = [
+    AuditCase('legacy_verbatim_regex',
+              lambda s: re.sub(r'@verbatim\s*(.*?)\s*@endverbatim', '', s, flags=re.DOTALL | re.IGNORECASE),
+              ['@verbatim ', '@verbatim\n \t']),
+    AuditCase('legacy_ssr_regex',
+              lambda s: re.sub(r'@(?:serverside|serverSide|ssr|SSR|useSSR|useSsr)\b[\s\S]*?@end(?:serverside|serverSide|ServerSide|SSR|Ssr|ssr|useSSR|useSsr)\b', '', s, flags=re.IGNORECASE),
+              ['@ssr ']),
+    AuditCase('legacy_ternary_regex',
+              lambda s: re.search(r'\?.*:', s),
+              ['?']),
+    AuditCase('legacy_src_regex',
+              lambda s: re.search(LEGACY_QUOTED_ATTRIBUTE % 'src', s),
+              ['{{a}}x'], prefix='src="', suffix="'", sizes=(48, 72, 96, 108)),
+]
+
+
+def _legacy_quoted_attribute(text, name):
+    match = re.search(LEGACY_QUOTED_ATTRIBUTE % name, text)
+    return match.group(2) if match else None
+
+
+# Scanner vs the regex it replaced: (name, scanner, legacy, inputs) - results must be identical
+EQUIVALENCE_CASES = [
+    ('script_src_attribute',
+     lambda s: extract_quoted_attribute(s, 'src'),
+     lambda s: _legacy_quoted_attribute(s, 'src'),
+     ['<script src="{{ asset(\'app.js\') }}">', "src='{{ \"x\" }}'", 'src="a" src="b"',
+      # Lazy regex: the value ends at the first reachable quote, even inside {{ }}
+      'src="a{{"x}}"',
+      # ...but an echo right at the start is tried before the lazy tail
+      'src="{{ "a" }}b"',
+      'src="{{ }', "src='a\"b' src=\"c\""]),
+    ('style_href_attribute',
+     lambda s: extract_quoted_attribute(s, 'href'),
+     lambda s: _legacy_quoted_attribute(s, 'href'),
+     ['<link href="{{ asset(\'app.css\') }}">', 'href="a{{"x}}"', "href='{{a}}}'"]),
+]
+
+
+def _measure(target, text):
+    best = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        target(text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def audit_case(case, sizes=None):
+    """
+    Return (worst_exponent, details) for one case.
+    Exponent ~1 means linear, ~2 quadratic: log(t_max / t_min) / log(n_max / n_min).
+    """
+    sizes = sizes or case.sizes
+    worst = 0.0
+    details = []
+    per_size = [list(case.inputs(size)) for size in sizes]
+    for variant in range(len(per_size[0])):
+        timings = [_measure(case.target, inputs[variant]) for inputs in per_size]
+        # Guard against timer resolution on very fast scanners
+        first = max(timings[0], 1e-6)
+        last = max(timings[-1], 1e-6)
+        exponent = math.log(last / first) / math.log(sizes[-1] / sizes[0])
+        worst = max(worst, exponent)
+        details.append((variant, timings, exponent))
+    return worst, details
+
+
+def run_audit(cases, max_exponent=DEFAULT_MAX_EXPONENT, sizes=None, verbose=False, stream=None):
+    """Audit all cases; return list of names whose growth exceeded max_exponent"""
+    stream = stream or sys.stdout
+    failures = []
+    for case in cases:
+        worst, details = audit_case(case, sizes)
+        status = 'FAIL' if worst > max_exponent else 'ok'
+        print(f"{status:4}  {case.name:24} growth exponent {worst:.2f}", file=stream)
+        if verbose:
+            for variant, timings, exponent in details:
+                timing_text = ', '.join(f"{t * 1000:.2f}ms" for t in timings)
+                print(f"        input #{variant}: {timing_text} (exp {exponent:.2f})", file=stream)
+        if worst > max_exponent:
+            failures.append(case.name)
+    return failures
+
+
+def run_equivalence(cases, stream=None):
+    """Compare each scanner with its legacy regex; return the names with a different result"""
+    stream = stream or sys.stdout
+    failures = []
+    for name, scanner, legacy, inputs in cases:
+        mismatches = [(text, legacy(text), scanner(text)) for text in inputs if legacy(text) != scanner(text)]
+        print(f"{'FAIL' if mismatches else 'ok':4}  {name:24} matches legacy on {len(inputs)} input(s)", file=stream)
+        for text, expected, actual in mismatches:
+            print(f"        {text!r}: legacy {expected!r}, scanner {actual!r}", file=stream)
+        if mismatches:
+            failures.append(name)
+    return failures
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    max_exponent = DEFAULT_MAX_EXPONENT
+    if '--max-exponent' in argv:
+        max_exponent = float(argv[argv.index('--max-exponent') + 1])
+    verbose = '--verbose' in argv
+
+    cases = list(AUDIT_CASES)
+    if '--legacy' in argv:
+        cases += LEGACY_CASES
+
+    print(f"Regex audit: sizes {', '.join(map(str, DEFAULT_SIZES))}, max growth exponent {max_exponent}")
+    failures = run_equivalence(EQUIVALENCE_CASES)
+    failures += run_audit(cases, max_exponent=max_exponent, verbose=verbose)
+    if failures:
+        print(f"\n{len(failures)} failing pattern(s): {', '.join(failures)}")
+        return 1
+    print("\nAll audited patterns scale linearly")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
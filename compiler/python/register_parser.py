@@ -4,6 +4,8 @@ Parser cho directive @register với format mới
 
 import re
 from config import JS_FUNCTION_PREFIX
+from utils import extract_quoted_attribute
+from models import ScriptResource
 
 class RegisterParser:
     def __init__(self):
@@ -72,43 +74,18 @@ class RegisterParser:
             # Check if it's external script (has src)
             if 'src=' in attrs_string:
                 # External script - handle both regular URLs and Blade syntax
-                src_match = re.search(r'src=(["\'])([^"\']*?(?:\{\{[^}]*\}\}[^"\']*?)*[^"\']*?)\1', attrs_string)
-                if src_match:
-                    src = src_match.group(2)
-                    script_obj = {
-                        'type': 'src',
-                        'src': src
-                    }
-                    
+                src = extract_quoted_attribute(attrs_string, 'src')
+                if src is not None:
                     # Parse attributes (exclude src to avoid duplication)
                     attributes = self._parse_attributes(attrs_string, exclude_attrs=['src'])
-                    if attributes.get('id'):
-                        script_obj['id'] = attributes['id']
-                    if attributes.get('className'):
-                        script_obj['className'] = attributes['className']
-                    if attributes.get('attributes'):
-                        script_obj['attributes'] = attributes['attributes']
-                    
-                    self.scripts.append(script_obj)
+                    self.scripts.append(self._build_resource('src', attributes, src=src))
             else:
                 # Inline script
                 if not script_content:
                     continue
                 
                 # Parse attributes
-                script_obj = {
-                    'type': 'code',
-                    'content': script_content
-                }
-                
-                # Add attributes
                 attributes = self._parse_attributes(attrs_string)
-                if attributes.get('id'):
-                    script_obj['id'] = attributes['id']
-                if attributes.get('className'):
-                    script_obj['className'] = attributes['className']
-                if attributes.get('attributes'):
-                    script_obj['attributes'] = attributes['attributes']
                 
                 # is_setup_script already defined above when we detected <script setup>
 
@@ -135,8 +112,7 @@ class RegisterParser:
                         self.setup_content.append(script_content.strip())
                 # For regular scripts, only add if there's remaining content after removing export
                 elif remaining_content.strip():
-                    script_obj['content'] = remaining_content
-                    self.scripts.append(script_obj)
+                    self.scripts.append(self._build_resource('code', attributes, content=remaining_content))
     
     def _parse_styles(self, content):
         # Parse inline styles with attributes
@@ -147,21 +123,9 @@ class RegisterParser:
             css_content = match.group(2).strip()
             
             if css_content:
-                style_obj = {
-                    'type': 'code',
-                    'content': css_content
-                }
-                
                 # Parse attributes
                 attributes = self._parse_attributes(attrs_string)
-                if attributes.get('id'):
-                    style_obj['id'] = attributes['id']
-                if attributes.get('className'):
-                    style_obj['className'] = attributes['className']
-                if attributes.get('attributes'):
-                    style_obj['attributes'] = attributes['attributes']
-                
-                self.styles.append(style_obj)
+                self.styles.append(self._build_resource('code', attributes, content=css_content))
         
         # Parse external stylesheets with attributes
         # Use a more flexible pattern that handles Blade syntax better
@@ -173,25 +137,21 @@ class RegisterParser:
             attrs_combined = match.group(1) + match.group(2)
             
             # Extract href - handle both regular URLs and Blade syntax
-            href_match = re.search(r'href=(["\'])([^"\']*?(?:\{\{[^}]*\}\}[^"\']*?)*[^"\']*?)\1', full_tag)
-            if href_match:
-                href = href_match.group(2)
-                
-                style_obj = {
-                    'type': 'href',
-                    'href': href
-                }
-                
+            href = extract_quoted_attribute(full_tag, 'href')
+            if href is not None:
                 # Parse attributes (exclude href and rel to avoid duplication)
                 attributes = self._parse_attributes(attrs_combined, exclude_attrs=['href', 'rel'])
-                if attributes.get('id'):
-                    style_obj['id'] = attributes['id']
-                if attributes.get('className'):
-                    style_obj['className'] = attributes['className']
-                if attributes.get('attributes'):
-                    style_obj['attributes'] = attributes['attributes']
-                
-                self.styles.append(style_obj)
+                self.styles.append(self._build_resource('href', attributes, href=href))
+    
+    def _build_resource(self, resource_type, attributes, **fields):
+        """Create a ScriptResource from the result of _parse_attributes"""
+        return ScriptResource(
+            type=resource_type,
+            id=attributes.get('id') or '',
+            class_name=attributes.get('className') or '',
+            attributes=tuple((attributes.get('attributes') or {}).items()),
+            **fields
+        )
     
     def _parse_attributes(self, attrs_string, exclude_attrs=None):
         """Parse HTML attributes from string and extract id, class, and other attributes"""
@@ -427,7 +387,7 @@ class RegisterParser:
         return self.userDefined if isinstance(self.userDefined, str) else "{}"
     
     def get_setup_script(self):
-        code_scripts = [s['content'] for s in self.scripts if s['type'] == 'code']
+        code_scripts = [s.content for s in self.scripts if s.type == 'code']
         return '\n\n'.join(code_scripts) if code_scripts else ""
     
     def get_setup_content(self):
@@ -445,26 +405,25 @@ class RegisterParser:
         }
     
     def get_inline_css(self):
-        inline_css = [s['content'] for s in self.styles if s['type'] == 'code']
+        inline_css = [s.content for s in self.styles if s.type == 'code']
         return '\n'.join(inline_css) if inline_css else ""
     
     def get_external_css(self):
-        return [s['href'] for s in self.styles if s['type'] == 'href']
+        return [s.href for s in self.styles if s.type == 'href']
     
     def get_resources(self):
         resources = []
         
         for script in self.scripts:
-            if script['type'] == 'src':
-                attrs = {'src': script['src']}
+            if script.type == 'src':
+                attrs = {'src': script.src}
                 
                 # Add other attributes
-                if 'attributes' in script:
-                    attrs.update(script['attributes'])
-                if 'id' in script and script['id']:
-                    attrs['id'] = script['id']
-                if 'className' in script and script['className']:
-                    attrs['class'] = script['className']
+                attrs.update(script.attributes)
+                if script.id:
+                    attrs['id'] = script.id
+                if script.class_name:
+                    attrs['class'] = script.class_name
                 
                 resources.append({
                     'tag': 'script',
@@ -473,19 +432,18 @@ class RegisterParser:
                 })
         
         for style in self.styles:
-            if style['type'] == 'href':
+            if style.type == 'href':
                 attrs = {
                     'rel': 'stylesheet',
-                    'href': style['href']
+                    'href': style.href
                 }
                 
                 # Add other attributes
-                if 'attributes' in style:
-                    attrs.update(style['attributes'])
-                if 'id' in style and style['id']:
-                    attrs['id'] = style['id']
-                if 'className' in style and style['className']:
-                    attrs['class'] = style['className']
+                attrs.update(style.attributes)
+                if style.id:
+                    attrs['id'] = style.id
+                if style.class_name:
+                    attrs['class'] = style.class_name
                 
                 resources.append({
                     'tag': 'link',
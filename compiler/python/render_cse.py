@@ -0,0 +1,306 @@
+"""
+Common-subexpression elimination cho render function
+
+Template hay lặp lại cùng một biểu thức ({{ $user->profile->name }}, count($items),
+route('home')) → mỗi lần render gọi App.Helper.escString(...) / helper nhiều lần.
+Pass này chạy trên render expression đã sinh:
+- Scope = template literal gốc của render, hoặc literal là body của arrow function
+  (vd. row của @foreach: `(item, ...) => `...``)
+- ${expr} lặp lại >= 2 lần trong cùng scope (chỉ phần được evaluate ngay, không nằm
+  trong callback lazy như this.__reactive(..., () => ...)) và "thuần" được bind một lần:
+      const __cse0__ = App.Helper.escString(user.profile.name);
+- Thuần = literal, property chain (a.b?.c[0]) và lời gọi helper trong PURE_HELPERS
+- ${...} không thuần (App.View.execute(...) của @php, this.__execute(...), phép gán, lời gọi
+  ngoài PURE_HELPERS) là barrier: nó có thể đổi giá trị của biểu thức phía sau, nên chỉ các lần
+  xuất hiện không bị barrier nào chen giữa mới dùng chung. Trước barrier đầu tiên biến được bind
+  bằng const ngay trước literal; sau barrier, biến được gán tại lần xuất hiện đầu tiên:
+      let __cse1__;  ...  ${(__cse1__ = App.Helper.escString(user.name))} ... ${__cse1__}
+
+ONEJS_RENDER_CSE=0 tắt pass này.
+"""
+
+import os
+import re
+
+CSE_PREFIX = '__cse'
+
+# App.Helper.* / App.View.* functions without side effects (same result within one render)
+PURE_HELPERS = frozenset([
+    'escString', 'count', 'route', 'url', 'asset', 'strlen', 'strtoupper', 'strtolower',
+    'ucfirst', 'ucwords', 'lcfirst', 'trim', 'ltrim', 'rtrim', 'number_format', 'json_encode',
+    'implode', 'str_repeat', 'substr', 'str_replace', 'in_array', 'array_keys', 'array_values',
+    'isset', 'empty',
+])
+HELPER_NAMESPACES = ('App.Helper.', 'App.View.')
+
+_TOKEN_PATTERN = re.compile(r"""
+    \s*(?:
+      (?P<string>'(?:[^'\\\n]|\\.)*'|"(?:[^"\\\n]|\\.)*")
+    | (?P<number>\d+(?:\.\d+)?)
+    | (?P<name>[A-Za-z_$][\w$]*)
+    | (?P<punct>\?\.|[.,()\[\]])
+    )""", re.VERBOSE)
+_RESERVED = frozenset(['this', 'new', 'function', 'typeof', 'void', 'delete', 'await', 'yield', 'in', 'of'])
+
+
+def render_cse_enabled():
+    """ONEJS_RENDER_CSE=0 disables common-subexpression elimination in render functions"""
+    return os.environ.get('ONEJS_RENDER_CSE', '1').lower() not in ('0', 'false', 'no', 'off')
+
+
+def _tokenize(expr):
+    tokens = []
+    pos = 0
+    while pos < len(expr):
+        match = _TOKEN_PATTERN.match(expr, pos)
+        if not match or match.end() == pos:
+            if expr[pos:].strip():
+                return None
+            break
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+        pos = match.end()
+    return tokens
+
+
+class _PurityParser:
+    """expr := primary ; primary := literal | chain ; chain := name (.name | ?.name | [expr] | (args))*"""
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def take(self):
+        token = self.peek()
+        self.pos += 1
+        return token
+
+    def parse(self):
+        if not self.expression():
+            return False
+        return self.pos == len(self.tokens)
+
+    def expression(self):
+        kind, value = self.take()
+        if kind in ('string', 'number'):
+            return True
+        if kind != 'name' or value in _RESERVED:
+            return False
+        path = value
+        while True:
+            kind, value = self.peek()
+            if value in ('.', '?.'):
+                self.take()
+                kind, value = self.take()
+                if kind != 'name':
+                    return False
+                path += '.' + value
+            elif value == '[':
+                self.take()
+                if not self.expression() or self.take()[1] != ']':
+                    return False
+                path = None  # computed member: no longer a helper path
+            elif value == '(':
+                self.take()
+                if not self._is_pure_callee(path) or not self.arguments():
+                    return False
+                path = None
+            else:
+                return True
+
+    def arguments(self):
+        if self.peek()[1] == ')':
+            self.take()
+            return True
+        while True:
+            if not self.expression():
+                return False
+            kind, value = self.take()
+            if value == ')':
+                return True
+            if value != ',':
+                return False
+
+    @staticmethod
+    def _is_pure_callee(path):
+        if not path:
+            return False
+        for namespace in HELPER_NAMESPACES:
+            if path.startswith(namespace) and path[len(namespace):] in PURE_HELPERS:
+                return True
+        return False
+
+
+def is_pure_expression(expr):
+    tokens = _tokenize(expr)
+    return bool(tokens) and _PurityParser(tokens).parse()
+
+
+def _worth_binding(expr):
+    """A lone variable or literal costs nothing to repeat"""
+    tokens = _tokenize(expr)
+    return bool(tokens) and len(tokens) > 1 and is_pure_expression(expr)
+
+
+def _declaration(name, expr):
+    return f"const {name} = {expr};" if expr is not None else f"let {name};"
+
+
+class _Unbalanced(Exception):
+    pass
+
+
+class _Scope:
+    def __init__(self):
+        self.occurrences = {}  # placeholder -> (segment, expression)
+        self.counts = {}  # (segment, expression) -> occurrences
+        # Number of impure ${...} seen so far: occurrences in different segments are never shared
+        self.segment = 0
+
+
+class RenderCSE:
+    """Bind repeated pure ${...} expressions of a render expression once per scope"""
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.counter = 0
+
+    @classmethod
+    def from_env(cls):
+        return cls(enabled=render_cse_enabled())
+
+    def eliminate(self, code):
+        """Return (declarations, code); declarations go right before the render expression is evaluated"""
+        if not self.enabled or not code.startswith('`') or '${' not in code:
+            return '', code
+        self._placeholders = 0
+        scope = _Scope()
+        try:
+            literal, end = self._scan_literal(code, 1, scope)
+        except _Unbalanced:
+            return '', code
+        if end != len(code):
+            return '', code
+        declarations, literal = self._resolve(scope, literal)
+        return ''.join(_declaration(name, expr) + "\n" for name, expr in declarations), literal
+
+    def _placeholder(self, scope, expr):
+        self._placeholders += 1
+        token = f"\x00{self._placeholders}\x00"
+        key = (scope.segment, expr)
+        scope.occurrences[token] = key
+        scope.counts[key] = scope.counts.get(key, 0) + 1
+        return token
+
+    def _resolve(self, scope, text):
+        """
+        Replace the scope's placeholders: shared variable for expressions repeated within one segment,
+        original text otherwise. Returns ([(name, expr or None)], text); None = `let`, assigned in place
+        """
+        names = {}
+        declarations = []
+        for token, key in scope.occurrences.items():
+            segment, expr = key
+            if scope.counts[key] > 1:
+                if key in names:
+                    text = text.replace(token, '${' + names[key] + '}', 1)
+                    continue
+                name = names[key] = f"{CSE_PREFIX}{self.counter}__"
+                self.counter += 1
+                if segment == 0:
+                    # Nothing impure runs before the first ${...}: bind ahead of the literal
+                    declarations.append((name, expr))
+                    text = text.replace(token, '${' + name + '}', 1)
+                else:
+                    # Evaluated where it first appears, after the barrier
+                    declarations.append((name, None))
+                    text = text.replace(token, '${(' + name + ' = ' + expr + ')}', 1)
+            else:
+                text = text.replace(token, '${' + expr + '}', 1)
+        return declarations, text
+
+    def _scan_literal(self, code, i, scope):
+        """Scan a template literal body (after its backtick); scope=None: evaluated lazily, nothing is bound"""
+        out = ['`']
+        n = len(code)
+        start = i
+        while True:
+            if i >= n:
+                raise _Unbalanced()
+            c = code[i]
+            if c == '\\':
+                i += 2
+                continue
+            if c == '`':
+                out.append(code[start:i + 1])
+                return ''.join(out), i + 1
+            if code.startswith('${', i):
+                out.append(code[start:i])
+                expr, i = self._scan_code(code, i + 2, scope)
+                stripped = expr.strip()
+                if scope is not None and stripped == expr and '\x00' not in expr and _worth_binding(expr):
+                    out.append(self._placeholder(scope, expr))
+                else:
+                    out.append('${' + expr + '}')
+                    if scope is not None and not is_pure_expression(stripped):
+                        # Barrier: may change what the expressions after it evaluate to
+                        scope.segment += 1
+                i += 1  # closing '}'
+                start = i
+                continue
+            i += 1
+
+    def _scan_code(self, code, i, scope):
+        """Scan ${...} code up to its closing brace; nested literals after '=>' open their own scope"""
+        out = []
+        depth = 0
+        lazy = scope is None
+        n = len(code)
+        while i < n:
+            c = code[i]
+            if c in ('"', "'"):
+                j = i + 1
+                while j < n and code[j] != c:
+                    if code[j] == '\\':
+                        j += 1
+                    elif code[j] == '\n':
+                        raise _Unbalanced()
+                    j += 1
+                if j >= n:
+                    raise _Unbalanced()
+                out.append(code[i:j + 1])
+                i = j + 1
+                continue
+            if c == '`':
+                previous = ''.join(out).rstrip()
+                if previous.endswith('=>'):
+                    # Arrow function returning a template: its own scope
+                    inner = _Scope()
+                    literal, i = self._scan_literal(code, i + 1, inner)
+                    declarations, literal = self._resolve(inner, literal)
+                    if declarations:
+                        consts = ' '.join(_declaration(name, expr) for name, expr in declarations)
+                        literal = f"{{ {consts} return {literal}; }}"
+                    out.append(literal)
+                else:
+                    literal, i = self._scan_literal(code, i + 1, None if lazy else scope)
+                    out.append(literal)
+                continue
+            if code.startswith('=>', i) or (code.startswith('function', i) and not re.match(r'[\w$]', code[i - 1] if i else ' ')):
+                # Everything after an arrow/function in this expression runs later (or repeatedly)
+                lazy = True
+            elif (c == '?' and not code.startswith('?.', i)) or code.startswith('&&', i) or code.startswith('||', i):
+                # Conditionally evaluated (a ? `${x.y}` : ''): binding x.y up front could throw
+                lazy = True
+            if c == '{':
+                depth += 1
+            elif c == '}':
+                if depth == 0:
+                    return ''.join(out), i
+                depth -= 1
+            out.append(c)
+            i += 1
+        raise _Unbalanced()
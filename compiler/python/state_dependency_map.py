@@ -0,0 +1,54 @@
+"""
+Static state dependency map cho keyed lists
+
+Sau khi render/prerender đã được generate, quét các lời gọi
+this.__foreachKeyed(id, [keys], ...) và build map state key -> {watch: [list ids]}.
+Map được truyền vào setup config (stateDependencies) nên lúc flush runtime đi thẳng
+từ key thay đổi tới các keyed list cần patch. Chỉ emit ID mà runtime thực sự dùng
+(ViewController.refreshKeyedLists); __reactive/__watch block chưa có runtime nên không đưa vào map.
+"""
+
+import re
+
+# this.__foreachKeyed(3, ['todos'], ...) / this.__foreachKeyed(`${__VIEW_ID__}-watch-1`, [...], ...)
+KEYED_LIST_CALL_PATTERN = re.compile(
+    r"this\.__foreachKeyed\(\s*(\d+|`[^`]*`|'[^']*'|\"[^\"]*\")\s*,\s*\[([^\]]*)\]"
+)
+INTERPOLATION_PATTERN = re.compile(r'\$\{([^}]*)\}')
+KEY_PATTERN = re.compile(r"""['"]([A-Za-z_$][\w$]*)['"]""")
+
+
+def _is_static_id(block_id):
+    """IDs built only from __VIEW_ID__ can be evaluated in $__setup__; loop-scoped IDs cannot"""
+    return all(expr.strip() == '__VIEW_ID__' for expr in INTERPOLATION_PATTERN.findall(block_id))
+
+
+def collect_state_dependencies(code, state_variables):
+    """
+    Return {state_key: {'watch': [ids]}} for the useState keys in state_variables.
+    IDs are kept as JavaScript literals; lists whose ID depends on loop variables are skipped
+    (the runtime still matches those through their own state keys).
+    """
+    dependencies = {}
+    for match in KEYED_LIST_CALL_PATTERN.finditer(code):
+        block_id, keys = match.group(1), match.group(2)
+        if not _is_static_id(block_id):
+            continue
+        for key in KEY_PATTERN.findall(keys):
+            if key not in state_variables:
+                continue
+            ids = dependencies.setdefault(key, {'watch': []})['watch']
+            if block_id not in ids:
+                ids.append(block_id)
+    return dependencies
+
+
+def format_state_dependencies(dependencies, indent='        '):
+    """Render the dependency map as a JavaScript object literal ('{}' when empty)"""
+    if not dependencies:
+        return '{}'
+    lines = []
+    for key, blocks in dependencies.items():
+        watch = ', '.join(blocks['watch'])
+        lines.append(f"{indent}    {key}: {{watch: [{watch}]}}")
+    return '{\n' + ',\n'.join(lines) + f'\n{indent}}}'
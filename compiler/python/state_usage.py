@@ -0,0 +1,31 @@
+"""
+Dead-state elimination cho useState declarations
+
+State khai báo bằng @useState / @const([$x, $setX] = useState(...)) nhưng không
+được dùng ở template, event handler, declaration khác hay <script setup> thì
+không cần register, setter, update$key và commitConstructorData call.
+"""
+
+import os
+import re
+
+
+def dead_state_elimination_enabled():
+    """ONEJS_ELIMINATE_DEAD_STATE=0 keeps wiring for every declared state"""
+    return os.environ.get('ONEJS_ELIMINATE_DEAD_STATE', '1').lower() not in ('0', 'false', 'no', 'off')
+
+
+def _reference_pattern(state):
+    """State key, its setter or its update$ function used as a standalone identifier"""
+    names = '|'.join(re.escape(name) for name in (state['stateKey'], state['setterName']))
+    return re.compile(rf"(?<![\w$])(?:{names})(?![\w$])|update\${re.escape(state['stateKey'])}(?![\w$])")
+
+
+def find_unused_states(state_declarations, sources):
+    """
+    Return the state declarations (dicts with stateKey/setterName/initialValue) never referenced
+    in sources: generated render/prerender code, hoisted event configs, other declarations,
+    <script setup> content, lifecycle hooks...
+    """
+    code = '\n'.join(source for source in sources if source)
+    return [state for state in state_declarations if not _reference_pattern(state).search(code)]
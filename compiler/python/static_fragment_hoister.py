@@ -0,0 +1,137 @@
+"""
+Static fragment hoisting cho render function
+
+Template literal không chứa ${...} (static subtree, ví dụ layout HTML tĩnh,
+nhánh @if chỉ có HTML) đủ lớn được đưa ra module-level const. Render function
+chỉ còn build các phần động; các const dùng chung khi nội dung trùng nhau.
+"""
+
+import os
+
+STATIC_CONST_PREFIX = '__STATIC_TPL_'
+# Static literals shorter than this (after strip) stay inline
+DEFAULT_MIN_LENGTH = 40
+
+
+def hoisting_enabled():
+    """ONEJS_HOIST_STATIC=0 disables every compile-time hoisting (static fragments, event configs)"""
+    return os.environ.get('ONEJS_HOIST_STATIC', '1').lower() not in ('0', 'false', 'no', 'off')
+
+
+class StaticFragmentHoister:
+    """Collect static template literals of one view as module-level constants"""
+
+    def __init__(self, enabled=True, min_length=DEFAULT_MIN_LENGTH):
+        self.enabled = enabled
+        self.min_length = int(min_length)
+        self.fragments = {}  # literal body -> const name (insertion order)
+
+    @classmethod
+    def from_env(cls):
+        """
+        - ONEJS_HOIST_STATIC=0 disables hoisting
+        - ONEJS_HOIST_STATIC_MIN_LENGTH sets the minimum static literal size (default 40)
+        """
+        min_length = os.environ.get('ONEJS_HOIST_STATIC_MIN_LENGTH') or DEFAULT_MIN_LENGTH
+        return cls(enabled=hoisting_enabled(), min_length=min_length)
+
+    def hoist(self, code):
+        """Replace large static template literals in a JS expression by const references"""
+        if not self.enabled:
+            return code
+        spans = self._find_static_literals(code)
+        if not spans:
+            return code
+
+        parts = []
+        last = 0
+        for start, end in spans:
+            body = code[start + 1:end - 1]
+            if len(body.strip()) < self.min_length:
+                continue
+            parts.append(code[last:start])
+            parts.append(self._const_name(body))
+            last = end
+        parts.append(code[last:])
+        return ''.join(parts)
+
+    def _const_name(self, body):
+        name = self.fragments.get(body)
+        if name is None:
+            name = f"{STATIC_CONST_PREFIX}{len(self.fragments)}__"
+            self.fragments[body] = name
+        return name
+
+    def declarations(self):
+        """Module-level const declarations for the hoisted fragments"""
+        return '\n'.join(f"const {name} = `{body}`;" for body, name in self.fragments.items())
+
+    def _find_static_literals(self, code):
+        """
+        Return (start, end) spans of template literals without ${...}, in source order.
+        Returns None when the code cannot be scanned reliably (unbalanced literal/brace).
+        """
+        spans = []
+        # Stack entries: ['code', brace_depth] or ['tpl', start, has_interpolation]
+        stack = [['code', 0]]
+        i = 0
+        n = len(code)
+        while i < n:
+            top = stack[-1]
+            c = code[i]
+            if top[0] == 'tpl':
+                if c == '\\':
+                    i += 2
+                    continue
+                if c == '`':
+                    stack.pop()
+                    if not top[2]:
+                        spans.append((top[1], i + 1))
+                elif c == '$' and code.startswith('${', i):
+                    top[2] = True
+                    stack.append(['code', 0])
+                    i += 2
+                    continue
+                i += 1
+                continue
+
+            if c in ('"', "'"):
+                j = i + 1
+                while j < n and code[j] != c:
+                    if code[j] == '\\':
+                        j += 1
+                    elif code[j] == '\n':
+                        return None
+                    j += 1
+                if j >= n:
+                    return None
+                i = j + 1
+                continue
+            if c == '/' and code.startswith('//', i):
+                j = code.find('\n', i)
+                i = n if j == -1 else j
+                continue
+            if c == '/' and code.startswith('/*', i):
+                j = code.find('*/', i + 2)
+                if j == -1:
+                    return None
+                i = j + 2
+                continue
+            if c == '`':
+                stack.append(['tpl', i, False])
+            elif c == '{':
+                top[1] += 1
+            elif c == '}':
+                if top[1] > 0:
+                    top[1] -= 1
+                elif len(stack) > 1:
+                    # End of ${...}: back inside the enclosing literal
+                    stack.pop()
+                else:
+                    return None
+            i += 1
+
+        if len(stack) != 1:
+            return None
+        spans.sort()
+        return spans
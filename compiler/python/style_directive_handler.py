@@ -4,12 +4,17 @@ Supports: dynamic inline styles với reactive binding
 Uses __styleBinding() method for reactive style management
 """
 
+import json
 import re
 from php_js_converter import php_to_js_advanced
+from constant_folder import fold_php_constant
+from expression_tokenizer import split_top_level
 
 class StyleDirectiveHandler:
     def __init__(self, state_variables=None):
         self.state_variables = state_variables or set()
+        # Compile-time slot of each dynamic @style site: the runtime keys its binding by slot + render scope
+        self.slot_counter = 0
     
     def process_style_directive(self, content):
         """
@@ -17,7 +22,7 @@ class StyleDirectiveHandler:
         @style(['color' => $textColor, 'font-size' => $fontSize])
         @style(['background-color' => $isActive ? '#green' : '#red'])
         
-        Output format: ${this.__styleBinding([...])}
+        Output format: ${this.__styleBinding(slot, "static css", [[property, () => value, [states]], ...])}
         
         Note: Supports multi-line directives within HTML tag attributes
         """
@@ -54,10 +59,14 @@ class StyleDirectiveHandler:
     
     def _generate_style_output(self, expression):
         """
-        Generate reactive style binding output
+        Generate style output, split into constant and dynamic declarations
         
-        Input: ['color' => $textColor, 'font-size' => $fontSize]
-        Output: ${this.__styleBinding([['color', textColor], ['font-size', fontSize]])}
+        Input: ['color' => $textColor, 'font-weight' => 'bold']
+        Output: ${this.__styleBinding(0, "font-weight: bold", [['color', () => textColor, ['textColor']]])}
+        
+        Literal values are joined into one static CSS string at compile time; each dynamic
+        value carries only the state keys it reads, so a state change updates just the
+        affected style.setProperty calls. Literal-only @style emits a plain style="..." attribute.
         """
         # Parse PHP array syntax
         styles = self._parse_style_expression(expression)
@@ -65,25 +74,32 @@ class StyleDirectiveHandler:
         if not styles:
             return ''
         
-        # Extract state variables used
-        state_vars = self._extract_state_variables(styles)
-        
-        # Build JavaScript array of [key, value] pairs
+        static_declarations = []
         js_bindings = []
         for prop, value in styles:
+            constant = fold_php_constant(value)
+            if constant is None or constant is False:
+                # 'color' => null: property not set
+                continue
+            if isinstance(constant, str) or (isinstance(constant, int) and not isinstance(constant, bool)):
+                static_declarations.append(f"{prop}: {constant}")
+                continue
             # Convert PHP expression to JS
             js_value = php_to_js_advanced(value)
-            js_bindings.append(f"['{prop}', {js_value}]")
+            state_vars = sorted(self._extract_state_variables([(prop, value)]))
+            js_bindings.append(f"['{prop}', () => {js_value}, {state_vars}]")
         
-        js_array = '[' + ', '.join(js_bindings) + ']'
+        static_css = '; '.join(static_declarations)
+        if not js_bindings:
+            if not static_css:
+                return ''
+            escaped = static_css.replace('\\', '\\\\').replace('`', '\\`').replace('${', '\\${').replace('"', '&quot;')
+            return f'style="{escaped}"'
         
-        # Generate reactive binding with state tracking
-        if state_vars:
-            watch_keys = list(state_vars)
-            return f"${{this.__styleBinding({watch_keys}, {js_array})}}"
-        else:
-            # No state vars, but still use binding for consistency
-            return f"${{this.__styleBinding([], {js_array})}}"
+        js_array = '[' + ', '.join(js_bindings) + ']'
+        slot = self.slot_counter
+        self.slot_counter += 1
+        return f"${{this.__styleBinding({slot}, {json.dumps(static_css)}, {js_array})}}"
     
     def _parse_style_expression(self, expression):
         """
@@ -121,37 +137,7 @@ class StyleDirectiveHandler:
         """
         Split text by delimiter, but ignore delimiters inside quotes or parentheses
         """
-        parts = []
-        current = []
-        depth = 0
-        in_quote = False
-        quote_char = None
-        
-        for i, char in enumerate(text):
-            if char in ('"', "'") and (i == 0 or text[i-1] != '\\'):
-                if not in_quote:
-                    in_quote = True
-                    quote_char = char
-                elif char == quote_char:
-                    in_quote = False
-                    quote_char = None
-            
-            if not in_quote:
-                if char in '([{':
-                    depth += 1
-                elif char in ')]}':
-                    depth -= 1
-                elif char == delimiter and depth == 0:
-                    parts.append(''.join(current))
-                    current = []
-                    continue
-            
-            current.append(char)
-        
-        if current:
-            parts.append(''.join(current))
-        
-        return parts
+        return split_top_level(text, delimiter, strip=False)
     
     def _extract_state_variables(self, styles):
         """
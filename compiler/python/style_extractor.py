@@ -0,0 +1,48 @@
+"""
+Scoped-CSS extraction cho build mode ONEJS_EXTRACT_STYLES
+
+Mặc định <style> của view được inline vào setup config (styles: [{type: 'code', content: ...}])
+và runtime inject khi mount. Ở build mode này compiler chỉ giữ lại ID:
+    styles: [{"type":"ref","id":"st-1a2b3c4d5e"}]
+còn nội dung CSS được ghi ra sidecar <output>.styles.json. Node compiler gộp sidecar của
+mọi view trong một context thành một stylesheet có hash + manifest (xem compiler/index.js).
+"""
+
+import hashlib
+import json
+import os
+
+STYLE_ID_PREFIX = 'st-'
+SIDECAR_SUFFIX = '.styles.json'
+
+
+def style_extraction_enabled():
+    """ONEJS_EXTRACT_STYLES=1 references view styles by ID instead of inlining their CSS"""
+    return os.environ.get('ONEJS_EXTRACT_STYLES', '0').lower() in ('1', 'true', 'yes', 'on')
+
+
+def style_id(css_content):
+    """Content hash: the same CSS in several views maps to one rule block in the stylesheet"""
+    return STYLE_ID_PREFIX + hashlib.sha256(css_content.encode('utf-8')).hexdigest()[:10]
+
+
+def extract_style(view_name, style):
+    """Return the extracted entry ({id, view, content, attributes}) of an inline style resource"""
+    return {
+        'id': style_id(style.content),
+        'view': view_name,
+        'content': style.content,
+        'attributes': style.attributes_dict,
+    }
+
+
+def write_style_sidecar(output_file, extracted_styles):
+    """Write <output_file>.styles.json next to the compiled view (removes a stale one when empty)"""
+    sidecar = output_file + SIDECAR_SUFFIX
+    if not extracted_styles:
+        if os.path.exists(sidecar):
+            os.remove(sidecar)
+        return None
+    with open(sidecar, 'w', encoding='utf-8') as f:
+        json.dump(extracted_styles, f, ensure_ascii=False, indent=2)
+    return sidecar
@@ -3,6 +3,7 @@ Analyzer cho template content và sections
 """
 
 from config import JS_FUNCTION_PREFIX
+from models import SectionInfo
 import re
 
 class TemplateAnalyzer:
@@ -10,7 +11,7 @@ class TemplateAnalyzer:
         pass
     
     def analyze_sections_info(self, sections, vars_declaration, has_await, has_fetch):
-        """Analyze sections and return detailed information"""
+        """Analyze sections and return a list of SectionInfo"""
         sections_dict = {}  # Use dict to avoid duplicates, key = section_name
         
         if not sections:
@@ -82,22 +83,22 @@ class TemplateAnalyzer:
             
             # Only add or update if not exists, or if current has useVars=True and existing doesn't
             if section_name not in sections_dict:
-                sections_dict[section_name] = {
-                    "name": section_name,
-                    "type": section_type,
-                    "useVars": use_vars,
-                    "preloader": preloader
-                }
+                sections_dict[section_name] = SectionInfo(
+                    name=section_name,
+                    type=section_type,
+                    use_vars=use_vars,
+                    preloader=preloader
+                )
             else:
                 # Update if current section has useVars=True and existing doesn't
                 existing = sections_dict[section_name]
-                if use_vars and not existing['useVars']:
-                    sections_dict[section_name] = {
-                        "name": section_name,
-                        "type": section_type,
-                        "useVars": use_vars,
-                        "preloader": preloader
-                    }
+                if use_vars and not existing.use_vars:
+                    sections_dict[section_name] = SectionInfo(
+                        name=section_name,
+                        type=section_type,
+                        use_vars=use_vars,
+                        preloader=preloader
+                    )
         
         # Convert dict back to list
         return list(sections_dict.values())
@@ -12,11 +12,39 @@ from directive_processors import DirectiveProcessor
 from event_directive_processor import EventDirectiveProcessor
 from echo_processor import EchoProcessor
 from class_binding_handler import ClassBindingHandler
+from reactive_ids import ReactiveIdAllocator
+
+# Event directives whose (...) may span several lines: @click(\n handler(...)\n)
+MULTILINE_EVENT_TYPES = [
+    'click', 'change', 'submit', 'focus', 'blur', 'input', 'keydown', 'keyup', 'keypress',
+    'mousedown', 'mouseup', 'mouseover', 'mouseout', 'mousemove', 'mouseenter', 'mouseleave',
+    'dblclick', 'contextmenu', 'wheel', 'scroll', 'resize', 'load', 'unload', 'beforeunload',
+    'error', 'abort', 'select', 'selectstart', 'selectionchange'
+]
+MULTILINE_EVENT_PATTERN = re.compile(r'@(?:on)?(?:' + '|'.join(MULTILINE_EVENT_TYPES) + r')\s*\(', re.IGNORECASE)
+
+
+def _scan_paren_state(text, state):
+    """Advance (paren depth, open quote char) over text; quotes hide parentheses"""
+    depth, quote = state
+    for char in text:
+        if quote:
+            if char == quote:
+                quote = ''
+        elif char == '"' or char == "'":
+            quote = char
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+    return depth, quote
+
 
 class TemplateProcessor:
     def __init__(self, usestate_variables=None, is_typescript=False):
         self.state_variables = usestate_variables or set()
-        self.watch_counter = 0  # Counter for generating unique watch IDs
+        # IDs of reactive/watch blocks (compact integer slots, see reactive_ids.py)
+        self.reactive_ids = ReactiveIdAllocator.from_env()
         self._is_typescript = is_typescript
         self.conditional_handlers = ConditionalHandlers(self.state_variables, self)
         self.loop_handlers = LoopHandlers(self.state_variables, self, is_typescript)
@@ -24,7 +52,7 @@ class TemplateProcessor:
         self.template_processors = TemplateProcessors()
         self.directive_processors = DirectiveProcessor()
         self.event_processor = EventDirectiveProcessor(self.state_variables)
-        self.echo_processor = EchoProcessor(self.state_variables, is_typescript)
+        self.echo_processor = EchoProcessor(self.state_variables, is_typescript, self.reactive_ids)
         self.class_binding_handler = ClassBindingHandler(self.state_variables)
     
     def _is_attribute_directive(self, line):
@@ -258,8 +286,12 @@ class TemplateProcessor:
         blade_code = self.echo_processor.process_echo_expressions(blade_code)
         
         lines = blade_code.splitlines()
+        # Multi-line @view/@template/event directives, joined in one pass over the file
+        multiline_spans, multiline_covered = self._multiline_directive_spans(lines)
         output = []
         sections = []
+        # Folded constant-false @if branches truncate this list (see ConditionalHandlers)
+        self.collected_sections = sections
         stack = []
         skip_until = None
         remove_directive_markers = False
@@ -329,30 +361,26 @@ class TemplateProcessor:
                 i += 1
                 continue
             
-            # Check for multiline @view/@template directives
-            if self._is_incomplete_view_directive(line):
-                # Join with next lines until complete
-                complete_line, lines_joined = self._join_multiline_view_directive(lines, i)
-                if complete_line:
+            # Multiline @view/@template or event directive starting on this line
+            if i in multiline_spans:
+                span = multiline_spans[i]
+            elif i in multiline_covered:
+                # Reached inside a precomputed span (after a skipped block): scan from here
+                span = self._multiline_directive_span_at(lines, i)
+            else:
+                span = None
+            if span:
+                kind, complete_line, lines_joined = span
+                if kind == 'view':
                     # Process through template processor (not directive processor)
                     processed = self.template_processors.process_template_line(complete_line)
-                    if processed:
-                        output.append(processed)
-                    # Skip the lines that were joined
-                    i += lines_joined
-                    continue
-            
-            # Check for multiline event directives
-            if self._is_incomplete_event_directive(line):
-                # Join with next lines until complete
-                complete_line, lines_joined = self._join_multiline_event_directive(lines, i)
-                if complete_line:
+                else:
                     processed = self._process_line_directives(complete_line, stack, output, sections)
-                    if processed:
-                        output.append(processed)
-                    # Skip the lines that were joined
-                    i += lines_joined
-                    continue
+                if processed:
+                    output.append(processed)
+                # Skip the lines that were joined
+                i += lines_joined
+                continue
             
             # Process directives
             processed = self._process_line_directives(line, stack, output, sections)
@@ -474,10 +502,9 @@ class TemplateProcessor:
         # Replace __INCLUDE_WATCH_PLACEHOLDER__ with actual watch IDs
         # This ensures @include directives processed early get proper sequential watch IDs
         while '__INCLUDE_WATCH_PLACEHOLDER__' in template_content:
-            self.watch_counter += 1
-            # Replace placeholder (which is already quoted) with watch ID including __VIEW_ID__
+            # Replace placeholder (which is already quoted) with the block ID
             template_content = template_content.replace("'__INCLUDE_WATCH_PLACEHOLDER__'", 
-                                                       f"`${{__VIEW_ID__}}-watch-{self.watch_counter}`", 1)
+                                                       self.reactive_ids.watch_id(), 1)
         
         # NOTE: Verbatim blocks restoration is handled in main_compiler.py
         # after all processing is complete, so we don't restore them here
@@ -593,106 +620,47 @@ class TemplateProcessor:
         
         return result if changed else None
     
-    def _is_incomplete_event_directive(self, line):
-        """Check if line contains an incomplete event directive"""
-        event_types = [
-            'click', 'change', 'submit', 'focus', 'blur', 'input', 'keydown', 'keyup', 'keypress',
-            'mousedown', 'mouseup', 'mouseover', 'mouseout', 'mousemove', 'mouseenter', 'mouseleave',
-            'dblclick', 'contextmenu', 'wheel', 'scroll', 'resize', 'load', 'unload', 'beforeunload',
-            'error', 'abort', 'select', 'selectstart', 'selectionchange'
-        ]
-        
-        for event_type in event_types:
-            # Check for both @event(...) and @onEvent(...)
-            pattern = rf'@(?:on)?{event_type}\s*\('
-            if re.search(pattern, line, re.IGNORECASE):
-                # Check if parentheses are balanced
-                paren_count = 0
-                in_quotes = False
-                quote_char = ''
-                
-                for char in line:
-                    if (char == '"' or char == "'") and not in_quotes:
-                        in_quotes = True
-                        quote_char = char
-                    elif char == quote_char and in_quotes:
-                        in_quotes = False
-                        quote_char = ''
-                    elif not in_quotes:
-                        if char == '(':
-                            paren_count += 1
-                        elif char == ')':
-                            paren_count -= 1
-                
-                # If parentheses are not balanced, it's incomplete
-                if paren_count > 0:
-                    return True
-        
-        return False
-    
-    def _join_multiline_event_directive(self, lines, start_index):
-        """Join multiline event directive into a single line"""
-        result = lines[start_index].strip()
-        lines_joined = 1  # Start with 1 (the first line)
-        
-        for i in range(start_index + 1, len(lines)):
-            line = lines[i].strip()
-            result += ' ' + line
-            lines_joined += 1
-            
-            # Check if directive is now complete
-            if self._is_event_directive_complete(result):
-                return result, lines_joined
-        
-        return result, lines_joined
-    
-    def _is_event_directive_complete(self, line):
-        """Check if event directive is complete (balanced parentheses)"""
-        paren_count = 0
-        in_quotes = False
-        quote_char = ''
-        
-        for char in line:
-            if (char == '"' or char == "'") and not in_quotes:
-                in_quotes = True
-                quote_char = char
-            elif char == quote_char and in_quotes:
-                in_quotes = False
-                quote_char = ''
-            elif not in_quotes:
-                if char == '(':
-                    paren_count += 1
-                elif char == ')':
-                    paren_count -= 1
-        
-        return paren_count == 0
-    
-    def _is_incomplete_view_directive(self, line):
-        """Check if line contains an incomplete @view/@template directive"""
-        line_stripped = line.strip().lower()
-        
-        # Check if line starts with @view or @template
-        if line_stripped.startswith('@view(') or line_stripped.startswith('@template('):
-            # Check if directive is complete
-            return not self._is_event_directive_complete(line)
-        
-        return False
+    def _multiline_directive_spans(self, lines):
+        """
+        Find every multi-line directive in one pass: paren/quote state is carried line by line,
+        so each character is scanned once (O(n) for the whole template).
+        Returns (first line index -> (kind, joined line, lines joined), indexes of the other joined lines)
+        """
+        spans = {}
+        covered = set()
+        i = 0
+        while i < len(lines):
+            span = self._multiline_directive_span_at(lines, i)
+            if span:
+                spans[i] = span
+                covered.update(range(i + 1, i + span[2]))
+                i += span[2]
+            else:
+                i += 1
+        return spans, covered
     
-    def _join_multiline_view_directive(self, lines, start_index):
-        """Join multiline @view/@template directive into a single line"""
-        result = lines[start_index].strip()
-        lines_joined = 1  # Start with 1 (the first line)
-        
+    def _multiline_directive_span_at(self, lines, start_index):
+        """(kind, joined line, lines joined) when an unbalanced @view/@template/event directive starts at start_index"""
+        first = lines[start_index].strip()
+        if not first or '@' not in first:
+            return None
+        state = _scan_paren_state(first, (0, ''))
+        lowered = first.lower()
+        if (lowered.startswith('@view(') or lowered.startswith('@template(')) and state[0] != 0:
+            kind = 'view'
+        elif state[0] > 0 and MULTILINE_EVENT_PATTERN.search(first):
+            kind = 'event'
+        else:
+            return None
+        
+        parts = [first]
         for i in range(start_index + 1, len(lines)):
             line = lines[i].strip()
-            result += ' ' + line
-            lines_joined += 1
-            
-            # Check if directive is now complete
-            if self._is_event_directive_complete(result):
-                return result, lines_joined
-        
-        return result, lines_joined
+            parts.append(line)
+            state = _scan_paren_state(line, state)
+            if state[0] == 0:
+                break
+        return kind, ' '.join(parts), len(parts)
     
     def _extract_balanced_content(self, line, start_pos):
         """Extract content within balanced parentheses"""
@@ -6,6 +6,7 @@ from config import JS_FUNCTION_PREFIX, SPA_YIELD_ATTR_PREFIX, SPA_YIELD_SUBSCRIB
 from php_converter import php_to_js, convert_php_array_to_json
 from directive_processors import DirectiveProcessor
 from utils import extract_balanced_parentheses
+from expression_tokenizer import split_top_level, top_level_positions
 import re
 import json
 
@@ -17,88 +18,7 @@ class TemplateProcessors:
         """
         Split string `s` by `delimiter` at top-level only (ignore delimiter inside (), [], {}, and quotes).
         """
-        parts = []
-        buf = ''
-        depth_par = 0
-        depth_br = 0
-        depth_cur = 0
-        in_single = False
-        in_double = False
-        i = 0
-        dlen = len(delimiter)
-        while i < len(s):
-            ch = s[i]
-            if ch == '\\':
-                if i + 1 < len(s):
-                    buf += ch + s[i+1]
-                    i += 2
-                    continue
-                buf += ch
-                i += 1
-                continue
-            if in_single:
-                buf += ch
-                if ch == "'":
-                    in_single = False
-                i += 1
-                continue
-            if in_double:
-                buf += ch
-                if ch == '"':
-                    in_double = False
-                i += 1
-                continue
-            if ch == "'":
-                in_single = True
-                buf += ch
-                i += 1
-                continue
-            if ch == '"':
-                in_double = True
-                buf += ch
-                i += 1
-                continue
-            if ch == '(':
-                depth_par += 1
-                buf += ch
-                i += 1
-                continue
-            if ch == ')':
-                depth_par = max(0, depth_par - 1)
-                buf += ch
-                i += 1
-                continue
-            if ch == '[':
-                depth_br += 1
-                buf += ch
-                i += 1
-                continue
-            if ch == ']':
-                depth_br = max(0, depth_br - 1)
-                buf += ch
-                i += 1
-                continue
-            if ch == '{':
-                depth_cur += 1
-                buf += ch
-                i += 1
-                continue
-            if ch == '}':
-                depth_cur = max(0, depth_cur - 1)
-                buf += ch
-                i += 1
-                continue
-            # delimiter match at top level
-            if depth_par == 0 and depth_br == 0 and depth_cur == 0 and s[i:i+dlen] == delimiter:
-                parts.append(buf)
-                buf = ''
-                i += dlen
-                continue
-            buf += ch
-            i += 1
-        if buf != '':
-            parts.append(buf)
-        return parts
+        return split_top_level(s, delimiter, strip=False)
 
     def _extract_vars_from_expr(self, expr):
         """Extract top-level PHP variable base names from expr (ignore $ inside single-quoted strings)"""
@@ -1350,85 +1270,17 @@ class TemplateProcessors:
     
     def _find_separator_position(self, expression, separator):
         """Find separator position outside quotes and brackets"""
-        in_quote = False
-        quote_char = None
-        bracket_depth = 0
-        sep_len = len(separator)
-        
-        for i, char in enumerate(expression):
-            # Handle quotes
-            if char in ['"', "'"] and (i == 0 or expression[i-1] != '\\'):
-                if not in_quote:
-                    in_quote = True
-                    quote_char = char
-                elif char == quote_char:
-                    in_quote = False
-                    quote_char = None
-            
-            # Handle brackets
-            if not in_quote:
-                if char == '[':
-                    bracket_depth += 1
-                elif char == ']':
-                    bracket_depth -= 1
-            
-            # Check for separator
-            if not in_quote and bracket_depth == 0:
-                if expression[i:i+sep_len] == separator:
-                    # For ':', make sure it's not '::'
-                    if separator == ':':
-                        not_double_colon = (i + 1 >= len(expression) or expression[i + 1] != ':') and \
-                                          (i == 0 or expression[i - 1] != ':')
-                        if not_double_colon:
-                            return i
-                    else:
-                        return i
-        
+        for i in top_level_positions(expression, separator):
+            # For ':', make sure it's not '::'
+            if separator == ':' and (expression[i + 1:i + 2] == ':' or expression[i - 1:i] == ':'):
+                continue
+            return i
+
         return None
     
     def _split_params_by_comma(self, expression):
         """Split expression by comma (respecting quotes, brackets, and parentheses)"""
-        parts = []
-        current = ''
-        in_quote = False
-        quote_char = None
-        bracket_depth = 0
-        paren_depth = 0
-        
-        for i, char in enumerate(expression):
-            # Handle quotes
-            if char in ['"', "'"] and (i == 0 or expression[i-1] != '\\'):
-                if not in_quote:
-                    in_quote = True
-                    quote_char = char
-                elif char == quote_char:
-                    in_quote = False
-                    quote_char = None
-            
-            # Handle brackets and parentheses
-            if not in_quote:
-                if char == '[':
-                    bracket_depth += 1
-                elif char == ']':
-                    bracket_depth -= 1
-                elif char == '(':
-                    paren_depth += 1
-                elif char == ')':
-                    paren_depth -= 1
-            
-            # Split on comma only if not inside quotes, brackets, or parentheses
-            if not in_quote and bracket_depth == 0 and paren_depth == 0 and char == ',':
-                if current.strip():
-                    parts.append(current)
-                current = ''
-            else:
-                current += char
-        
-        # Add the last part
-        if current.strip():
-            parts.append(current)
-        
-        return parts
+        return split_top_level(expression, ',', strip=False, drop_empty=True)
     
     def _generate_wrapper_config(self, attributes, tag=None):
         """Generate wrapperConfig object"""
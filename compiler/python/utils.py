@@ -51,4 +51,123 @@ def format_js_output(content, indent_level=0):
         else:
             formatted_lines.append('')
     
-    return '\n'.join(formatted_lines)
\ No newline at end of file
+    return '\n'.join(formatted_lines)
+# ---------------------------------------------------------------------------
+# Linear-time scanners
+# ---------------------------------------------------------------------------
+# These replace lazy `open.*?close` regexes that backtrack quadratically when
+# the closing delimiter is missing (e.g. many @verbatim without @endverbatim).
+# Token patterns passed in must be simple (no nested quantifiers).
+
+VERBATIM_OPEN = re.compile(r'@verbatim', re.IGNORECASE)
+VERBATIM_CLOSE = re.compile(r'@endverbatim', re.IGNORECASE)
+SSR_OPEN = re.compile(r'@(?:serverside|ssr|usessr)\b', re.IGNORECASE)
+SSR_CLOSE = re.compile(r'@end(?:serverside|ssr|usessr)\b', re.IGNORECASE)
+BLADE_COMMENT_OPEN = re.compile(r'\{\{--')
+BLADE_COMMENT_CLOSE = re.compile(r'--\}\}')
+REGISTER_OPEN = re.compile(r'@(?:register|setup|script)', re.IGNORECASE)
+REGISTER_CLOSE = re.compile(r'@end(?:register|setup|script)', re.IGNORECASE)
+
+def find_delimited_blocks(text, open_regex, close_regex):
+    """
+    Yield (start, inner_start, inner_end, end) for each non-overlapping
+    open...close block, pairing every opener with the first closer after it.
+    Runs in O(n): once no closer is left, no later opener can match either.
+    """
+    pos = 0
+    while True:
+        open_match = open_regex.search(text, pos)
+        if not open_match:
+            return
+        close_match = close_regex.search(text, open_match.end())
+        if not close_match:
+            return
+        yield open_match.start(), open_match.end(), close_match.start(), close_match.end()
+        pos = close_match.end()
+
+def replace_delimited_blocks(text, open_regex, close_regex, replacement):
+    """
+    Replace each open...close block with replacement(full_block, inner_content).
+    Equivalent to re.sub(open + r'(.*?)' + close, ..., flags=re.DOTALL) without backtracking.
+    """
+    parts = []
+    last = 0
+    for start, inner_start, inner_end, end in find_delimited_blocks(text, open_regex, close_regex):
+        parts.append(text[last:start])
+        parts.append(replacement(text[start:end], text[inner_start:inner_end]))
+        last = end
+    if not parts:
+        return text
+    parts.append(text[last:])
+    return ''.join(parts)
+
+def has_ternary_marker(expr):
+    """Linear equivalent of re.search(r'\\?.*:', expr): a '?' followed by ':' on the same line"""
+    seen_question = False
+    for char in expr:
+        if char == '\n':
+            seen_question = False
+        elif char == '?':
+            seen_question = True
+        elif char == ':' and seen_question:
+            return True
+    return False
+
+def _quoted_value_ends(text, quote):
+    """
+    ends[p]: closing quote position the legacy regex reaches from p (where its {{...}} group
+    may start), -1 if none. Mirrors the regex priority: a {{...}} echo at p first, then the
+    lazy tail up to the next quote, then one more plain character. Built right to left, O(n).
+    """
+    length = len(text)
+    ends = [-1] * (length + 1)
+    next_quote = -1   # next '"' / "'" at or after p
+    next_brace = -1   # next '}' at or after p
+    for p in range(length - 1, -1, -1):
+        char = text[p]
+        if char in ('"', "'"):
+            next_quote = p
+        elif char == '}':
+            next_brace = p
+        end = -1
+        if char == '{' and text.startswith('{', p + 1):
+            close = next_brace
+            if close != -1 and close < p + 2:
+                close = text.find('}', p + 2)
+            # {{[^}]*}} - the first '}' must open the closing '}}'
+            if close != -1 and text.startswith('}}', close):
+                end = ends[close + 2]
+        if end == -1 and next_quote != -1 and text[next_quote] == quote:
+            end = next_quote
+        if end == -1 and char not in ('"', "'"):
+            end = ends[p + 1]
+        ends[p] = end
+    return ends
+
+
+def extract_quoted_attribute(attrs_string, attr_name):
+    """
+    Extract a quoted attribute value that may contain Blade echoes, e.g.
+    src="{{ asset('app.js') }}". Quotes are only allowed inside {{ ... }}.
+    Linear replacement for r'name=(["\'])([^"\']*?(?:\{\{[^}]*\}\}[^"\']*?)*[^"\']*?)\1'
+    with the same result, including its lazy cases: src="a{{"x}}" gives 'a{{'
+    (checked by regex_audit.EQUIVALENCE_CASES).
+    """
+    needle = attr_name + '='
+    length = len(attrs_string)
+    ends_by_quote = {}
+    pos = 0
+    while True:
+        index = attrs_string.find(needle, pos)
+        if index == -1:
+            return None
+        quote_pos = index + len(needle)
+        pos = index + 1
+        if quote_pos >= length or attrs_string[quote_pos] not in ('"', "'"):
+            continue
+        quote = attrs_string[quote_pos]
+        if quote not in ends_by_quote:
+            ends_by_quote[quote] = _quoted_value_ends(attrs_string, quote)
+        end = ends_by_quote[quote][quote_pos + 1]
+        if end != -1:
+            return attrs_string[quote_pos + 1:end]
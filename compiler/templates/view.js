@@ -1,4 +1,4 @@
-import { Application, View, ViewController, app } from 'oneview';
+import { Application, View, ViewController, app, createStateHelpers, createViewDataHandlers } from 'oneview';
 
 [COMPONENT_IMPORTS]
 
@@ -8,6 +8,15 @@ const __VIEW_TYPE__ = 'view';
 const __VIEW_CONFIG__ = {
     [VIEW_CONFIG_PLACEHOLDER]
 };
+// Precomputed metadata consumed by ViewManager (no runtime path/namespace splitting)
+export const __VIEW_META__ = Object.freeze({
+    path: __VIEW_PATH__,
+    namespace: __VIEW_NAMESPACE__,
+    type: __VIEW_TYPE__,
+    factory: '[FACTORY_FUNCTION_NAME]',
+    config: __VIEW_CONFIG__
+});
+[STATIC_TEMPLATE_CONSTANTS]
 
 
 [COMPONENT_SCRIPT_CONTENTS]
@@ -27,22 +36,9 @@ class [COMPONENT_NAME]View extends View {
     $__setup__(__data__:[TYPE:any], systemData:[TYPE:any]) {
         const App = this.__ctrl__.App;
         const __STATE__ = this.__ctrl__.states;
-        const {__base__, __layout__, __page__, __component__, __template__, __context__, __partial__, __system__, __env = {}, __helper = {}} = systemData;
+[SYSTEM_DATA_BINDINGS]
         const __VIEW_ID__ = __data__.__SSR_VIEW_ID__ || App.View.generateViewId();
-
-        const useState = (value:[TYPE:any]) => {
-            return __STATE__.__useState(value);
-        };
-        const updateRealState = (state:[TYPE:any]) => {
-            __STATE__.__.updateRealState(state);
-        };
-
-        const lockUpdateRealState = () => {
-            __STATE__.__.lockUpdateRealState();
-        };
-        const updateStateByKey = (key:[TYPE:string], state:[TYPE:any]) => {
-            __STATE__.__.updateStateByKey(key, state);
-        };
+        const { useState, updateRealState, lockUpdateRealState, updateStateByKey } = createStateHelpers(__STATE__);
 
 [COMPONENT_DECLARE_VARIABLES_AND_STATES]
 
@@ -63,4 +59,5 @@ export function [FACTORY_FUNCTION_NAME](__data__ = {}, systemData = {}) {
     view.$__setup__(__data__, systemData);
     return view;
 }
+[FACTORY_FUNCTION_NAME].meta = __VIEW_META__;
 export default [FACTORY_FUNCTION_NAME];
\ No newline at end of file
@@ -7,7 +7,7 @@
 
 const fs = require('fs');
 const path = require('path');
-const { spawn } = require('child_process');
+const { spawn, spawnSync } = require('child_process');
 const Compiler = require('./index');
 const ConfigManager = require('./config-manager');
 
@@ -42,6 +42,9 @@ class CompilerTests {
         this.testConfigManager();
         this.testPythonCompilerPath();
         this.testFileDiscovery();
+        this.testDeadStateElimination();
+        this.testRenderCSE();
+        this.testConstantFolding();
 
         console.log('\n📊 Test Results:');
         console.log(`   Passed: ${this.testsPassed}`);
@@ -191,6 +194,177 @@ class CompilerTests {
             if (files.length !== 0) throw new Error('Should return empty array for non-existent directory');
         });
     }
+
+    /**
+     * Compile a blade snippet with the Python CLI, return the generated JS
+     */
+    compileBlade(name, blade) {
+        const tempDir = path.join(__dirname, '.test-files');
+        const input = path.join(tempDir, `${name}.blade.php`);
+        const output = path.join(tempDir, `${name}.js`);
+        fs.mkdirSync(tempDir, { recursive: true });
+        try {
+            fs.writeFileSync(input, blade);
+            const result = spawnSync('python3', ['cli.py', input, output, name, name], {
+                cwd: path.join(__dirname, 'python'),
+                encoding: 'utf8'
+            });
+            if (result.status !== 0) {
+                throw new Error(`Compile failed: ${result.stderr || result.stdout}`);
+            }
+            return fs.readFileSync(output, 'utf8');
+        } finally {
+            fs.rmSync(tempDir, { recursive: true, force: true });
+        }
+    }
+
+    /**
+     * Fold a PHP expression with constant_folder.py; returns { constant: false } when it is not folded
+     */
+    foldPhp(expr) {
+        const script = [
+            'import json, sys',
+            'from constant_folder import fold_php_constant, NOT_CONSTANT',
+            'value = fold_php_constant(sys.argv[1])',
+            "print(json.dumps({'constant': False} if value is NOT_CONSTANT else {'constant': True, 'value': value}))"
+        ].join('\n');
+        const result = spawnSync('python3', ['-c', script, expr], {
+            cwd: path.join(__dirname, 'python'),
+            encoding: 'utf8'
+        });
+        if (result.status !== 0) {
+            throw new Error(`Folding failed: ${result.stderr || result.stdout}`);
+        }
+        return JSON.parse(result.stdout);
+    }
+
+    /**
+     * Test dead-state elimination keeps states used outside the template
+     */
+    testDeadStateElimination() {
+        console.log('\n4. Dead-state Elimination:');
+
+        this.test('Keeps state used only in @fetch or inline <script>', () => {
+            const js = this.compileBlade('DeadStateTest', [
+                '@useState($page, 1)',
+                "@useState($filter, 'all')",
+                '@useState($unused, 0)',
+                "@fetch(route('items', $page), [])",
+                '<div>Items</div>',
+                '<script>',
+                '    console.log(filter);',
+                '</script>'
+            ].join('\n'));
+            for (const key of ['page', 'filter']) {
+                if (!js.includes(`__STATE__.__.register('${key}')`)) {
+                    throw new Error(`State '${key}' was dropped`);
+                }
+            }
+            if (js.includes("__STATE__.__.register('unused')")) {
+                throw new Error("Unused state 'unused' was not dropped");
+            }
+        });
+    }
+
+    /**
+     * Test render CSE never shares an expression across a side-effecting ${...}
+     */
+    testRenderCSE() {
+        console.log('\n5. Render CSE:');
+
+        this.test('Shares repeated pure expressions', () => {
+            const js = this.compileBlade('CseShareTest', [
+                '<div>',
+                '<p>{{ $user->name }}</p>',
+                '<p>{{ $user->name }}</p>',
+                '</div>'
+            ].join('\n'));
+            if (!js.includes('const __cse0__ = App.Helper.escString(user.name);')) {
+                throw new Error('Repeated {{ $user->name }} was not bound once');
+            }
+        });
+
+        this.test('Re-evaluates expressions after an @php block', () => {
+            const js = this.compileBlade('CseBarrierTest', [
+                '<div>',
+                '<p>{{ $user->name }}</p>',
+                '@php',
+                '    $user = $other;',
+                '@endphp',
+                '<p>{{ $user->name }}</p>',
+                '</div>'
+            ].join('\n'));
+            const barrier = js.indexOf('App.View.execute(');
+            if (barrier === -1) {
+                throw new Error('@php block not found in output');
+            }
+            if (!js.slice(barrier).includes('App.Helper.escString(user.name)')) {
+                throw new Error('{{ $user->name }} after @php reuses the value bound before it');
+            }
+        });
+    }
+
+    /**
+     * Test compile-time folding follows PHP 8 semantics and refuses anything it cannot prove
+     */
+    testConstantFolding() {
+        console.log('\n6. Constant Folding:');
+
+        const expectFolded = (expr, expected) => {
+            const result = this.foldPhp(expr);
+            if (!result.constant || result.value !== expected) {
+                throw new Error(`${expr} folded to ${JSON.stringify(result)}, expected ${JSON.stringify(expected)}`);
+            }
+        };
+        const expectNotFolded = (expr) => {
+            const result = this.foldPhp(expr);
+            if (result.constant) {
+                throw new Error(`${expr} should not be folded, got ${JSON.stringify(result.value)}`);
+            }
+        };
+
+        this.test('% takes the sign of the dividend', () => {
+            expectFolded('-7 % 3', -1);
+            expectFolded('7 % -3', 1);
+        });
+
+        this.test("'.' binds looser than '+' and '*'", () => {
+            expectFolded("'a' . 1 + 2", 'a3');
+            expectFolded("'x' . 2 * 3", 'x6');
+        });
+
+        this.test('Refuses type juggling', () => {
+            expectNotFolded("'1' + 1");
+            expectNotFolded("'abc' == 0");
+        });
+
+        this.test('Refuses unparenthesized nested ternaries', () => {
+            expectNotFolded('true ? 1 : false ? 2 : 3');
+        });
+
+        this.test('Refuses interpolated double-quoted strings', () => {
+            expectNotFolded('"$x"');
+            expectNotFolded('"a{$x}"');
+        });
+
+        this.test('Drops @section declared in a constant-false @if', () => {
+            const js = this.compileBlade('FoldSectionTest', [
+                "@extends('layouts.app')",
+                '@if(false)',
+                "@section('title', 'Hidden')",
+                '@endif',
+                "@section('content')",
+                '<p>hi</p>',
+                '@endsection'
+            ].join('\n'));
+            if (js.includes('"title"')) {
+                throw new Error("Section 'title' from a pruned branch is still declared");
+            }
+            if (!js.includes('"content"')) {
+                throw new Error("Section 'content' is missing");
+            }
+        });
+    }
 }
 
 // Run tests
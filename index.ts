@@ -31,7 +31,15 @@ export {
     StateManager,
     SSRViewDataParser,
     SSRViewDataCollection,
-    SSRViewData
+    SSRViewData,
+    createStateHelpers,
+    createViewDataHandlers,
+    KeyedList,
+    diffKeyedList,
+    ClassBinding,
+    StyleBinding,
+    EventDelegator,
+    bindInput
 } from './src/core/view/index.js';
 export type { 
     ViewLifecycle, 
@@ -39,7 +47,18 @@ export type {
     ViewInstance, 
     ViewModule,
     LoadResult,
+    ViewMeta,
     WrapperConfig,
     SectionMetadata,
-    SSRViewDataItem
+    SSRViewDataItem,
+    StateDependents,
+    ReactiveBlockId,
+    ViewStateHelpers,
+    ViewDataHandlers,
+    ListKey,
+    KeyedListPatch,
+    ClassToggle,
+    StyleDeclaration,
+    DelegatedEventTable,
+    BindingOptions
 } from './src/core/view/index.js';
\ No newline at end of file
@@ -92,9 +92,11 @@ export interface ViewScript {
 }
 
 export interface ViewStyle {
-    type: 'href' | 'inline';
+    type: 'href' | 'inline' | 'ref';
     href?: string;
     content?: string;
+    /** Style ID in the context stylesheet (type 'ref', compiled with extractStyles) */
+    id?: string;
     scoped?: boolean;
 }
 
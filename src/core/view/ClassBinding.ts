@@ -0,0 +1,87 @@
+/**
+ * ClassBinding - @class runtime
+ * V2 TypeScript
+ *
+ * `@class(['btn', 'active' => $isActive])` compile thành
+ * this.__classBinding(0, "btn", [["active", () => isActive, ["isActive"]]]) (0 = slot của site lúc compile).
+ * Chuỗi class tĩnh được emit một lần; khi state đổi runtime chỉ
+ * classList.toggle các class phụ thuộc state đó thay vì ghi lại cả attribute.
+ * ID = view ID + slot + render scope nên render lại cùng site cho lại cùng ID (map không phình).
+ */
+
+export type ClassToggle = [className: string, predicate: () => any, stateKeys: string[]];
+
+export const CLASS_BINDING_ATTRIBUTE = 'data-one-class';
+
+function escapeAttribute(value: string): string {
+    return value.replace(/&/g, '&amp;').replace(/"/g, '&quot;').replace(/</g, '&lt;');
+}
+
+export class ClassBinding {
+    public readonly id: string;
+    public readonly staticClass: string;
+    public readonly toggles: ClassToggle[];
+    // Its element was rendered and has left the DOM: the controller drops the binding
+    public stale: boolean = false;
+    // Element carrying the marker, cached after the first lookup
+    private element: Element | null = null;
+
+    constructor(id: string, staticClass: string, toggles: ClassToggle[]) {
+        this.id = id;
+        this.staticClass = staticClass;
+        this.toggles = toggles;
+    }
+
+    /**
+     * Initial class attribute (static classes + active toggles) and the marker used to find the element
+     */
+    render(): string {
+        const classes = this.staticClass ? [this.staticClass] : [];
+        for (const [className, predicate] of this.toggles) {
+            if (predicate()) {
+                classes.push(className);
+            }
+        }
+        return `class="${escapeAttribute(classes.join(' '))}" ${CLASS_BINDING_ATTRIBUTE}="${this.id}"`;
+    }
+
+    /**
+     * The rendered element: cached while connected, else looked up once under root
+     * IDs are built from the view ID, slots and encoded row keys, so they need no selector escaping
+     */
+    locate(root: ParentNode): Element | null {
+        if (this.element && this.element.isConnected) {
+            return this.element;
+        }
+        const found = root.querySelector(`[${CLASS_BINDING_ATTRIBUTE}="${this.id}"]`);
+        this.stale = this.element !== null && found === null;
+        this.element = found;
+        return found;
+    }
+
+    dependsOn(changedKeys: string[]): boolean {
+        return this.toggles.some(([, , stateKeys]) => stateKeys.some(key => changedKeys.includes(key)));
+    }
+
+    /**
+     * Flip the toggles whose state keys changed (every toggle when changedKeys is omitted)
+     * @returns number of class names added or removed
+     */
+    update(element: Element, changedKeys?: string[]): number {
+        let flipped = 0;
+        for (const [className, predicate, stateKeys] of this.toggles) {
+            if (changedKeys && !stateKeys.some(key => changedKeys.includes(key))) {
+                continue;
+            }
+            const active = !!predicate();
+            // 'btn btn-primary' => $cond toggles every name of the entry
+            for (const name of className.split(/\s+/)) {
+                if (name && element.classList.contains(name) !== active) {
+                    element.classList.toggle(name, active);
+                    flipped++;
+                }
+            }
+        }
+        return flipped;
+    }
+}
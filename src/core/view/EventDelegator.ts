@@ -0,0 +1,157 @@
+/**
+ * EventDelegator - Event delegation runtime (ONEJS_EVENT_DELEGATION=1)
+ * V2 TypeScript
+ *
+ * Compiler emit `data-on-click="<viewId>:1"` trên element và một bảng sự kiện cho mỗi view:
+ *     {types: ['click'], handlers: {click: {'1': [...]}}}
+ * Handler có closure (vd. trong @foreach) được đăng ký lúc render qua
+ * this.__eventRef('click', 2, [...]) → `<viewId>:on2.0` (ID theo render scope). Mỗi root chỉ có
+ * một listener cho mỗi event type, dùng chung cho mọi view gắn vào root đó (view cha + view con
+ * trong cùng container): listener đi từ target lên root và giao mỗi element cho view có tiền tố
+ * view ID tương ứng, nên handler chạy đúng thứ tự bubble giữa các view.
+ */
+
+export type EventHandlerList = readonly any[];
+
+export interface DelegatedEventTable {
+    types: readonly string[];
+    handlers: Readonly<Record<string, Readonly<Record<string, EventHandlerList>>>>;
+}
+
+export type EventInvoker = (handlers: EventHandlerList, event: Event, element: Element) => void;
+
+export const EVENT_ATTRIBUTE_PREFIX = 'data-on-';
+
+interface SharedListener {
+    listener: EventListener;
+    delegators: Set<EventDelegator>;
+}
+
+// root -> event type -> the one listener of that type and the delegators attached to root
+const rootListeners: WeakMap<Element, Map<string, SharedListener>> = new WeakMap();
+
+function dispatch(root: Element, type: string, delegators: Set<EventDelegator>, event: Event): void {
+    const attribute = EVENT_ATTRIBUTE_PREFIX + type;
+    let element = event.target instanceof Element ? event.target.closest(`[${attribute}]`) : null;
+    while (element && root.contains(element)) {
+        const value = element.getAttribute(attribute) as string;
+        for (const delegator of Array.from(delegators)) {
+            // View ID prefixes are unique: at most one delegator owns the value
+            if (delegator.handle(type, value, event, element)) {
+                break;
+            }
+        }
+        if (event.cancelBubble) {
+            return;
+        }
+        element = element.parentElement ? element.parentElement.closest(`[${attribute}]`) : null;
+    }
+}
+
+export class EventDelegator {
+    public readonly table: DelegatedEventTable;
+    // Handlers registered during render (closures), per event type
+    private refs: Map<string, Map<string, EventHandlerList>> = new Map();
+    // `<viewId>:` - only attribute values with this prefix belong to the view
+    private prefix: string;
+    private root: Element | null = null;
+    private invoke: EventInvoker | null = null;
+
+    constructor(table: DelegatedEventTable, viewId: string) {
+        this.table = table;
+        this.prefix = `${viewId}:`;
+    }
+
+    /**
+     * Register the handlers of one rendered element under a render-stable ref; returns the data-on-<type> value
+     */
+    ref(type: string, ref: string, handlers: EventHandlerList): string {
+        let refs = this.refs.get(type);
+        if (!refs) {
+            refs = new Map();
+            this.refs.set(type, refs);
+        }
+        refs.set(ref, handlers);
+        return this.prefix + ref;
+    }
+
+    unref(type: string, ref: string): void {
+        this.refs.get(type)?.delete(ref);
+    }
+
+    /**
+     * Forget render-time refs (ViewController.__beginRender, before a full re-render of the view)
+     */
+    reset(): void {
+        this.refs.clear();
+    }
+
+    /**
+     * Handlers of a data-on-<type> value; undefined for values of other views
+     */
+    resolve(type: string, value: string): EventHandlerList | undefined {
+        if (!value.startsWith(this.prefix)) {
+            return undefined;
+        }
+        const ref = value.slice(this.prefix.length);
+        return this.refs.get(type)?.get(ref) ?? this.table.handlers[type]?.[ref];
+    }
+
+    /**
+     * Run the handlers of a data-on-<type> value if it belongs to this view
+     */
+    handle(type: string, value: string, event: Event, element: Element): boolean {
+        const handlers = this.invoke ? this.resolve(type, value) : undefined;
+        if (!handlers) {
+            return false;
+        }
+        (this.invoke as EventInvoker)(handlers, event, element);
+        return true;
+    }
+
+    /**
+     * Join the shared listeners of root (one per event type, added by the first view attached there)
+     */
+    attach(root: Element, invoke: EventInvoker): void {
+        this.detach();
+        this.root = root;
+        this.invoke = invoke;
+        let listeners = rootListeners.get(root);
+        if (!listeners) {
+            listeners = new Map();
+            rootListeners.set(root, listeners);
+        }
+        for (const type of this.table.types) {
+            let shared = listeners.get(type);
+            if (!shared) {
+                const delegators = new Set<EventDelegator>();
+                shared = { delegators, listener: (event: Event) => dispatch(root, type, delegators, event) };
+                root.addEventListener(type, shared.listener);
+                listeners.set(type, shared);
+            }
+            shared.delegators.add(this);
+        }
+    }
+
+    /**
+     * Leave root; the last view attached there removes the listener
+     */
+    detach(): void {
+        const root = this.root;
+        const listeners = root ? rootListeners.get(root) : undefined;
+        if (root && listeners) {
+            for (const type of this.table.types) {
+                const shared = listeners.get(type);
+                if (shared && shared.delegators.delete(this) && shared.delegators.size === 0) {
+                    root.removeEventListener(type, shared.listener);
+                    listeners.delete(type);
+                }
+            }
+            if (listeners.size === 0) {
+                rootListeners.delete(root);
+            }
+        }
+        this.root = null;
+        this.invoke = null;
+    }
+}
@@ -0,0 +1,280 @@
+/**
+ * KeyedList - Keyed @foreach runtime
+ * V2 TypeScript
+ *
+ * `@foreach($todos as $todo, key: $todo->id)` compile thành
+ * this.__foreachKeyed(id, ['todos'], () => todos, (todo, __loopKey) => todo.id, (todo, ...) => `...`).
+ * Mỗi row được bao bởi comment marker theo key; khi state đổi, list đọc lại items
+ * qua getter rồi chỉ remove/insert/move các row có key thay đổi và render lại row
+ * có HTML khác, thay vì render lại toàn bộ list thành một string.
+ */
+
+export type ListKey = string | number;
+
+export type KeyOf = (item: any, key: any) => ListKey;
+export type RenderItem = (item: any, key: any, index: number, loop: KeyedLoopInfo) => string;
+export type ItemsSource = () => any;
+
+export interface KeyedLoopInfo {
+    /** Row key (keyOf result) */
+    key: ListKey;
+    index: number;
+    iteration: number;
+    count: number;
+    first: boolean;
+    last: boolean;
+}
+
+export interface KeyedListPatch {
+    /** Keys no longer in the list */
+    removed: ListKey[];
+    /** New keys (rendered and inserted) */
+    inserted: ListKey[];
+    /** Existing keys whose row must move (outside the longest stable subsequence) */
+    moved: ListKey[];
+    /** Existing keys whose row HTML changed */
+    updated: ListKey[];
+}
+
+const LIST_OPEN = 'one:list:';
+const LIST_CLOSE = '/one:list:';
+const ROW_OPEN = 'one:row:';
+
+/**
+ * Diff two key sequences; rows on the longest increasing subsequence of old positions stay in place
+ */
+export function diffKeyedList(prevKeys: ListKey[], nextKeys: ListKey[]): KeyedListPatch {
+    const prevIndex = new Map<ListKey, number>();
+    prevKeys.forEach((key, index) => prevIndex.set(key, index));
+    const nextSet = new Set(nextKeys);
+
+    const removed = prevKeys.filter(key => !nextSet.has(key));
+    const inserted: ListKey[] = [];
+    // Old positions of the kept keys, in new order
+    const kept: ListKey[] = [];
+    const positions: number[] = [];
+    for (const key of nextKeys) {
+        const index = prevIndex.get(key);
+        if (index === undefined) {
+            inserted.push(key);
+        } else {
+            kept.push(key);
+            positions.push(index);
+        }
+    }
+
+    const stable = longestIncreasingSubsequence(positions);
+    const moved = kept.filter((_, i) => !stable.has(i));
+    return { removed, inserted, moved, updated: [] };
+}
+
+/**
+ * Indexes (into positions) of one longest strictly increasing subsequence - O(n log n)
+ */
+function longestIncreasingSubsequence(positions: number[]): Set<number> {
+    const tails: number[] = [];
+    const previous: number[] = new Array(positions.length).fill(-1);
+    for (let i = 0; i < positions.length; i++) {
+        let low = 0;
+        let high = tails.length;
+        while (low < high) {
+            const mid = (low + high) >> 1;
+            if (positions[tails[mid]] < positions[i]) {
+                low = mid + 1;
+            } else {
+                high = mid;
+            }
+        }
+        if (low > 0) {
+            previous[i] = tails[low - 1];
+        }
+        tails[low] = i;
+    }
+    const result = new Set<number>();
+    let current = tails.length ? tails[tails.length - 1] : -1;
+    while (current !== -1) {
+        result.add(current);
+        current = previous[current];
+    }
+    return result;
+}
+
+function entriesOf(items: any): Array<[any, any]> {
+    if (items == null) {
+        return [];
+    }
+    if (Array.isArray(items)) {
+        return items.map((item, index) => [index, item]);
+    }
+    if (items instanceof Map) {
+        return Array.from(items.entries());
+    }
+    if (typeof items === 'object') {
+        return Object.entries(items);
+    }
+    return [];
+}
+
+export function encodeKey(key: ListKey): string {
+    // Comment-safe ("--" / ">" cannot appear in a marker)
+    return encodeURIComponent(String(key)).replace(/-/g, '%2D');
+}
+
+export class KeyedList {
+    public readonly id: string;
+    public readonly stateKeys: string[];
+    public keys: ListKey[] = [];
+    private rows: Map<ListKey, string> = new Map();
+    private keyOf: KeyOf | null = null;
+    private renderItem: RenderItem | null = null;
+    private source: ItemsSource | null = null;
+
+    constructor(id: string, stateKeys: string[] = []) {
+        this.id = id;
+        this.stateKeys = stateKeys;
+    }
+
+    /**
+     * Render every row (initial render / full re-render) and remember keys + row HTML
+     * items: the list or a getter re-read by refresh()
+     */
+    render(items: any, keyOf: KeyOf, renderItem: RenderItem): string {
+        this.keyOf = keyOf;
+        this.renderItem = renderItem;
+        this.source = typeof items === 'function' ? items : null;
+        const rows = this.renderRows(this.source ? this.source() : items);
+        this.keys = rows.map(([key]) => key);
+        this.rows = new Map(rows);
+
+        let html = `<!--${LIST_OPEN}${this.id}-->`;
+        for (const [key, row] of rows) {
+            html += `<!--${ROW_OPEN}${encodeKey(key)}-->${row}`;
+        }
+        return html + `<!--${LIST_CLOSE}${this.id}-->`;
+    }
+
+    /**
+     * Re-read the items getter and patch the rendered rows (null when the list was not rendered with a getter
+     * or its markers are not under root)
+     */
+    refresh(root: ParentNode): KeyedListPatch | null {
+        return this.source ? this.patch(root, this.source()) : null;
+    }
+
+    /**
+     * Apply a new item list to the rendered DOM under root; only changed rows are touched
+     */
+    patch(root: ParentNode, items: any): KeyedListPatch | null {
+        if (!this.keyOf || !this.renderItem) {
+            return null;
+        }
+        const markers = this.findMarkers(root);
+        if (!markers) {
+            return null;
+        }
+
+        const rows = this.renderRows(items);
+        const nextKeys = rows.map(([key]) => key);
+        const nextRows = new Map(rows);
+        const patch = diffKeyedList(this.keys, nextKeys);
+        const rowNodes = this.collectRowNodes(markers.open, markers.close);
+
+        for (const key of patch.removed) {
+            rowNodes.get(key)?.forEach(node => node.parentNode?.removeChild(node));
+            rowNodes.delete(key);
+        }
+
+        const inserted = new Set(patch.inserted);
+        const moved = new Set(patch.moved);
+        const parent = markers.close.parentNode as Node;
+        let anchor: Node = markers.close;
+        // Walk backwards so each row is placed before its (already positioned) successor
+        for (let i = nextKeys.length - 1; i >= 0; i--) {
+            const key = nextKeys[i];
+            const html = nextRows.get(key) as string;
+            let nodes = rowNodes.get(key);
+            let place = inserted.has(key) || moved.has(key);
+            if (inserted.has(key) || !nodes) {
+                nodes = this.createRowNodes(key, html);
+                place = true;
+            } else if (this.rows.get(key) !== html) {
+                patch.updated.push(key);
+                const marker = nodes[0];
+                nodes.slice(1).forEach(node => node.parentNode?.removeChild(node));
+                nodes = [marker, ...this.createRowNodes(key, html).slice(1)];
+                if (!place) {
+                    const next = marker.nextSibling;
+                    nodes.slice(1).forEach(node => parent.insertBefore(node, next));
+                }
+            }
+            if (place) {
+                nodes.forEach(node => parent.insertBefore(node, anchor));
+            }
+            anchor = nodes[0];
+        }
+
+        this.keys = nextKeys;
+        this.rows = nextRows;
+        return patch;
+    }
+
+    private renderRows(items: any): Array<[ListKey, string]> {
+        const entries = entriesOf(items);
+        const count = entries.length;
+        const seen = new Set<ListKey>();
+        return entries.map(([key, item], index) => {
+            let rowKey = (this.keyOf as KeyOf)(item, key);
+            if (seen.has(rowKey)) {
+                console.warn(`[KeyedList] Duplicate key "${rowKey}" in list ${this.id}; falling back to index`);
+                rowKey = `${rowKey}#${index}`;
+            }
+            seen.add(rowKey);
+            const loop: KeyedLoopInfo = { key: rowKey, index, iteration: index + 1, count, first: index === 0, last: index === count - 1 };
+            return [rowKey, (this.renderItem as RenderItem)(item, key, index, loop)];
+        });
+    }
+
+    private findMarkers(root: ParentNode): { open: Comment; close: Comment } | null {
+        const walker = document.createTreeWalker(root as Node, NodeFilter.SHOW_COMMENT);
+        let open: Comment | null = null;
+        let node = walker.nextNode();
+        while (node) {
+            const data = (node as Comment).data;
+            if (data === LIST_OPEN + this.id) {
+                open = node as Comment;
+            } else if (open && data === LIST_CLOSE + this.id) {
+                return { open, close: node as Comment };
+            }
+            node = walker.nextNode();
+        }
+        return null;
+    }
+
+    /**
+     * Row key -> [row marker, ...row nodes] between the list markers
+     */
+    private collectRowNodes(open: Comment, close: Comment): Map<ListKey, Node[]> {
+        const byEncodedKey = new Map<string, ListKey>();
+        this.keys.forEach(key => byEncodedKey.set(encodeKey(key), key));
+
+        const rows = new Map<ListKey, Node[]>();
+        let current: Node[] | null = null;
+        for (let node = open.nextSibling; node && node !== close; node = node.nextSibling) {
+            if (node.nodeType === Node.COMMENT_NODE && (node as Comment).data.startsWith(ROW_OPEN)) {
+                const key = byEncodedKey.get((node as Comment).data.slice(ROW_OPEN.length));
+                current = [];
+                if (key !== undefined) {
+                    rows.set(key, current);
+                }
+            }
+            current?.push(node);
+        }
+        return rows;
+    }
+
+    private createRowNodes(key: ListKey, html: string): Node[] {
+        const template = document.createElement('template');
+        template.innerHTML = `<!--${ROW_OPEN}${encodeKey(key)}-->${html}`;
+        return Array.from(template.content.childNodes);
+    }
+}
@@ -0,0 +1,102 @@
+/**
+ * StyleBinding - @style runtime
+ * V2 TypeScript
+ *
+ * `@style(['font-weight' => 'bold', 'width' => $w . 'px'])` compile thành
+ * this.__styleBinding(0, "font-weight: bold", [['width', () => w+'px', ['w']]]) (0 = slot của site lúc compile).
+ * Declaration tĩnh được ghép sẵn lúc compile; mỗi declaration động mang danh sách
+ * state riêng nên khi state đổi chỉ các style.setProperty liên quan được gọi.
+ */
+
+export type StyleDeclaration = [property: string, value: () => any, stateKeys: string[]];
+
+export const STYLE_BINDING_ATTRIBUTE = 'data-one-style';
+
+function escapeAttribute(value: string): string {
+    return value.replace(/&/g, '&amp;').replace(/"/g, '&quot;').replace(/</g, '&lt;');
+}
+
+/**
+ * null / undefined / false / '' remove the property
+ */
+function cssValue(value: any): string | null {
+    if (value === null || value === undefined || value === false || value === '') {
+        return null;
+    }
+    return String(value);
+}
+
+export class StyleBinding {
+    public readonly id: string;
+    public readonly staticCss: string;
+    public readonly declarations: StyleDeclaration[];
+    // Last value written per property; unchanged values skip setProperty
+    private applied: Map<string, string | null> = new Map();
+    // Its element was rendered and has left the DOM: the controller drops the binding
+    public stale: boolean = false;
+    // Element carrying the marker, cached after the first lookup
+    private element: HTMLElement | null = null;
+
+    constructor(id: string, staticCss: string, declarations: StyleDeclaration[]) {
+        this.id = id;
+        this.staticCss = staticCss;
+        this.declarations = declarations;
+    }
+
+    /**
+     * Initial style attribute (static CSS + current dynamic values) and the marker used to find the element
+     */
+    render(): string {
+        const parts = this.staticCss ? [this.staticCss] : [];
+        for (const [property, value] of this.declarations) {
+            const css = cssValue(value());
+            this.applied.set(property, css);
+            if (css !== null) {
+                parts.push(`${property}: ${css}`);
+            }
+        }
+        return `style="${escapeAttribute(parts.join('; '))}" ${STYLE_BINDING_ATTRIBUTE}="${this.id}"`;
+    }
+
+    /**
+     * The rendered element: cached while connected, else looked up once under root
+     */
+    locate(root: ParentNode): HTMLElement | null {
+        if (this.element && this.element.isConnected) {
+            return this.element;
+        }
+        const found = root.querySelector(`[${STYLE_BINDING_ATTRIBUTE}="${this.id}"]`) as HTMLElement | null;
+        this.stale = this.element !== null && found === null;
+        this.element = found;
+        return found;
+    }
+
+    dependsOn(changedKeys: string[]): boolean {
+        return this.declarations.some(([, , stateKeys]) => stateKeys.some(key => changedKeys.includes(key)));
+    }
+
+    /**
+     * Re-evaluate the declarations whose state keys changed (all of them when changedKeys is omitted)
+     * @returns number of setProperty/removeProperty calls
+     */
+    update(element: HTMLElement, changedKeys?: string[]): number {
+        let writes = 0;
+        for (const [property, value, stateKeys] of this.declarations) {
+            if (changedKeys && !stateKeys.some(key => changedKeys.includes(key))) {
+                continue;
+            }
+            const css = cssValue(value());
+            if (this.applied.get(property) === css) {
+                continue;
+            }
+            this.applied.set(property, css);
+            if (css === null) {
+                element.style.removeProperty(property);
+            } else {
+                element.style.setProperty(property, css);
+            }
+            writes++;
+        }
+        return writes;
+    }
+}
@@ -0,0 +1,80 @@
+/**
+ * TwoWayBinding - @bind / @val runtime
+ * V2 TypeScript
+ *
+ * `@bind($q)` compile thành data-binding="q". Modifier được quyết định lúc compile:
+ *     @bind.lazy($q)           → data-binding-event="change"  (chỉ cập nhật khi change/blur)
+ *     @bind.debounce(200)($q)  → data-binding-debounce="200"
+ *     @bind.number($age)       → data-binding-cast="number"
+ * Ô search gắn với state có fetch không còn render lại/fetch lại mỗi lần gõ phím.
+ */
+
+export interface BindingOptions {
+    /** State key path (data-binding) */
+    key: string;
+    /** 'input' (default) or 'change' (.lazy) */
+    event: string;
+    /** Debounce in ms, 0 = update immediately */
+    debounce: number;
+    /** .number: cast to number (kept as string when not numeric) */
+    number: boolean;
+}
+
+export function readBindingOptions(element: Element): BindingOptions {
+    const debounce = parseInt(element.getAttribute('data-binding-debounce') || '0', 10);
+    return {
+        key: element.getAttribute('data-binding') || '',
+        event: element.getAttribute('data-binding-event') || 'input',
+        debounce: isNaN(debounce) ? 0 : debounce,
+        number: element.getAttribute('data-binding-cast') === 'number',
+    };
+}
+
+export function castBindingValue(value: any, options: BindingOptions): any {
+    if (options.number && typeof value === 'string' && value.trim() !== '') {
+        const parsed = Number(value);
+        return isNaN(parsed) ? value : parsed;
+    }
+    return value;
+}
+
+function elementValue(element: Element): any {
+    const input = element as HTMLInputElement;
+    if (input.type === 'checkbox') {
+        return input.checked;
+    }
+    return input.value;
+}
+
+/**
+ * Listen for user input on element and push the (cast, debounced) value to update
+ * @returns unbind function
+ */
+export function bindInput(element: Element, update: (key: string, value: any) => void): () => void {
+    const options = readBindingOptions(element);
+    let timer: ReturnType<typeof setTimeout> | null = null;
+
+    const flush = () => {
+        timer = null;
+        update(options.key, castBindingValue(elementValue(element), options));
+    };
+    const listener = () => {
+        if (options.debounce <= 0) {
+            flush();
+            return;
+        }
+        if (timer !== null) {
+            clearTimeout(timer);
+        }
+        timer = setTimeout(flush, options.debounce);
+    };
+
+    element.addEventListener(options.event, listener);
+    return () => {
+        element.removeEventListener(options.event, listener);
+        if (timer !== null) {
+            clearTimeout(timer);
+            flush();
+        }
+    };
+}
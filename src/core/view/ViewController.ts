@@ -5,6 +5,12 @@
 
 import { ViewState } from "./index.js";
 import { View } from "./View.js";
+import type { StateDependents } from "./ViewState.js";
+import { KeyedList, KeyOf, RenderItem, KeyedLoopInfo, encodeKey } from "./KeyedList.js";
+import { ClassBinding, ClassToggle } from "./ClassBinding.js";
+import { StyleBinding, StyleDeclaration } from "./StyleBinding.js";
+import { EventDelegator, EventHandlerList } from "./EventDelegator.js";
+import { bindInput } from "./TwoWayBinding.js";
 export interface ControllerOptions {
     autoInit?: boolean;
     autoMount?: boolean;
@@ -12,6 +18,17 @@ export interface ControllerOptions {
 
 export type ViewType = 'view' | 'component' | 'layout' | 'template';
 
+/**
+ * Render scope: the whole view render, or one keyed-list row
+ * IDs minted in a scope are `<prefix><kind>.<n>`, so the same template site gets the same ID on every render
+ */
+interface RenderScope {
+    prefix: string;
+    occurrences: Map<string, number>;
+    /** Disposers of what the rows of the list being rendered created (null at view level) */
+    owned: Map<string, () => void> | null;
+}
+
 export class ViewController {
     public view: View;
     protected config: Record<string, any>;
@@ -20,6 +37,18 @@ export class ViewController {
     protected __App : any;
     public states: ViewState;
     protected ownProperties: Set<string> = new Set(['__ctrl__']);
+    protected keyedLists: Map<string, KeyedList> = new Map();
+    // list ID -> disposers of the nested lists/bindings its rows created
+    protected keyedListOwned: Map<string, Map<string, () => void>> = new Map();
+    protected renderScopes: RenderScope[] = [];
+    protected reactiveIds: string[] = [];
+    protected classBindings: Map<string, ClassBinding> = new Map();
+    protected styleBindings: Map<string, StyleBinding> = new Map();
+    protected eventDelegator: EventDelegator | null = null;
+    // Element the view is mounted under (ViewManager container); null before mount / after unmount
+    protected root: Element | null = null;
+    // @bind inputs of this view -> unbind (listener + pending debounce)
+    protected inputBindings: Map<Element, () => void> = new Map();
     constructor(view: View, path: string = '', viewType: ViewType = 'view') {
         this.view = view;
         this.__path = path;
@@ -30,6 +59,11 @@ export class ViewController {
 
     setup(config: Record<string, any>): void {
         this.config = config;
+        if (config.stateDependencies) {
+            this.states.__.setDependencies(config.stateDependencies);
+        }
+        // Compiled with ONEJS_EVENT_DELEGATION=1: one listener per event type on the view root
+        this.eventDelegator = config.events ? new EventDelegator(config.events, config.viewId) : null;
     }
 
     setUserDefinedConfig(userConfig: Record<string, any>): void {
@@ -44,8 +78,303 @@ export class ViewController {
         this.__App = app;
     }
 
+    /**
+     * Full DOM/marker ID of a reactive block
+     * Compiler emits integer slots (this.__reactive(3, ...)) and `3-${__loop.index}` inside loops;
+     * the view ID is joined once per slot instead of on every render. Full string IDs pass through.
+     */
+    resolveReactiveId(id: number | string): string {
+        if (typeof id === 'number') {
+            return this.reactiveIds[id] || (this.reactiveIds[id] = `${this.config.viewId}-${id}`);
+        }
+        return /^\d/.test(id) ? `${this.config.viewId}-${id}` : id;
+    }
+
     // ui functions
 
+    /**
+     * Start of a full render (emitted first in the compiled render): everything keyed by render-time IDs is rebuilt
+     */
+    __beginRender(): void {
+        this.renderScopes = [{ prefix: '', occurrences: new Map(), owned: null }];
+        this.keyedLists.clear();
+        this.keyedListOwned.clear();
+        this.classBindings.clear();
+        this.styleBindings.clear();
+        this.eventDelegator?.reset();
+    }
+
+    protected currentScope(): RenderScope {
+        if (!this.renderScopes.length) {
+            this.renderScopes.push({ prefix: '', occurrences: new Map(), owned: null });
+        }
+        return this.renderScopes[this.renderScopes.length - 1];
+    }
+
+    /**
+     * Render-stable local ID of the next `kind` site in the current scope
+     */
+    protected scopedId(kind: string): string {
+        const scope = this.currentScope();
+        const occurrence = scope.occurrences.get(kind) || 0;
+        scope.occurrences.set(kind, occurrence + 1);
+        return `${scope.prefix}${kind}.${occurrence}`;
+    }
+
+    /**
+     * Tie something created during render to the keyed-list row being rendered:
+     * it is disposed when the row is removed (no-op at view level, __beginRender resets those)
+     */
+    protected own(key: string, dispose: () => void): void {
+        this.currentScope().owned?.set(key, dispose);
+    }
+
+    /**
+     * Keyed @foreach: render rows with per-key markers (see KeyedList)
+     * items is a getter so the state flush can re-read the list and patch it (refreshKeyedLists)
+     */
+    __foreachKeyed(id: number | string, stateKeys: string[], items: any, keyOf: KeyOf, renderItem: RenderItem): string {
+        const listId = this.resolveReactiveId(id);
+        let list = this.keyedLists.get(listId);
+        if (!list) {
+            list = new KeyedList(listId, stateKeys);
+            this.keyedLists.set(listId, list);
+        }
+        this.own(`list:${listId}`, () => this.disposeKeyedList(listId));
+        const keyed = list;
+        return this.renderKeyedRows(keyed, () => keyed.render(items, keyOf, this.rowScoped(keyed, renderItem)));
+    }
+
+    /**
+     * Run each row render in its own scope (prefix `<listId>/<rowKey>/`)
+     */
+    protected rowScoped(list: KeyedList, renderItem: RenderItem): RenderItem {
+        return (item: any, key: any, index: number, loop: KeyedLoopInfo) => {
+            this.renderScopes.push({
+                prefix: `${list.id}/${encodeKey(loop.key)}/`,
+                occurrences: new Map(),
+                owned: this.keyedListOwned.get(list.id) || null,
+            });
+            try {
+                return renderItem(item, key, index, loop);
+            } finally {
+                this.renderScopes.pop();
+            }
+        };
+    }
+
+    /**
+     * Render/patch the rows of list; what the previous rows created and the new rows did not is disposed
+     */
+    protected renderKeyedRows<T>(list: KeyedList, run: () => T): T {
+        const previous = this.keyedListOwned.get(list.id);
+        const owned = new Map<string, () => void>();
+        this.keyedListOwned.set(list.id, owned);
+        const result = run();
+        previous?.forEach((dispose, key) => owned.has(key) || dispose());
+        return result;
+    }
+
+    protected disposeKeyedList(listId: string): void {
+        const owned = this.keyedListOwned.get(listId);
+        this.keyedLists.delete(listId);
+        this.keyedListOwned.delete(listId);
+        owned?.forEach(dispose => dispose());
+    }
+
+    /**
+     * Patch the keyed lists depending on the changed keys (watch IDs of stateDependencies or the list's own keys);
+     * only inserted/removed/moved/changed rows touch the DOM. Lists no longer under root are dropped.
+     * @returns number of lists patched
+     */
+    refreshKeyedLists(dependents: StateDependents, changedKeys: string[], root: ParentNode = document): number {
+        const watched = new Set(dependents.watch.map(id => this.resolveReactiveId(id)));
+        let patched = 0;
+        for (const list of Array.from(this.keyedLists.values())) {
+            // Disposed or replaced while an enclosing list was patched
+            if (this.keyedLists.get(list.id) !== list) {
+                continue;
+            }
+            if (!watched.has(list.id) && !list.stateKeys.some(key => changedKeys.includes(key))) {
+                continue;
+            }
+            if (this.renderKeyedRows(list, () => list.refresh(root))) {
+                patched++;
+            } else {
+                this.disposeKeyedList(list.id);
+            }
+        }
+        return patched;
+    }
+
+    /**
+     * State flush entry point (StateManager.flushChanges, once per batched frame):
+     * patch the keyed lists, @class toggles and @style declarations that depend on the changed keys.
+     */
+    refreshReactiveBlocks(dependents: StateDependents, changedKeys: Array<string | number>): void {
+        const keys = changedKeys.map(String);
+        const root: ParentNode = this.root || document;
+        if (this.refreshKeyedLists(dependents, keys, root) && this.root) {
+            // Inserted/updated rows may carry @bind inputs
+            this.bindInputs(this.root);
+        }
+        this.updateClassBindings(keys, root);
+        this.updateStyleBindings(keys, root);
+    }
+
+    /**
+     * @class with conditional classes: static classes once + toggles (see ClassBinding)
+     * slot is the compile-time site; with the render scope it gives the same ID on every render
+     */
+    __classBinding(slot: number, staticClass: string, toggles: ClassToggle[]): string {
+        const id = `${this.config.viewId}:${this.scopedId(`class${slot}`)}`;
+        const binding = new ClassBinding(id, staticClass, toggles);
+        this.classBindings.set(id, binding);
+        this.own(`class:${id}`, () => this.classBindings.delete(id));
+        return binding.render();
+    }
+
+    /**
+     * Toggle the classes depending on changedKeys (called from the state flush)
+     * Each binding finds its element once; bindings whose element left the DOM are dropped.
+     * @returns number of class names added or removed
+     */
+    updateClassBindings(changedKeys: string[], root: ParentNode = document): number {
+        let flipped = 0;
+        for (const [id, binding] of Array.from(this.classBindings)) {
+            if (!binding.dependsOn(changedKeys)) {
+                continue;
+            }
+            const element = binding.locate(root);
+            if (element) {
+                flipped += binding.update(element, changedKeys);
+            } else if (binding.stale) {
+                this.classBindings.delete(id);
+            }
+        }
+        return flipped;
+    }
+
+    /**
+     * @style with dynamic values: static CSS once + per-property declarations (see StyleBinding)
+     * slot is the compile-time site; with the render scope it gives the same ID on every render
+     */
+    __styleBinding(slot: number, staticCss: string, declarations: StyleDeclaration[]): string {
+        const id = `${this.config.viewId}:${this.scopedId(`style${slot}`)}`;
+        const binding = new StyleBinding(id, staticCss, declarations);
+        this.styleBindings.set(id, binding);
+        this.own(`style:${id}`, () => this.styleBindings.delete(id));
+        return binding.render();
+    }
+
+    /**
+     * Re-apply the style declarations depending on changedKeys (called from the state flush,
+     * which already batches the changes of one frame)
+     * Each binding finds its element once; bindings whose element left the DOM are dropped.
+     * @returns number of setProperty/removeProperty calls
+     */
+    updateStyleBindings(changedKeys: string[], root: ParentNode = document): number {
+        let writes = 0;
+        for (const [id, binding] of Array.from(this.styleBindings)) {
+            if (!binding.dependsOn(changedKeys)) {
+                continue;
+            }
+            const element = binding.locate(root);
+            if (element) {
+                writes += binding.update(element, changedKeys);
+            } else if (binding.stale) {
+                this.styleBindings.delete(id);
+            }
+        }
+        return writes;
+    }
+
+    /**
+     * Delegated event handlers that close over render-time values (data-on-<type>="<viewId>:<ref>")
+     * The ref is render-stable (scope + handler ID); refs of removed keyed rows are dropped
+     */
+    __eventRef(type: string, handlerId: number, handlers: EventHandlerList): string {
+        const ref = this.scopedId(`on${handlerId}`);
+        if (!this.eventDelegator) {
+            return `${this.config.viewId}:${ref}`;
+        }
+        const delegator = this.eventDelegator;
+        this.own(`on:${type}:${ref}`, () => delegator.unref(type, ref));
+        return delegator.ref(type, ref, handlers);
+    }
+
+    /**
+     * The view was inserted under root (ViewManager, before onMounted):
+     * delegated listeners are attached there and flush updates look elements up under it
+     */
+    mount(root: Element): void {
+        this.root = root;
+        this.attachEventDelegation(root);
+        this.bindInputs(root);
+    }
+
+    /**
+     * The view is being removed (ViewManager, before destroy)
+     */
+    unmount(): void {
+        this.detachEventDelegation();
+        this.unbindInputs();
+        this.root = null;
+    }
+
+    /**
+     * Listen on the @bind inputs of this view under root (data-binding + data-view-id; child views bind their own)
+     * Bound inputs are kept; inputs that left the DOM are unbound
+     */
+    bindInputs(root: ParentNode): void {
+        this.inputBindings.forEach((unbind, element) => {
+            if (!element.isConnected) {
+                unbind();
+                this.inputBindings.delete(element);
+            }
+        });
+        root.querySelectorAll(`[data-binding][data-view-id="${this.config.viewId}"]`).forEach(element => {
+            if (!this.inputBindings.has(element)) {
+                this.inputBindings.set(element, bindInput(element, (key, value) => this.states.__.updateStateAddressKey(key, value)));
+            }
+        });
+    }
+
+    unbindInputs(): void {
+        this.inputBindings.forEach(unbind => unbind());
+        this.inputBindings.clear();
+    }
+
+    /**
+     * Attach the view's delegated listeners to its root element (no-op without an event table)
+     */
+    attachEventDelegation(root: Element): void {
+        this.eventDelegator?.attach(root, (handlers, event) => this.runEventHandlers(handlers, event));
+    }
+
+    detachEventDelegation(): void {
+        this.eventDelegator?.detach();
+    }
+
+    /**
+     * Run a compiled handler list: arrow functions get the event,
+     * {handler, params} calls the view method ("@EVENT" param = the event)
+     */
+    protected runEventHandlers(handlers: EventHandlerList, event: Event): void {
+        for (const handler of handlers) {
+            if (typeof handler === 'function') {
+                handler.call(this.view, event);
+                continue;
+            }
+            const method = handler && (this.view as any)[handler.handler];
+            if (typeof method !== 'function') {
+                console.warn(`[ViewController] Event handler "${handler?.handler}" not found (View: ${this.__path})`);
+                continue;
+            }
+            method.apply(this.view, (handler.params || []).map((param: any) => param === '@EVENT' ? event : param));
+        }
+    }
+
     __showError(message: string): void {
         console.error(`[ViewController Error] ${message} (View: ${this.__path})`);
     }
@@ -67,6 +67,11 @@ export class ViewLoader {
             const module = await loadPromise;
             this.cache.set(name, module);
             this.loading.delete(name);
+            // Compiled views carry their path (__VIEW_META__): loading that name later skips path resolution
+            const metaPath = module.__VIEW_META__?.path;
+            if (metaPath && metaPath !== name && !this.cache.has(metaPath)) {
+                this.cache.set(metaPath, module);
+            }
             console.log(`✅ View loaded: ${name}`);
             return module;
         } catch (error) {
@@ -20,6 +20,18 @@ export interface ViewInstance {
     config: ViewConfig;
 }
 
+/**
+ * Metadata do compiler sinh sẵn cho mỗi view (export const __VIEW_META__)
+ * Path/namespace/type là literal lúc compile, runtime không cần tách chuỗi view name
+ */
+export interface ViewMeta {
+    path: string;
+    namespace: string;
+    type: 'view' | 'component' | 'layout' | 'template';
+    factory: string;
+    config: Record<string, any>;
+}
+
 export interface LoadResult {
     html: string | null;
     error: string | null;
@@ -43,6 +55,9 @@ export class ViewManager {
     // View registry (V2 - ESM imports mapped to view names)
     // Supports both sync factory functions and async imports
     private viewRegistry: Record<string, ((...args: any[]) => any) | (() => Promise<any>)> = {};
+
+    // Precomputed view metadata (view name -> __VIEW_META__ of the compiled module)
+    private viewMeta: Record<string, ViewMeta> = {};
     
     // V1 compatibility
     public App: any = null;
@@ -143,11 +158,7 @@ export class ViewManager {
                 module = await viewLoader.load(name);
             }
             
-            const ViewClass = module.default || module[name] || ViewController;
-            
-            if (!this.templates[name]) {
-                this.templates[name] = ViewClass;
-            }
+            this.registerViewModule(name, module);
 
             // Load and render view using V1 logic
             const viewResult = await this.loadView(name, params, route?.$urlPath || '');
@@ -171,10 +182,7 @@ export class ViewManager {
 
             // Mount ultra view (outermost view)
             if (viewResult.ultraView) {
-                const ultraView = viewResult.ultraView as any;
-                if (ultraView.onMounted) {
-                    await ultraView.onMounted();
-                }
+                await this.runMounted(viewResult.ultraView);
             }
 
             this.CURRENT_SUPER_VIEW_MOUNTED = true;
@@ -371,10 +379,7 @@ export class ViewManager {
 
             // Mount the ultra view (outermost view)
             if (scanResult.ultraView) {
-                const ultraView = scanResult.ultraView as any;
-                if (ultraView.onMounted) {
-                    await ultraView.onMounted();
-                }
+                await this.runMounted(scanResult.ultraView);
             }
 
             this.CURRENT_SUPER_VIEW_MOUNTED = true;
@@ -402,13 +407,7 @@ export class ViewManager {
             this.PAGE_VIEW = null;
 
             // Load view module and register in templates
-            const module = await viewLoader.load(name);
-            const ViewClass = module.default || module[name] || ViewController;
-            
-            // Register view in templates if not exists
-            if (!this.templates[name]) {
-                this.templates[name] = ViewClass;
-            }
+            this.registerViewModule(name, await viewLoader.load(name));
             
             // Create view instance using this.view() like V1
             const view = this.view(name, data) as any;
@@ -619,9 +618,7 @@ export class ViewManager {
         for (let i = this.SUPER_VIEW_STACK.length - 1; i >= 0; i--) {
             const view = this.SUPER_VIEW_STACK[i] as any;
             try {
-                if (view.onMounted) {
-                    await view.onMounted();
-                }
+                await this.runMounted(view);
             } catch (error) {
                 console.error(`Error mounting super view ${view.path}:`, error);
             }
@@ -637,9 +634,7 @@ export class ViewManager {
             }
             
             try {
-                if (view.onMounted) {
-                    await view.onMounted();
-                }
+                await this.runMounted(view);
             } catch (error) {
                 console.error(`Error mounting view ${view.path}:`, error);
             }
@@ -651,6 +646,19 @@ export class ViewManager {
         this.VIEW_MOUNTED_QUEUE[renderTimes] = [];
     }
 
+    /**
+     * Mount one rendered view: controller first (event delegation, bindings under the container), then onMounted
+     */
+    private async runMounted(view: any): Promise<void> {
+        const container = this.getViewContainer();
+        if (container && view?.__ctrl__) {
+            view.__ctrl__.mount(container);
+        }
+        if (view?.onMounted) {
+            await view.onMounted();
+        }
+    }
+
     /**
      * Unmount view
      */
@@ -659,6 +667,7 @@ export class ViewManager {
         if (!instance) return;
 
         try {
+            instance.view.__ctrl__?.unmount();
             await instance.view.destroy();
             this.instances.delete(id);
 
@@ -758,6 +767,7 @@ export class ViewManager {
         // Destroy all instances
         const instances = Array.from(this.instances.values());
         for (const instance of instances) {
+            instance.view.__ctrl__?.unmount();
             await instance.view.destroy();
         }
 
@@ -879,6 +889,42 @@ export class ViewManager {
         return viewLoader.isRegistered(name) || !!this.templates[name];
     }
 
+    /**
+     * Register a loaded view module: factory in templates, __VIEW_META__ in viewMeta
+     * The factory export is named by meta.factory (a dotted view name is never an export name);
+     * the module is also registered under meta.path, so an include/extends of the compiled path
+     * reuses it instead of resolving that name to a module URL again.
+     */
+    private registerViewModule(name: string, module: any): void {
+        const meta: ViewMeta | undefined = module.__VIEW_META__ || module.default?.meta;
+        const ViewClass = module.default || (meta && module[meta.factory]) || module[name] || ViewController;
+
+        for (const key of meta && meta.path !== name ? [name, meta.path] : [name]) {
+            if (!this.templates[key]) {
+                this.templates[key] = ViewClass;
+            }
+            if (meta && !this.viewMeta[key]) {
+                this.viewMeta[key] = meta;
+            }
+        }
+    }
+
+    /**
+     * Get precomputed metadata (path, namespace, type, config) of a view
+     * @param name - View name
+     * @returns ViewMeta or null if the view was not compiled with metadata
+     */
+    getViewMeta(name: string): ViewMeta | null {
+        if (this.viewMeta[name]) {
+            return this.viewMeta[name];
+        }
+        const meta = this.templates[name]?.meta;
+        if (meta) {
+            this.viewMeta[name] = meta;
+        }
+        return meta || null;
+    }
+
     /**
      * Get view from templates registry (V1 compatibility)
      * @param name - View name
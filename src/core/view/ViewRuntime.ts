@@ -0,0 +1,94 @@
+/**
+ * ViewRuntime - Helper dùng chung cho các view đã compile
+ * V2 TypeScript
+ *
+ * Compiler (compiler/python) trước đây sinh lại cùng một đoạn boilerplate trong
+ * mỗi file view: các shim useState/updateRealState/lockUpdateRealState/
+ * updateStateByKey và vòng lặp updateVariableData/updateVariableItemData.
+ * Các view giờ import helper từ 'oneview', file compile chỉ còn phần riêng của view.
+ */
+
+import { ViewState } from './ViewState.js';
+
+type StateValue = any;
+
+export interface ViewStateHelpers {
+    useState: (value: StateValue) => any;
+    updateRealState: (state: StateValue) => void;
+    lockUpdateRealState: () => void;
+    updateStateByKey: (key: string | number, state: StateValue) => void;
+}
+
+export interface ViewDataHandlers {
+    commitConstructorData: () => void;
+    updateVariableData: (data: Record<string, any>) => void;
+    updateVariableItemData: (key: string, value: any) => void;
+}
+
+/**
+ * Tạo các state shim cho $__setup__ của view
+ *
+ * @example
+ * const { useState, updateRealState, lockUpdateRealState, updateStateByKey } = createStateHelpers(__STATE__);
+ */
+export function createStateHelpers(states: ViewState): ViewStateHelpers {
+    return {
+        useState: (value: StateValue) => states.__useState(value),
+        updateRealState: (state: StateValue) => {
+            states.__.updateRealState(state);
+        },
+        lockUpdateRealState: () => {
+            states.__.lockUpdateRealState();
+        },
+        updateStateByKey: (key: string | number, state: StateValue) => {
+            states.__.updateStateByKey(key, state);
+        },
+    };
+}
+
+/**
+ * Tạo commitConstructorData/updateVariableData/updateVariableItemData cho setup config
+ *
+ * @param updateDataTrait - __UPDATE_DATA_TRAIT__ của view (key -> setter của @vars)
+ * @param commitStates - Cập nhật state từ data rồi lock (phần riêng của từng view)
+ *
+ * @example
+ * this.__ctrl__.setup({
+ *     ...createViewDataHandlers(__UPDATE_DATA_TRAIT__, () => {
+ *         update$count(0);
+ *         lockUpdateRealState();
+ *     }),
+ * });
+ */
+export function createViewDataHandlers(
+    updateDataTrait: Record<string, (value: any) => void>,
+    commitStates?: () => void
+): ViewDataHandlers {
+    return {
+        commitConstructorData: function () {
+            if (commitStates) {
+                commitStates();
+            }
+        },
+        updateVariableData: function (this: any, data: Record<string, any>) {
+            // Update all variables first (config.updateVariableItemData có thể bị override)
+            for (const key in data) {
+                if (Object.prototype.hasOwnProperty.call(data, key)) {
+                    if (typeof this.config.updateVariableItemData === 'function') {
+                        this.config.updateVariableItemData.call(this, key, data[key]);
+                    }
+                }
+            }
+            // Then update states from data
+            if (commitStates) {
+                commitStates();
+            }
+        },
+        updateVariableItemData: function (this: any, key: string, value: any) {
+            this.data[key] = value;
+            if (typeof updateDataTrait[key] === 'function') {
+                updateDataTrait[key](value);
+            }
+        },
+    };
+}
@@ -22,6 +22,18 @@ interface Listener {
     (value: StateValue): void;
 }
 
+/**
+ * Block ID: slot số nguyên (compact, xem ViewController.resolveReactiveId) hoặc string ID đầy đủ
+ */
+export type ReactiveBlockId = number | string;
+
+/**
+ * Keyed list IDs phụ thuộc vào một state key (compiler sinh sẵn: stateDependencies)
+ */
+export interface StateDependents {
+    watch: ReactiveBlockId[];
+}
+
 interface MultiKeyListener {
     keys: Set<string | number>;
     callback: (values: Record<string, StateValue>) => void;
@@ -106,6 +118,12 @@ export class StateManager {
 
     setters: Record<string | number, (value: StateValue) => void> = {};
 
+    /**
+     * Map state key -> reactive/watch block IDs do compiler sinh sẵn
+     * Cho phép flush đi thẳng từ key thay đổi tới các block bị ảnh hưởng
+     */
+    private dependencyMap: Record<string, StateDependents> = {};
+
 
     ownProperties: string[] = ['__'];
         
@@ -332,6 +350,26 @@ export class StateManager {
     lockUpdateRealState() {
         this.canUpdateStateByKey = false;
     }
+
+    /**
+     * Đăng ký dependency map tĩnh của view (setup config: stateDependencies)
+     */
+    setDependencies(map: Record<string, StateDependents>): void {
+        this.dependencyMap = map || {};
+    }
+
+    /**
+     * Lấy các block IDs phụ thuộc vào những keys đã thay đổi (không trùng lặp)
+     */
+    getDependents(keys: Iterable<string | number>): StateDependents {
+        const watch = new Set<ReactiveBlockId>();
+        for (const key of keys) {
+            const dependents = this.dependencyMap[key];
+            if (!dependents) continue;
+            dependents.watch.forEach(id => watch.add(id));
+        }
+        return { watch: Array.from(watch) };
+    }
     /**
      * Đăng ký lắng nghe thay đổi state
      * 
@@ -629,6 +667,16 @@ export class StateManager {
                 }
             }
         }
+
+        // Patch only what depends on the changed keys: mapped block IDs, plus keyed lists and
+        // @class/@style bindings that carry their own state keys (so called even without mapped IDs)
+        if (typeof this.controller?.refreshReactiveBlocks === 'function') {
+            try {
+                this.controller.refreshReactiveBlocks(this.getDependents(changesToProcess), changesToProcess);
+            } catch (error) {
+                console.error('[ViewState] Reactive refresh error:', error);
+            }
+        }
     }
 
     /**
@@ -651,6 +699,7 @@ export class StateManager {
         this.listeners.clear();
         this.multiKeyListeners = [];
         this.pendingChanges.clear();
+        this.dependencyMap = {};
         this.states = {};
         this.controller = null;
     }
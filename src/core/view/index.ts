@@ -10,7 +10,7 @@ export { ViewController } from './ViewController.js';
 export type { ControllerOptions } from './ViewController.js';
 
 export { ViewManager } from './ViewManager.js';
-export type { ViewInstance, LoadResult } from './ViewManager.js';
+export type { ViewInstance, LoadResult, ViewMeta } from './ViewManager.js';
 
 export { ViewLoader, viewLoader } from './ViewLoader.js';
 export type { ViewModule } from './ViewLoader.js';
@@ -19,7 +19,20 @@ export { ViewTemplateManager } from './ViewTemplateManager.js';
 export type { WrapperConfig, SectionMetadata } from './ViewTemplateManager.js';
 
 export { ViewState, StateManager } from './ViewState.js';
+export type { StateDependents, ReactiveBlockId } from './ViewState.js';
 export {View} from './View.js';
+export { createStateHelpers, createViewDataHandlers } from './ViewRuntime.js';
+export type { ViewStateHelpers, ViewDataHandlers } from './ViewRuntime.js';
+export { KeyedList, diffKeyedList } from './KeyedList.js';
+export type { ListKey, KeyOf, RenderItem, ItemsSource, KeyedLoopInfo, KeyedListPatch } from './KeyedList.js';
+export { ClassBinding, CLASS_BINDING_ATTRIBUTE } from './ClassBinding.js';
+export type { ClassToggle } from './ClassBinding.js';
+export { StyleBinding, STYLE_BINDING_ATTRIBUTE } from './StyleBinding.js';
+export type { StyleDeclaration } from './StyleBinding.js';
+export { EventDelegator, EVENT_ATTRIBUTE_PREFIX } from './EventDelegator.js';
+export type { DelegatedEventTable, EventHandlerList, EventInvoker } from './EventDelegator.js';
+export { bindInput, readBindingOptions, castBindingValue } from './TwoWayBinding.js';
+export type { BindingOptions } from './TwoWayBinding.js';
 export {
     SSRViewDataParser, 
     SSRViewDataCollection, 